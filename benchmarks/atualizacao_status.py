@@ -0,0 +1,111 @@
+"""
+Benchmark das atualizações de status: carregar-e-alterar x UPDATE ... RETURNING.
+
+Compara a implementação anterior dos repositórios (SELECT pelo id, altera o
+objeto ORM e faz commit) com a atual (um único UPDATE ... RETURNING id).
+Os dois caminhos fazem as mesmas escritas auxiliares na transação (o
+evento de auditoria no outbox e o incremento da versão da tabela, via
+`_registrar_escrita` do repositório), então a diferença medida é só a do
+SELECT prévio. Conta as idas ao banco por operação e mede a latência média, com uma
+latência de rede artificial por comando para simular um banco remoto.
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/atualizacao_status.py --operacoes 500 --latencia-ms 1
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+_BANCO = Path(tempfile.mkdtemp()) / "bench_atualizacao.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_BANCO}")
+
+from sqlalchemy import event, insert  # noqa: E402
+from uuid6 import uuid7  # noqa: E402
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal, async_engine  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente  # noqa: E402
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente  # noqa: E402
+
+
+class Medidor:
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.comandos = 0
+
+    def antes_do_comando(self, *args):
+        self.comandos += 1
+        # Simula o tempo de ida e volta até o servidor do banco
+        time.sleep(self.latencia)
+
+
+async def inativar_carregando(sessao, id) -> bool:
+    """Implementação anterior: SELECT + alteração do objeto + commit."""
+    paciente = await sessao.get(ModeloPaciente, id)
+    if not paciente:
+        return False
+    paciente.status = "INATIVO"
+    await RepositorioPaciente(sessao=sessao)._registrar_escrita("inativado", [(id, {"status": "INATIVO"})])
+    await sessao.commit()
+    return True
+
+
+async def inativar_com_update(sessao, id) -> bool:
+    return await RepositorioPaciente(sessao=sessao).inativar(id)
+
+
+async def medir(nome, operacao, ids, medidor: Medidor) -> dict:
+    medidor.comandos = 0
+    inicio = time.perf_counter()
+    for id in ids:
+        async with AsyncSessionLocal() as sessao:
+            assert await operacao(sessao, id)
+    duracao = time.perf_counter() - inicio
+    return {
+        "implementacao": nome,
+        "comandos_por_operacao": round(medidor.comandos / len(ids), 2),
+        "latencia_media_ms": round(duracao / len(ids) * 1000, 3),
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    async with async_engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+        ids = [uuid7() for _ in range(argumentos.operacoes)]
+        await conexao.execute(insert(ModeloPaciente), [
+            {
+                "id": id,
+                "nome": f"Paciente {i}",
+                "status": "ATIVO",
+                "cpf": f"{i:011d}",
+                "telefone": "47999999999",
+                "data_nascimento": date(1990, 1, 1),
+                "tipo_sanguineo": "O+",
+            }
+            for i, id in enumerate(ids)
+        ])
+
+    medidor = Medidor(argumentos.latencia_ms / 1000)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", medidor.antes_do_comando)
+
+    metade = len(ids) // 2
+    resultados = [
+        await medir("select_e_commit", inativar_carregando, ids[:metade], medidor),
+        await medir("update_returning", inativar_com_update, ids[metade:], medidor),
+    ]
+    for resultado in resultados:
+        print(resultado)
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operacoes", type=int, default=1000)
+    parser.add_argument("--latencia-ms", type=float, default=1)
+    asyncio.run(principal(parser.parse_args()))
@@ -0,0 +1,93 @@
+"""
+Cenários dos testes de carga.
+
+Cada cenário faz uma requisição por chamada; `numero` é o índice da
+requisição (0, 1, 2, ...), usado para variar ids e dados entre as chamadas.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+import httpx
+
+from semeador import formatar_cpf
+
+
+@dataclass
+class Contexto:
+    pacientes: list[UUID]
+    recepcionistas: list[UUID]
+    # Cabeçalhos com o token do usuário dos testes (validado uma vez e mantido no cache)
+    cabecalhos: dict[str, str]
+    # Um token novo por requisição, para o cenário de autenticação
+    tokens_novos: list[str] = field(default_factory=list)
+
+
+Cenario = Callable[[httpx.AsyncClient, Contexto, int], Awaitable[httpx.Response]]
+
+
+async def listar_pacientes(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    return await cliente.get("/pacientes", params={"limite": 50}, headers=contexto.cabecalhos)
+
+
+async def listar_recepcionistas(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    return await cliente.get("/recepcionistas", params={"limite": 50}, headers=contexto.cabecalhos)
+
+
+async def buscar_pacientes(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    termo = f"Carga {numero % 1000:04d}"
+    return await cliente.get("/pacientes/buscar", params={"q": termo}, headers=contexto.cabecalhos)
+
+
+async def detalhar_paciente(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    id = contexto.pacientes[numero % len(contexto.pacientes)]
+    return await cliente.get(f"/pacientes/{id}", headers=contexto.cabecalhos)
+
+
+async def criar_paciente(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    # CPFs acima dos semeados, para não repetir
+    numero_cpf = 90_000_000_000 + numero
+    return await cliente.post("/pacientes", headers=contexto.cabecalhos, json={
+        "nome": f"Paciente Novo {numero:07d}",
+        "status": "ATIVO",
+        "cpf": formatar_cpf(numero_cpf),
+        "data_nascimento": "1990-01-01",
+        "telefone": "(47)91234-4321",
+        "email": f"novo{numero}@exemplo.com",
+        "endereco": "Rua dos Caçadores, 191",
+        "tipo_sanguineo": "O+",
+        "observacoes": "",
+    })
+
+
+async def alterar_paciente(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    id = contexto.pacientes[numero % len(contexto.pacientes)]
+    return await cliente.put(f"/pacientes/{id}", headers=contexto.cabecalhos, json={
+        "nome": f"Paciente Alterado {numero:07d}",
+        "telefone": "(47)94321-1234",
+        "email": f"alterado{numero}@exemplo.com",
+        "endereco": "Rua das Palmeiras, 10",
+        "observacoes": "Alterado no teste de carga",
+    })
+
+
+async def autenticacao(cliente: httpx.AsyncClient, contexto: Contexto, numero: int) -> httpx.Response:
+    """Token diferente a cada requisição: sempre valida a assinatura RS256 (sem cache de tokens)."""
+    token = contexto.tokens_novos[numero % len(contexto.tokens_novos)]
+    return await cliente.get(
+        "/recepcionistas",
+        params={"limite": 1},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+CENARIOS: dict[str, Cenario] = {
+    "listar_pacientes": listar_pacientes,
+    "listar_recepcionistas": listar_recepcionistas,
+    "buscar_pacientes": buscar_pacientes,
+    "detalhar_paciente": detalhar_paciente,
+    "criar_paciente": criar_paciente,
+    "alterar_paciente": alterar_paciente,
+    "autenticacao": autenticacao,
+}
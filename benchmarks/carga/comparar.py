@@ -0,0 +1,54 @@
+"""
+Compara dois relatórios de `executar.py` (ex.: antes e depois de um commit).
+
+Mostra, por cenário, p50/p95/p99 e RPS dos dois relatórios e a variação
+percentual. Latência menor e RPS maior são melhores.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/carga/comparar.py antes.json depois.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+METRICAS = (("p50", "latencia_ms"), ("p95", "latencia_ms"), ("p99", "latencia_ms"), ("rps", None))
+
+
+def _valor(resultado: dict, metrica: str, grupo: str | None) -> float:
+    return resultado[grupo][metrica] if grupo else resultado[metrica]
+
+
+def comparar(antes: dict, depois: dict) -> list[dict]:
+    anteriores = {resultado["cenario"]: resultado for resultado in antes["cenarios"]}
+    linhas = []
+    for resultado in depois["cenarios"]:
+        anterior = anteriores.get(resultado["cenario"])
+        if anterior is None:
+            continue
+        linha = {"cenario": resultado["cenario"]}
+        for metrica, grupo in METRICAS:
+            valor_antes = _valor(anterior, metrica, grupo)
+            valor_depois = _valor(resultado, metrica, grupo)
+            variacao = (valor_depois - valor_antes) / valor_antes * 100 if valor_antes else None
+            linha[metrica] = {
+                "antes": valor_antes,
+                "depois": valor_depois,
+                "variacao_pct": round(variacao, 1) if variacao is not None else None,
+            }
+        linhas.append(linha)
+    return linhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("antes", type=Path)
+    parser.add_argument("depois", type=Path)
+    argumentos = parser.parse_args()
+
+    antes = json.loads(argumentos.antes.read_text(encoding="utf-8"))
+    depois = json.loads(argumentos.depois.read_text(encoding="utf-8"))
+    print(f"# {antes.get('commit')} -> {depois.get('commit')}")
+    for linha in comparar(antes, depois):
+        print(json.dumps(linha, ensure_ascii=False))
@@ -0,0 +1,173 @@
+"""
+Testes de carga da API, sem Auth0 nem PostgreSQL obrigatórios.
+
+Sobe um JWKS local (tokens RS256 assinados aqui, validados pela aplicação
+como seriam os do Auth0), semeia o banco e dispara os cenários contra a
+aplicação real, em processo, via `httpx.ASGITransport` (o lifespan roda
+normalmente). Cada cenário faz `--requisicoes` requisições com
+`--concorrencia` clientes simultâneos, depois de `--aquecimento`
+requisições não medidas.
+
+O relatório é um JSON com p50/p95/p99, média e máximo da latência e as
+requisições por segundo de cada cenário, mais o commit e os parâmetros da
+execução; compare dois relatórios com `comparar.py`.
+
+Sem DATABASE_URL usa um SQLite temporário; defina-a para medir contra um
+PostgreSQL (o banco deve estar vazio ou descartável).
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/carga/executar.py --saida resultado.json
+    PYTHONPATH=src python benchmarks/carga/executar.py --cenarios listar_pacientes,autenticacao --concorrencia 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+_TEMPORARIO = Path(tempfile.mkdtemp())
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_TEMPORARIO / 'bench_carga.db'}")
+os.environ.setdefault("OUTBOX_ARQUIVO", str(_TEMPORARIO / "eventos_auditoria.ndjson"))
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+# Um único usuário dispara todas as requisições: com o limite por cliente
+# ligado, a medição seria do 429. Defina LIMITE_HABILITADO=true para medi-lo.
+os.environ.setdefault("LIMITE_HABILITADO", "false")
+
+import jwks_local  # noqa: E402
+
+emissor = jwks_local.iniciar()
+
+import httpx  # noqa: E402
+
+from bem_saude.api.app import app  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.conexao import async_engine  # noqa: E402
+from cenarios import CENARIOS, Cenario, Contexto  # noqa: E402
+from semeador import semear  # noqa: E402
+
+
+def _percentil(ordenadas: list[float], fracao: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * fracao))]
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def medir(
+        cliente: httpx.AsyncClient,
+        nome: str,
+        cenario: Cenario,
+        contexto: Contexto,
+        requisicoes: int,
+        concorrencia: int,
+        aquecimento: int) -> dict:
+    # O aquecimento usa números após os medidos, para não repetir dados (ex.: CPFs)
+    for numero in range(requisicoes, requisicoes + aquecimento):
+        await cenario(cliente, contexto, numero)
+
+    numeros = iter(range(requisicoes))
+    latencias: list[float] = []
+    erros: dict[int, int] = {}
+
+    async def trabalhador() -> None:
+        for numero in numeros:
+            inicio = time.perf_counter()
+            resposta = await cenario(cliente, contexto, numero)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code >= 400:
+                erros[resposta.status_code] = erros.get(resposta.status_code, 0) + 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "cenario": nome,
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "duracao_s": round(duracao, 3),
+        "rps": round(len(latencias) / duracao, 1),
+        "latencia_ms": {
+            "p50": round(_percentil(latencias, 0.50) * 1000, 3),
+            "p95": round(_percentil(latencias, 0.95) * 1000, 3),
+            "p99": round(_percentil(latencias, 0.99) * 1000, 3),
+            "media": round(statistics.fmean(latencias) * 1000, 3),
+            "max": round(latencias[-1] * 1000, 3),
+        },
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> dict:
+    nomes = argumentos.cenarios.split(",") if argumentos.cenarios else list(CENARIOS)
+    desconhecidos = [nome for nome in nomes if nome not in CENARIOS]
+    if desconhecidos:
+        raise SystemExit(f"Cenários desconhecidos: {', '.join(desconhecidos)}")
+
+    pacientes, recepcionistas = await semear(async_engine, argumentos.pacientes, argumentos.recepcionistas)
+    contexto = Contexto(
+        pacientes=pacientes,
+        recepcionistas=recepcionistas,
+        cabecalhos={"Authorization": f"Bearer {emissor.emitir()}"},
+    )
+    if "autenticacao" in nomes:
+        # Emitidos antes da medição: assinar RS256 custa tanto quanto verificar
+        quantidade = argumentos.requisicoes + argumentos.aquecimento
+        contexto.tokens_novos = [emissor.emitir(sub=f"carga|{numero}") for numero in range(quantidade)]
+
+    resultados = []
+    async with app.router.lifespan_context(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://carga") as cliente:
+            for nome in nomes:
+                resultado = await medir(
+                    cliente, nome, CENARIOS[nome], contexto,
+                    argumentos.requisicoes, argumentos.concorrencia, argumentos.aquecimento,
+                )
+                print(json.dumps(resultado, ensure_ascii=False), file=sys.stderr)
+                resultados.append(resultado)
+
+    return {
+        "commit": _commit(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "banco": async_engine.dialect.name,
+        "parametros": {
+            "requisicoes": argumentos.requisicoes,
+            "concorrencia": argumentos.concorrencia,
+            "aquecimento": argumentos.aquecimento,
+            "pacientes": argumentos.pacientes,
+            "recepcionistas": argumentos.recepcionistas,
+        },
+        "cenarios": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", default="", help=f"Separados por vírgula; padrão: todos ({', '.join(CENARIOS)})")
+    parser.add_argument("--requisicoes", type=int, default=1000)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--aquecimento", type=int, default=20)
+    parser.add_argument("--pacientes", type=int, default=10000)
+    parser.add_argument("--recepcionistas", type=int, default=200)
+    parser.add_argument("--saida", type=Path, help="Arquivo do relatório JSON; padrão: saída padrão")
+    argumentos = parser.parse_args()
+
+    relatorio = json.dumps(asyncio.run(principal(argumentos)), ensure_ascii=False, indent=2)
+    if argumentos.saida:
+        argumentos.saida.write_text(relatorio + "\n", encoding="utf-8")
+    else:
+        print(relatorio)
@@ -0,0 +1,87 @@
+"""
+JWKS local e emissão de tokens para os testes de carga.
+
+Gera um par de chaves RSA, serve o JWKS em um servidor HTTP local (em uma
+thread) e emite tokens RS256 aceitos por `validar_token`. `iniciar()`
+preenche AUTH0_DOMAIN, AUTH0_AUDIENCE e AUTH0_JWKS_URL no ambiente, então
+deve ser chamado antes de importar a aplicação.
+
+Não importa o pacote `bem_saude`.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+
+DOMINIO = "bem-saude-carga.local"
+AUDIENCIA = "bem-saude-api"
+KID = "carga"
+
+
+def _base64url(numero: int) -> str:
+    dados = numero.to_bytes((numero.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode("ascii")
+
+
+class EmissorTokens:
+    def __init__(self, kid: str = KID):
+        self.kid = kid
+        chave_privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        numeros = chave_privada.public_key().public_numbers()
+        self.jwks = {"keys": [{
+            "kty": "RSA",
+            "kid": kid,
+            "use": "sig",
+            "alg": "RS256",
+            "n": _base64url(numeros.n),
+            "e": _base64url(numeros.e),
+        }]}
+        self._pem = chave_privada.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    def emitir(self, sub: str = "carga|usuario", validade_segundos: int = 3600) -> str:
+        agora = int(time.time())
+        reivindicacoes = {
+            "sub": sub,
+            "aud": AUDIENCIA,
+            "iss": f"https://{DOMINIO}/",
+            "iat": agora,
+            "exp": agora + validade_segundos,
+        }
+        return jwt.encode(reivindicacoes, self._pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+def iniciar() -> EmissorTokens:
+    """Sobe o servidor JWKS e aponta a configuração da aplicação para ele."""
+    emissor = EmissorTokens()
+    corpo = json.dumps(emissor.jwks).encode("utf-8")
+
+    class ManipuladorJwks(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ManipuladorJwks)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    os.environ["AUTH0_DOMAIN"] = DOMINIO
+    os.environ["AUTH0_AUDIENCE"] = AUDIENCIA
+    os.environ["AUTH0_JWKS_URL"] = f"http://127.0.0.1:{servidor.server_port}/.well-known/jwks.json"
+    return emissor
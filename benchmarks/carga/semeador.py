@@ -0,0 +1,97 @@
+"""
+Semeia o banco com pacientes e recepcionistas para os testes de carga.
+
+Insere direto nas tabelas, em lotes (executemany), sem passar pelos
+repositórios: a semeadura não gera eventos no outbox nem muda as versões
+das tabelas. Os CPFs são únicos e gravados só com dígitos, como a API os
+grava depois de normalizar o "000.000.000-00" recebido.
+
+Uso (a partir da raiz do repositório, contra o banco de DATABASE_URL):
+    PYTHONPATH=src python benchmarks/carga/semeador.py --pacientes 100000 --recepcionistas 1000
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from uuid6 import uuid7
+
+from bem_saude.infraestrutura.banco_dados.conexao import async_engine
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+
+TIPOS_SANGUINEOS = ("A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-")
+
+
+def formatar_cpf(numero: int) -> str:
+    digitos = f"{numero:011d}"
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+
+def gerar_paciente(numero: int) -> dict:
+    return {
+        "id": uuid7(),
+        "nome": f"Paciente Carga {numero:07d}",
+        # 1 em cada 10 inativo, para os filtros por status terem o que filtrar
+        "status": "INATIVO" if numero % 10 == 0 else "ATIVO",
+        "cpf": f"{numero:011d}",
+        "telefone": "(47)91234-4321",
+        "email": f"paciente{numero}@exemplo.com",
+        "endereco": "Rua dos Caçadores, 191",
+        "data_nascimento": date(1950, 1, 1) + timedelta(days=numero % 25000),
+        "tipo_sanguineo": TIPOS_SANGUINEOS[numero % len(TIPOS_SANGUINEOS)],
+        "observacoes": "",
+        "criado_em": datetime.now(),
+    }
+
+
+def gerar_recepcionista(numero: int) -> dict:
+    return {
+        "id": uuid7(),
+        "nome": f"Recepcionista Carga {numero:05d}",
+        "status": "INATIVO" if numero % 10 == 0 else "ATIVO",
+        "criado_em": datetime.now(),
+    }
+
+
+async def semear(
+        engine: AsyncEngine,
+        pacientes: int,
+        recepcionistas: int,
+        tamanho_lote: int = 5000) -> tuple[list[UUID], list[UUID]]:
+    """Cria as tabelas, se preciso, e insere os registros. Retorna os ids inseridos."""
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+
+    ids: dict[type, list[UUID]] = {ModeloPaciente: [], ModeloRecepcionista: []}
+    for modelo, quantidade, gerar in (
+            (ModeloPaciente, pacientes, gerar_paciente),
+            (ModeloRecepcionista, recepcionistas, gerar_recepcionista)):
+        for inicio in range(0, quantidade, tamanho_lote):
+            lote = [gerar(numero) for numero in range(inicio, min(inicio + tamanho_lote, quantidade))]
+            async with engine.begin() as conexao:
+                await conexao.execute(insert(modelo), lote)
+            ids[modelo].extend(registro["id"] for registro in lote)
+
+    return ids[ModeloPaciente], ids[ModeloRecepcionista]
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    pacientes, recepcionistas = await semear(
+        async_engine, argumentos.pacientes, argumentos.recepcionistas, argumentos.tamanho_lote
+    )
+    await async_engine.dispose()
+    print({"pacientes": len(pacientes), "recepcionistas": len(recepcionistas)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", type=int, default=10000)
+    parser.add_argument("--recepcionistas", type=int, default=200)
+    parser.add_argument("--tamanho-lote", type=int, default=5000)
+    asyncio.run(principal(parser.parse_args()))
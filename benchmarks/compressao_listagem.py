@@ -0,0 +1,108 @@
+"""
+Benchmark da compressão das páginas de GET /pacientes.
+
+Gera as páginas como a rota (consulta por colunas, campos padrão e orjson)
+e mede, para cada codificação disponível e nível, o tempo de CPU para
+comprimir uma página com os compressores do `MiddlewareCompressao` e os
+bytes economizados. br e zstd só entram se os pacotes `brotli` /
+`zstandard` estiverem instalados.
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/compressao_listagem.py --limites 50,200 --repeticoes 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+_BANCO = Path(tempfile.mkdtemp()) / "bench_compressao.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_BANCO}")
+
+import orjson  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from uuid6 import uuid7  # noqa: E402
+
+from bem_saude.api.middlewares.compressao import ALGORITMOS, algoritmos_disponiveis  # noqa: E402
+from bem_saude.api.serializacao import CAMPOS_PADRAO_PACIENTE, pacientes_para_resposta  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal, async_engine  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente  # noqa: E402
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente  # noqa: E402
+
+
+NIVEIS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 6, 11),
+    "zstd": (1, 3, 9),
+}
+
+TIPOS_SANGUINEOS = ("A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-")
+
+
+async def pagina(limite: int) -> bytes:
+    """Corpo de uma página da listagem, como a rota devolve."""
+    async with AsyncSessionLocal() as sessao:
+        pacientes = await RepositorioPaciente(sessao=sessao).listar(limite, campos=CAMPOS_PADRAO_PACIENTE)
+    return orjson.dumps({"itens": pacientes_para_resposta(pacientes, CAMPOS_PADRAO_PACIENTE), "proximo_cursor": None})
+
+
+def medir(corpo: bytes, codificacao: str, nivel: int, repeticoes: int) -> dict:
+    classe = ALGORITMOS[codificacao]
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        compressor = classe(nivel)
+        comprimido = compressor.comprimir(corpo) + compressor.finalizar()
+    duracao = time.process_time() - inicio
+    return {
+        "codificacao": codificacao,
+        "nivel": nivel,
+        "bytes": len(comprimido),
+        "bytes_economizados": len(corpo) - len(comprimido),
+        "razao": round(len(corpo) / len(comprimido), 2),
+        "ms_cpu_por_pagina": round(duracao / repeticoes * 1000, 3),
+        "mb_por_s": round(len(corpo) * repeticoes / duracao / 1_000_000, 1) if duracao else None,
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    limites = [int(limite) for limite in argumentos.limites.split(",")]
+    aleatorio = random.Random(42)
+    async with async_engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+        await conexao.execute(insert(ModeloPaciente), [
+            {
+                "id": uuid7(),
+                "nome": f"Paciente {i:05d}",
+                "status": aleatorio.choice(("ATIVO", "INATIVO")),
+                "cpf": f"{aleatorio.randrange(10**11):011d}",
+                "telefone": f"(47)9{aleatorio.randrange(10**8):08d}",
+                "email": f"paciente{i}@exemplo.com",
+                "endereco": f"Rua dos Caçadores, {aleatorio.randrange(1, 2000)}",
+                "data_nascimento": date(aleatorio.randrange(1940, 2020), aleatorio.randrange(1, 13), aleatorio.randrange(1, 29)),
+                "tipo_sanguineo": aleatorio.choice(TIPOS_SANGUINEOS),
+                "observacoes": None,
+            }
+            for i in range(max(limites))
+        ])
+
+    disponiveis = algoritmos_disponiveis()
+    for limite in limites:
+        corpo = await pagina(limite)
+        print({"itens_por_pagina": limite, "bytes": len(corpo), "codificacoes": disponiveis})
+        for codificacao in disponiveis:
+            for nivel in NIVEIS[codificacao]:
+                print({"itens_por_pagina": limite, **medir(corpo, codificacao, nivel, argumentos.repeticoes)})
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limites", default="50,200", help="Itens por página, separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    asyncio.run(principal(parser.parse_args()))
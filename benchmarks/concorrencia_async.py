@@ -0,0 +1,168 @@
+"""
+Benchmark de concorrência: rotas síncronas (threadpool) x rotas assíncronas.
+
+Injeta uma latência artificial em cada ida ao banco (segurando a conexão,
+como faria uma consulta lenta) e dispara requisições concorrentes para
+`GET /recepcionistas/{id}`. Em paralelo mede a latência de `GET /health`,
+que mostra se o servidor continua respondendo enquanto o banco está lento.
+
+- sincrono: rota `def` com Session síncrona, como era antes (ocupa uma
+  thread do threadpool do AnyIO durante toda a ida ao banco);
+- assincrono: a rota real da aplicação, com AsyncSession.
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/concorrencia_async.py --latencia-ms 50 --concorrencia 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID
+
+_BANCO = Path(tempfile.mkdtemp()) / "bench_concorrencia.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_BANCO}")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from uuid6 import uuid7  # noqa: E402
+
+from bem_saude.api.app import app as app_assincrono  # noqa: E402
+from bem_saude.api.auth import validar_token  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.conexao import async_engine, obter_sessao_async  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista  # noqa: E402
+
+
+LATENCIA = 0.05
+
+
+class SessaoComLatencia(Session):
+    def get(self, *args, **kwargs):
+        self.connection()
+        time.sleep(LATENCIA)
+        return super().get(*args, **kwargs)
+
+
+class SessaoAsyncComLatencia(AsyncSession):
+    async def get(self, *args, **kwargs):
+        await self.connection()
+        await asyncio.sleep(LATENCIA)
+        return await super().get(*args, **kwargs)
+
+
+def criar_app_sincrono(url_sincrona: str) -> FastAPI:
+    engine = create_engine(url_sincrona, pool_size=5, max_overflow=10)
+    fabrica = sessionmaker(bind=engine, class_=SessaoComLatencia)
+    app = FastAPI()
+
+    @app.get("/recepcionistas/{id}")
+    def buscar(id: UUID):
+        with fabrica() as sessao:
+            modelo = sessao.get(ModeloRecepcionista, id)
+            return {"id": str(modelo.id), "nome": modelo.nome}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def preparar_app_assincrono() -> FastAPI:
+    async def sessao_com_latencia():
+        async with SessaoAsyncComLatencia(bind=async_engine, expire_on_commit=False) as sessao:
+            yield sessao
+
+    app_assincrono.dependency_overrides[validar_token] = lambda: {"sub": "benchmark"}
+    app_assincrono.dependency_overrides[obter_sessao_async] = sessao_com_latencia
+    return app_assincrono
+
+
+def semear(url_sincrona: str) -> str:
+    engine = create_engine(url_sincrona)
+    Base.metadata.create_all(engine)
+    with Session(engine) as sessao:
+        modelo = ModeloRecepcionista(id=uuid7(), nome="Recepcionista Benchmark", status="ATIVO")
+        sessao.add(modelo)
+        sessao.commit()
+        id = str(modelo.id)
+    engine.dispose()
+    return id
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+async def executar(app: FastAPI, id: str, concorrencia: int, total: int) -> dict:
+    transporte = httpx.ASGITransport(app=app)
+    latencias: list[float] = []
+    latencias_health: list[float] = []
+    fila = iter(range(total))
+    terminou = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        async def trabalhador():
+            for _ in fila:
+                inicio = time.perf_counter()
+                resposta = await cliente.get(f"/recepcionistas/{id}")
+                resposta.raise_for_status()
+                latencias.append(time.perf_counter() - inicio)
+
+        async def sonda_health():
+            while not terminou.is_set():
+                inicio = time.perf_counter()
+                await cliente.get("/health")
+                latencias_health.append(time.perf_counter() - inicio)
+                await asyncio.sleep(0.01)
+
+        sonda = asyncio.create_task(sonda_health())
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+        duracao = time.perf_counter() - inicio
+        terminou.set()
+        await sonda
+
+    return {
+        "rps": round(total / duracao, 1),
+        "p50_ms": round(statistics.median(latencias) * 1000, 1),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 1),
+        "health_p50_ms": round(statistics.median(latencias_health) * 1000, 1),
+        "health_max_ms": round(max(latencias_health) * 1000, 1),
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    global LATENCIA
+    LATENCIA = argumentos.latencia_ms / 1000
+
+    url_sincrona = f"sqlite:///{_BANCO}"
+    id = semear(url_sincrona)
+
+    resultados = {
+        "sincrono": await executar(criar_app_sincrono(url_sincrona), id, argumentos.concorrencia, argumentos.total),
+        "assincrono": await executar(preparar_app_assincrono(), id, argumentos.concorrencia, argumentos.total),
+    }
+
+    print(f"latência injetada: {argumentos.latencia_ms} ms | concorrência: {argumentos.concorrencia}")
+    for nome, resultado in resultados.items():
+        print(f"{nome:>11}: {resultado}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencia-ms", type=float, default=50)
+    parser.add_argument("--concorrencia", type=int, default=200)
+    parser.add_argument("--total", type=int, default=1000)
+    asyncio.run(principal(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""
+Benchmark das configurações do pool de conexões (DB_POOL_*).
+
+Cria um engine assíncrono para cada cenário com `argumentos_engine`, a mesma
+função usada pela aplicação, e dispara consultas concorrentes por alguns
+segundos. Mede vazão, latência (p50/p95) e o tempo médio de checkout.
+
+Com SQLite o custo de abrir conexão e do pre-ping é pequeno; aponte
+DATABASE_URL para um PostgreSQL (de preferência remoto) para números
+representativos, inclusive do cenário NullPool atrás do PgBouncer.
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/pool_conexoes.py --concorrencia 50 --duracao 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+_BANCO = Path(tempfile.mkdtemp()) / "bench_pool.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_BANCO}")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from bem_saude.api.configuracoes import configuracoes  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.conexao import argumentos_engine  # noqa: E402
+from bem_saude.infraestrutura.servicos.metricas import checkout_pool  # noqa: E402
+
+
+CENARIOS = {
+    "padrao": {},
+    "sem_pre_ping": {"DB_POOL_PRE_PING": False},
+    "pool_20_sem_pre_ping": {"DB_POOL_TAMANHO": 20, "DB_POOL_PRE_PING": False},
+    "pool_20_lifo": {"DB_POOL_TAMANHO": 20, "DB_POOL_PRE_PING": False, "DB_POOL_LIFO": True},
+    "null_pool": {"DB_POOL_NULO": True, "DB_POOL_PRE_PING": False},
+}
+
+
+def _checkout_total() -> tuple[float, float]:
+    soma = contagem = 0.0
+    for nome, _, valor in checkout_pool.amostras():
+        if nome.endswith("_sum"):
+            soma += valor
+        elif nome.endswith("_count"):
+            contagem += valor
+    return soma, contagem
+
+
+async def medir(nome: str, ajustes: dict, concorrencia: int, duracao: float) -> dict:
+    config = configuracoes.model_copy(update=ajustes)
+    engine = create_async_engine(config.DATABASE_URL, **argumentos_engine(config, assincrono=True))
+    fabrica = async_sessionmaker(engine, expire_on_commit=False)
+    latencias: list[float] = []
+    soma_antes, contagem_antes = _checkout_total()
+
+    async def trabalhador(fim: float) -> None:
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            async with fabrica() as sessao:
+                await sessao.execute(text("SELECT 1"))
+            latencias.append(time.perf_counter() - inicio)
+
+    fim = time.perf_counter() + duracao
+    await asyncio.gather(*(trabalhador(fim) for _ in range(concorrencia)))
+    await engine.dispose()
+
+    soma, contagem = _checkout_total()
+    checkouts = contagem - contagem_antes
+    latencias.sort()
+    return {
+        "cenario": nome,
+        "operacoes_por_segundo": round(len(latencias) / duracao, 1),
+        "p50_ms": round(statistics.median(latencias) * 1000, 3),
+        "p95_ms": round(latencias[int(len(latencias) * 0.95)] * 1000, 3),
+        # NullPool não passa pelo pool instrumentado
+        "checkout_medio_ms": round((soma - soma_antes) / checkouts * 1000, 3) if checkouts else None,
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    for nome, ajustes in CENARIOS.items():
+        print(await medir(nome, ajustes, argumentos.concorrencia, argumentos.duracao))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concorrencia", type=int, default=50)
+    parser.add_argument("--duracao", type=float, default=5)
+    asyncio.run(principal(parser.parse_args()))
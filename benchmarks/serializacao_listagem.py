@@ -0,0 +1,120 @@
+"""
+Benchmark da serialização da listagem de pacientes.
+
+Compara o caminho anterior de `listar_pacientes` (entidades ORM completas,
+validação pelo `response_model` e `json.dumps` do JSONResponse) com o atual
+(consulta por colunas, dicionários montados a partir das `Row` e orjson),
+com todos os campos e com os campos padrão da rota (sem `observacoes`).
+Mede a consulta + serialização de uma página, sem a camada HTTP.
+
+Uso (a partir da raiz do repositório):
+    PYTHONPATH=src python benchmarks/serializacao_listagem.py --registros 200 --repeticoes 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+_BANCO = Path(tempfile.mkdtemp()) / "bench_serializacao.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_BANCO}")
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from uuid6 import uuid7  # noqa: E402
+
+from bem_saude.api.schemas.pacientes_schemas import PacientePaginaResponse  # noqa: E402
+from bem_saude.api.serializacao import CAMPOS_PACIENTE, CAMPOS_PADRAO_PACIENTE, pacientes_para_resposta  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal, async_engine  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base  # noqa: E402
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente  # noqa: E402
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente  # noqa: E402
+
+
+adaptador_pagina = TypeAdapter(PacientePaginaResponse)
+
+
+async def pagina_anterior(limite: int) -> bytes:
+    """Entidades ORM + validação/serialização do response_model + json.dumps."""
+    async with AsyncSessionLocal() as sessao:
+        consulta = (
+            select(ModeloPaciente)
+            .order_by(ModeloPaciente.status, ModeloPaciente.nome, ModeloPaciente.id)
+            .limit(limite)
+        )
+        pacientes = list((await sessao.scalars(consulta)).all())
+
+    conteudo = adaptador_pagina.validate_python(
+        {"itens": pacientes, "proximo_cursor": None}, from_attributes=True
+    )
+    conteudo = adaptador_pagina.dump_python(conteudo, mode="json")
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+async def pagina_atual(limite: int, campos: tuple[str, ...] = CAMPOS_PACIENTE) -> bytes:
+    """Consulta por colunas + dicionários a partir das Row + orjson."""
+    async with AsyncSessionLocal() as sessao:
+        pacientes = await RepositorioPaciente(sessao=sessao).listar(limite, campos=campos)
+    return orjson.dumps({"itens": pacientes_para_resposta(pacientes, campos), "proximo_cursor": None})
+
+
+async def pagina_padrao(limite: int) -> bytes:
+    """Como `pagina_atual`, com os campos padrão da rota (sem observacoes)."""
+    return await pagina_atual(limite, CAMPOS_PADRAO_PACIENTE)
+
+
+async def medir(nome, funcao, limite: int, repeticoes: int) -> dict:
+    await funcao(limite)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        corpo = await funcao(limite)
+    duracao = time.perf_counter() - inicio
+    return {
+        "implementacao": nome,
+        "itens_por_pagina": limite,
+        "ms_por_pagina": round(duracao / repeticoes * 1000, 3),
+        "bytes": len(corpo),
+    }
+
+
+async def principal(argumentos: argparse.Namespace) -> None:
+    async with async_engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+        await conexao.execute(insert(ModeloPaciente), [
+            {
+                "id": uuid7(),
+                "nome": f"Paciente {i:05d}",
+                "status": "ATIVO",
+                "cpf": f"{i:011d}",
+                "telefone": "(47)91234-4321",
+                "email": "paciente@exemplo.com",
+                "endereco": "Rua dos Caçadores, 191",
+                "data_nascimento": date(1990, 1, 1),
+                "tipo_sanguineo": "O+",
+                "observacoes": "Observação " * 20,
+            }
+            for i in range(argumentos.registros)
+        ])
+
+    # Os dois caminhos devem gerar o mesmo JSON
+    assert json.loads(await pagina_anterior(argumentos.registros)) == json.loads(await pagina_atual(argumentos.registros))
+
+    for nome, funcao in (
+            ("orm_response_model", pagina_anterior),
+            ("row_orjson", pagina_atual),
+            ("row_orjson_sem_observacoes", pagina_padrao)):
+        print(await medir(nome, funcao, argumentos.registros, argumentos.repeticoes))
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=200)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    asyncio.run(principal(parser.parse_args()))
@@ -2,12 +2,26 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
+from bem_saude.api.auth import cache_tokens, gerenciador_jwks
 from bem_saude.api.configuracoes import configuracoes
+from bem_saude.api.middlewares.compressao import MiddlewareCompressao
+from bem_saude.api.middlewares.consultas_sql import MiddlewareConsultasSql
+from bem_saude.api.middlewares.limite_requisicoes import MiddlewareLimiteRequisicoes
+from bem_saude.api.middlewares.metricas import MiddlewareMetricas
 from bem_saude.api.rotas.recepcionista_rotas import router as recepcionista_router
 from bem_saude.api.rotas.paciente_rotas import router as paciente_router
-from bem_saude.infraestrutura.banco_dados.conexao import engine
+from bem_saude.api.tratadores_excecao.paciente_tratadores import tratar_cpf_ja_cadastrado
+from bem_saude.dominio.excecoes.paciente_excecoes import CpfJaCadastradoErro
+from bem_saude.infraestrutura.banco_dados.ajustes_esquema import aplicar_ajustes_esquema
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal, async_engine, async_engines_leitura
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+from bem_saude.infraestrutura.cache.gerenciador_cache import cache
+from bem_saude.infraestrutura.limitador.gerenciador_limitador import criar_limitador
+from bem_saude.infraestrutura.servicos.atualizador_estatisticas import AtualizadorEstatisticas
+from bem_saude.infraestrutura.servicos.despachante_eventos import DespachanteEventos, criar_destino_eventos
+from bem_saude.infraestrutura.servicos.metricas import registro
 
 
 logging.basicConfig(
@@ -18,16 +32,44 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+despachante_eventos = DespachanteEventos(
+    AsyncSessionLocal,
+    criar_destino_eventos(),
+    tamanho_lote=configuracoes.OUTBOX_TAMANHO_LOTE,
+    intervalo_segundos=configuracoes.OUTBOX_INTERVALO_SEGUNDOS,
+)
+
+limitador = criar_limitador() if configuracoes.LIMITE_HABILITADO else None
+
+atualizador_estatisticas = AtualizadorEstatisticas(
+    AsyncSessionLocal,
+    intervalo_segundos=configuracoes.ESTATISTICAS_INTERVALO_SEGUNDOS,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Iniciando aplicação")
     try:
-        Base.metadata.create_all(bind=engine)
+        async with async_engine.begin() as conexao:
+            await conexao.run_sync(Base.metadata.create_all)
     except Exception as e:
         logger.error(f"Erro ao criar tabelas: {e}")
+    await aplicar_ajustes_esquema(async_engine)
+    await gerenciador_jwks.iniciar()
+    await despachante_eventos.iniciar()
+    await atualizador_estatisticas.iniciar()
     yield
     logger.info("Aplicação encerrando")
+    await atualizador_estatisticas.encerrar()
+    await despachante_eventos.encerrar()
+    await gerenciador_jwks.encerrar()
+    await cache.fechar()
+    if limitador is not None:
+        await limitador.fechar()
+    await async_engine.dispose()
+    for engine_leitura in async_engines_leitura:
+        await engine_leitura.dispose()
 
 
 def criar_aplicacao() -> FastAPI:
@@ -35,6 +77,7 @@ def criar_aplicacao() -> FastAPI:
         logger.info("Iniciando aplicação em modo PRODUÇÃO")
         app = FastAPI(
             lifespan=lifespan,
+            default_response_class=ORJSONResponse,
             docs_url=None,
             redoc_url=None,
             openapi_url=None,
@@ -43,6 +86,7 @@ def criar_aplicacao() -> FastAPI:
         logger.info("Iniciando aplicação em modo DESENVOLVIMENTO")
         app = FastAPI(
             lifespan=lifespan,
+            default_response_class=ORJSONResponse,
             title="Bem Saúde API",
             version="1.0.0",
             docs_url="/docs",
@@ -50,6 +94,10 @@ def criar_aplicacao() -> FastAPI:
             openapi_url="/openapi.json",
         )
 
+    if limitador is not None:
+        # Dentro do CORS, para que os 429 também levem os cabeçalhos CORS
+        app.add_middleware(MiddlewareLimiteRequisicoes, limitador=limitador, rotas=app.routes)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[
@@ -61,17 +109,45 @@ def criar_aplicacao() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if configuracoes.COMPRESSAO_HABILITADA:
+        app.add_middleware(
+            MiddlewareCompressao,
+            tamanho_minimo=configuracoes.COMPRESSAO_TAMANHO_MINIMO,
+            niveis={
+                "gzip": configuracoes.COMPRESSAO_NIVEL_GZIP,
+                "br": configuracoes.COMPRESSAO_NIVEL_BROTLI,
+                "zstd": configuracoes.COMPRESSAO_NIVEL_ZSTD,
+            },
+        )
+
+    if configuracoes.SQL_RASTREAMENTO_HABILITADO:
+        app.add_middleware(MiddlewareConsultasSql)
+
+    # Adicionado por último para envolver os demais middlewares e medir a requisição inteira
+    app.add_middleware(MiddlewareMetricas)
+
     app.include_router(recepcionista_router)
     app.include_router(paciente_router)
 
+    app.add_exception_handler(CpfJaCadastradoErro, tratar_cpf_ja_cadastrado)
+
     @app.get("/health")
     def health_check():
         return {
             "status": "ok",
             "ambiente": configuracoes.AMBIENTE,
             "swagger_habilitado": configuracoes.swagger_habilitado,
+            "cache_tokens": cache_tokens.estatisticas(),
+            "cache": cache.estatisticas(),
         }
 
+    @app.get("/metrics", include_in_schema=False)
+    def metricas():
+        return PlainTextResponse(
+            registro.exportar(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     return app
 
 
@@ -1,92 +1,165 @@
 """
 Módulo de autenticação com Auth0.
 
-Valida tokens JWT emitidos pelo Auth0 usando JWKS (JSON Web Key Set).
+Valida tokens JWT emitidos pelo Auth0 usando JWKS (JSON Web Key Set),
+mantido em memória pelo `GerenciadorJwks`.
 Fornece a dependência `validar_token` para proteger rotas da API.
 """
 
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Any
 
-import httpx
-from fastapi import Depends, HTTPException, status
+import anyio.to_thread
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
+from starlette.types import Scope
 
 from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.servicos.gerenciador_jwks import ErroBuscaJwks, GerenciadorJwks
+from bem_saude.infraestrutura.servicos.metricas import MetricaColetada, registro, validacao_token
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
-_jwks_cache: dict[str, Any] | None = None
 
-
-def _obter_jwks() -> dict[str, Any]:
-    """
-    Busca as chaves públicas (JWKS) do Auth0.
-    Faz cache em memória para evitar requisições repetidas.
+class CacheTokens:
     """
-    global _jwks_cache
-    if _jwks_cache is not None:
-        return _jwks_cache
+    Cache LRU dos payloads de tokens já validados.
 
-    jwks_url = f"https://{configuracoes.AUTH0_DOMAIN}/.well-known/jwks.json"
-    logger.info(f"Buscando JWKS em {jwks_url}")
-
-    response = httpx.get(jwks_url, timeout=10)
-    response.raise_for_status()
-    _jwks_cache = response.json()
-    return _jwks_cache
+    A chave é o SHA-256 do token, para não manter o token em claro na memória.
+    Cada entrada expira no TTL configurado ou no `exp` do token, o que vier primeiro.
+    """
 
+    def __init__(self, tamanho_maximo: int, ttl_segundos: float):
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl_segundos = ttl_segundos
+        self.acertos = 0
+        self.falhas = 0
+        self._itens: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def _chave(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def obter(self, token: str) -> dict[str, Any] | None:
+        chave = self._chave(token)
+        item = self._itens.get(chave)
+        if item is None:
+            self.falhas += 1
+            return None
+
+        expira_em, payload = item
+        if expira_em <= time.time():
+            del self._itens[chave]
+            self.falhas += 1
+            return None
+
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return payload
 
-def validar_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> dict[str, Any]:
+    def guardar(self, token: str, payload: dict[str, Any]) -> None:
+        if self.tamanho_maximo <= 0:
+            return
+
+        expira_em = time.time() + self.ttl_segundos
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expira_em = min(expira_em, float(exp))
+        if expira_em <= time.time():
+            return
+
+        chave = self._chave(token)
+        self._itens[chave] = (expira_em, payload)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.tamanho_maximo:
+            self._itens.popitem(last=False)
+
+    def estatisticas(self) -> dict[str, int]:
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "tamanho": len(self._itens),
+        }
+
+
+cache_tokens = CacheTokens(
+    tamanho_maximo=configuracoes.AUTH_CACHE_TAMANHO,
+    ttl_segundos=configuracoes.AUTH_CACHE_TTL_SEGUNDOS,
+)
+
+
+registro.registrar(MetricaColetada(
+    "bem_saude_cache_tokens_consultas_total",
+    "Consultas ao cache de tokens validados por resultado.",
+    "counter",
+    lambda: [({"resultado": "acerto"}, cache_tokens.acertos), ({"resultado": "falha"}, cache_tokens.falhas)],
+))
+
+
+gerenciador_jwks = GerenciadorJwks(
+    url=configuracoes.jwks_url,
+    ttl_segundos=configuracoes.JWKS_TTL_SEGUNDOS,
+    intervalo_minimo_segundos=configuracoes.JWKS_INTERVALO_MINIMO_SEGUNDOS,
+    espera_falha_inicial_segundos=configuracoes.JWKS_ESPERA_FALHA_INICIAL_SEGUNDOS,
+    espera_falha_maxima_segundos=configuracoes.JWKS_ESPERA_FALHA_MAXIMA_SEGUNDOS,
+)
+
+
+def _verificar_assinatura(token: str, rsa_key: Any) -> dict[str, Any]:
+    return jwt.decode(
+        token,
+        rsa_key,
+        algorithms=["RS256"],
+        audience=configuracoes.AUTH0_AUDIENCE,
+        issuer=f"https://{configuracoes.AUTH0_DOMAIN}/",
+    )
+
+
+async def decodificar_token(token: str) -> dict[str, Any]:
     """
-    Dependência FastAPI que valida o token JWT do Auth0.
+    Valida o token JWT do Auth0 e retorna o payload decodificado.
 
-    Retorna o payload decodificado do token se válido.
-    Lança HTTPException 401 se o token for inválido ou expirado.
+    Tokens já validados vêm do `cache_tokens`. Usado pela dependência
+    `validar_token` e pelo middleware de limite de requisições, que
+    identifica o cliente antes do roteamento.
+    Lança HTTPException 401 se o token for inválido ou expirado e 503 se o
+    JWKS não puder ser obtido.
     """
-    token = credentials.credentials
+    inicio = time.perf_counter()
 
-    try:
-        jwks = _obter_jwks()
+    payload = cache_tokens.obter(token)
+    if payload is not None:
+        validacao_token.observar(time.perf_counter() - inicio, resultado="cache")
+        return payload
 
+    resultado = "rejeitado"
+    try:
         # Extrair o header do token para encontrar a chave correta
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get("kid")
 
         # Encontrar a chave pública correspondente
-        rsa_key: dict[str, str] = {}
-        for key in jwks.get("keys", []):
-            if key["kid"] == kid:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
-                break
-
-        if not rsa_key:
+        rsa_key = await gerenciador_jwks.obter_chave(kid)
+
+        if rsa_key is None:
             logger.warning("Chave pública não encontrada no JWKS")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token inválido: chave não encontrada",
             )
 
-        # Decodificar e validar o token
-        payload = jwt.decode(
-            token,
-            rsa_key,
-            algorithms=["RS256"],
-            audience=configuracoes.AUTH0_AUDIENCE,
-            issuer=f"https://{configuracoes.AUTH0_DOMAIN}/",
-        )
+        # Decodificar e validar o token; a verificação RS256 é trabalho de CPU e
+        # roda no threadpool, sem travar o event loop (o cache limita as chamadas)
+        payload = await anyio.to_thread.run_sync(_verificar_assinatura, token, rsa_key)
 
+        cache_tokens.guardar(token, payload)
+        resultado = "validado"
         return payload
 
     except JWTError as e:
@@ -95,9 +168,53 @@ def validar_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
         )
-    except httpx.HTTPError as e:
+    except ErroBuscaJwks as e:
         logger.error(f"Erro ao buscar JWKS: {e}")
+        resultado = "indisponivel"
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Erro ao validar autenticação",
         )
+    finally:
+        validacao_token.observar(time.perf_counter() - inicio, resultado=resultado)
+
+
+# Chave de `scope["state"]` com o resultado da validação do token da requisição
+ESTADO_VALIDACAO_TOKEN = "validacao_token"
+
+
+async def decodificar_token_da_requisicao(scope: Scope, token: str) -> dict[str, Any]:
+    """
+    `decodificar_token` com o resultado (payload ou recusa) guardado no
+    `scope["state"]` da requisição.
+
+    O middleware de limite de requisições valida o token antes do roteamento;
+    a dependência `validar_token` reaproveita o resultado, em vez de validar
+    (e registrar a recusa no log) uma segunda vez.
+    """
+    estado = scope.setdefault("state", {})
+    validacao = estado.get(ESTADO_VALIDACAO_TOKEN)
+    if validacao is None or validacao[0] != token:
+        try:
+            validacao = (token, await decodificar_token(token), None)
+        except HTTPException as e:
+            validacao = (token, None, e)
+        estado[ESTADO_VALIDACAO_TOKEN] = validacao
+
+    _, payload, erro = validacao
+    if erro is not None:
+        raise HTTPException(status_code=erro.status_code, detail=erro.detail)
+    return payload
+
+
+async def validar_token(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict[str, Any]:
+    """
+    Dependência FastAPI que valida o token JWT do Auth0.
+
+    Retorna o payload decodificado do token se válido.
+    Lança HTTPException 401 se o token for inválido ou expirado.
+    """
+    return await decodificar_token_da_requisicao(request.scope, credentials.credentials)
@@ -0,0 +1,45 @@
+"""
+ETag e GET condicional das listagens e detalhes.
+
+O ETag da listagem deriva da versão da tabela (incrementada a cada escrita)
+e da URL da requisição, para que páginas e filtros diferentes tenham ETags
+diferentes. O do detalhe é o hash da própria representação, guardada no
+cache de leitura. Quando o `If-None-Match` corresponde, a rota responde 304
+sem consultar o ORM.
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+from bem_saude.api.configuracoes import configuracoes
+
+
+def etag_da_versao(versao: int, request: Request) -> str:
+    url = f"{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha256(f"{versao}:{url}".encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_do_conteudo(conteudo: bytes) -> str:
+    return '"' + hashlib.sha256(conteudo).hexdigest()[:32] + '"'
+
+
+def etag_corresponde(request: Request, etag: str) -> bool:
+    """Compara com o If-None-Match (comparação fraca, como pede a RFC 9110 para GET)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidato.strip().removeprefix("W/") == etag
+        for candidato in if_none_match.split(",")
+    )
+
+
+def cabecalhos_cache(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": configuracoes.HTTP_CACHE_CONTROL}
+
+
+def resposta_nao_modificada(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos_cache(etag))
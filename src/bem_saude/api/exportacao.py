@@ -0,0 +1,60 @@
+"""
+Codificação da exportação de pacientes em NDJSON e CSV.
+
+Os geradores recebem os registros em lotes e produzem um bloco de texto
+por lote, para serem enviados via StreamingResponse sem montar o arquivo
+inteiro em memória.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator
+from enum import Enum
+
+from bem_saude.api.schemas.pacientes_schemas import PacienteResponse
+
+
+class FormatoExportacao(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# Registros buscados por ida ao banco no cursor do servidor
+TAMANHO_LOTE = 1000
+
+
+TIPOS_CONTEUDO = {
+    FormatoExportacao.NDJSON: "application/x-ndjson",
+    FormatoExportacao.CSV: "text/csv; charset=utf-8",
+}
+
+
+COLUNAS_CSV = list(PacienteResponse.model_fields)
+
+
+async def gerar_ndjson(lotes: AsyncIterable[list]) -> AsyncIterator[bytes]:
+    async for lote in lotes:
+        linhas = [
+            PacienteResponse.model_validate(paciente, from_attributes=True).model_dump_json()
+            for paciente in lote
+        ]
+        yield ("\n".join(linhas) + "\n").encode("utf-8")
+
+
+async def gerar_csv(lotes: AsyncIterable[list]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUNAS_CSV)
+
+    async for lote in lotes:
+        for paciente in lote:
+            dados = PacienteResponse.model_validate(paciente, from_attributes=True).model_dump(mode="json")
+            escritor.writerow(dados[coluna] for coluna in COLUNAS_CSV)
+
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Envia o cabeçalho mesmo quando não há registros
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
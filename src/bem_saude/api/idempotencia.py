@@ -0,0 +1,119 @@
+"""
+Chaves de idempotência (`Idempotency-Key`) dos cadastros.
+
+Com o cabeçalho, a primeira resposta do cadastro é guardada na tabela
+`requisicoes_idempotentes`, na mesma transação do INSERT: ou os dois são
+gravados, ou nenhum. Repetições com a mesma chave (retentativas do cliente
+ou do gateway) recebem a resposta guardada, com `Idempotent-Replayed: true`,
+sem cadastrar de novo. A mesma chave com outro corpo é rejeitada com 422.
+
+As chaves são separadas por usuário do token (`sub`) e por rota, e expiram
+após `IDEMPOTENCIA_TTL_SEGUNDOS`.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bem_saude.api.auth import validar_token
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.banco_dados.conexao import LER_DO_PRIMARIO, obter_sessao_async
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_requisicao_idempotente import ModeloRequisicaoIdempotente
+from bem_saude.infraestrutura.repositorios.repositorio_requisicao_idempotente import RepositorioRequisicaoIdempotente
+
+
+CABECALHO_REPETIDA = "Idempotent-Replayed"
+
+
+class Idempotencia:
+    """Chave de idempotência de uma requisição (inativa quando o cabeçalho não foi enviado)."""
+
+    def __init__(self, sessao: AsyncSession, escopo: str, rota: str, chave: str | None):
+        self.sessao = sessao
+        self.escopo = escopo
+        self.rota = rota
+        self.chave = chave
+        self.repositorio = RepositorioRequisicaoIdempotente(sessao)
+        self._hash: str | None = None
+
+
+    async def resposta_repetida(self, dados: BaseModel) -> Response | None:
+        """Resposta guardada para a chave, ou None se a requisição deve ser executada."""
+        if self.chave is None:
+            return None
+
+        self._hash = hashlib.sha256(dados.model_dump_json().encode("utf-8")).hexdigest()
+        return await self._resposta_guardada()
+
+
+    async def resposta_concorrente(self) -> Response | None:
+        """
+        Chamado quando o commit do cadastro falha por violação de unicidade.
+
+        Se outra requisição com a mesma chave gravou primeiro, devolve a
+        resposta dela; senão retorna None e o erro original deve seguir.
+        """
+        if self.chave is None:
+            return None
+
+        await self.sessao.rollback()
+        return await self._resposta_guardada()
+
+
+    async def guardar(self, status_code: int, corpo: bytes) -> None:
+        """Guarda a resposta na transação corrente; o commit do cadastro a grava."""
+        if self.chave is None:
+            return
+
+        await self.repositorio.registrar(ModeloRequisicaoIdempotente(
+            escopo=self.escopo,
+            rota=self.rota,
+            chave=self.chave,
+            hash_requisicao=self._hash,
+            status_code=status_code,
+            corpo=corpo,
+            expira_em=datetime.now() + timedelta(seconds=configuracoes.IDEMPOTENCIA_TTL_SEGUNDOS),
+        ))
+
+
+    async def _resposta_guardada(self) -> Response | None:
+        requisicao = await self.repositorio.obter(self.escopo, self.rota, self.chave)
+        if requisicao is None:
+            return None
+
+        if requisicao.hash_requisicao != self._hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key já utilizada com outro corpo de requisição",
+            )
+
+        return Response(
+            content=requisicao.corpo,
+            status_code=requisicao.status_code,
+            media_type="application/json",
+            headers={CABECALHO_REPETIDA: "true"},
+        )
+
+
+async def obter_idempotencia(
+    request: Request,
+    chave: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Chave única por tentativa de cadastro. Repetições com a mesma chave devolvem a primeira resposta.",
+    ),
+    payload: dict[str, Any] = Depends(validar_token),
+    sessao: AsyncSession = Depends(obter_sessao_async),
+) -> Idempotencia:
+    if chave is not None:
+        # Uma réplica atrasada não veria a chave recém-gravada
+        sessao.info[LER_DO_PRIMARIO] = True
+
+    rota = f"{request.method} {request.scope['route'].path}"
+    return Idempotencia(sessao, escopo=payload.get("sub", ""), rota=rota, chave=chave)
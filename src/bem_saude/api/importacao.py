@@ -0,0 +1,117 @@
+"""
+Leitura da importação em lote de pacientes (NDJSON ou CSV).
+
+O corpo da requisição é consumido em streaming, linha a linha, sem ser
+carregado inteiro em memória. Cada registro é entregue com o número da
+linha de origem para compor o relatório de erros.
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from enum import Enum
+from typing import Any
+
+from pydantic import ValidationError
+
+
+class FormatoImportacao(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# Registros inseridos por transação
+TAMANHO_LOTE = 1000
+
+# Limite de erros detalhados na resposta; os demais são apenas contados
+MAXIMO_ERROS_RELATADOS = 1000
+
+
+class RegistroInvalidoErro(ValueError):
+    """Linha que não pôde ser interpretada no formato informado."""
+
+
+async def ler_linhas(fluxo: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    pendente = ""
+    numero = 0
+
+    async for bloco in fluxo:
+        pendente += decodificador.decode(bloco)
+        *linhas, pendente = pendente.split("\n")
+        for linha in linhas:
+            numero += 1
+            yield numero, linha.rstrip("\r")
+
+    pendente += decodificador.decode(b"", final=True)
+    if pendente:
+        numero += 1
+        yield numero, pendente.rstrip("\r")
+
+
+async def ler_registros(
+        fluxo: AsyncIterable[bytes],
+        formato: FormatoImportacao) -> AsyncIterator[tuple[int, dict[str, Any] | RegistroInvalidoErro]]:
+    """
+    Converte o fluxo em registros (dicionários) com o número da linha.
+
+    Linhas vazias são ignoradas. No CSV a primeira linha é o cabeçalho e
+    cada registro deve ocupar uma única linha.
+    """
+    cabecalho: list[str] | None = None
+
+    async for numero, linha in ler_linhas(fluxo):
+        if not linha.strip():
+            continue
+
+        if formato == FormatoImportacao.NDJSON:
+            try:
+                registro = json.loads(linha)
+            except ValueError as e:
+                yield numero, RegistroInvalidoErro(f"JSON inválido: {e}")
+                continue
+            if not isinstance(registro, dict):
+                yield numero, RegistroInvalidoErro("Cada linha deve conter um objeto JSON")
+                continue
+            yield numero, registro
+            continue
+
+        valores = next(csv.reader([linha]))
+        if cabecalho is None:
+            cabecalho = [coluna.strip() for coluna in valores]
+            continue
+        if len(valores) != len(cabecalho):
+            yield numero, RegistroInvalidoErro(
+                f"Esperadas {len(cabecalho)} colunas, encontradas {len(valores)}"
+            )
+            continue
+        yield numero, dict(zip(cabecalho, valores))
+
+
+class RelatorioImportacao:
+    """Acumula o resultado da importação: registros inseridos e erros por linha."""
+
+    def __init__(self):
+        self.inseridos = 0
+        self.total_erros = 0
+        self.erros: list[dict[str, Any]] = []
+
+    def registrar_erro(self, linha: int, mensagem: str) -> None:
+        self.total_erros += 1
+        if len(self.erros) < MAXIMO_ERROS_RELATADOS:
+            self.erros.append({"linha": linha, "mensagem": mensagem})
+
+    def como_resposta(self) -> dict[str, Any]:
+        return {
+            "inseridos": self.inseridos,
+            "total_erros": self.total_erros,
+            "erros": self.erros,
+        }
+
+
+def descrever_erro_validacao(erro: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in detalhe['loc'])}: {detalhe['msg']}"
+        for detalhe in erro.errors()
+    )
@@ -0,0 +1,230 @@
+"""
+Middleware de compressão das respostas.
+
+Escolhe a codificação pelo Accept-Encoding (maior q; empate pela ordem de
+`ALGORITMOS`): br e zstd quando os pacotes `brotli` / `zstandard` estão
+instalados, gzip sempre. Respostas de corpo único abaixo do tamanho mínimo
+seguem sem compressão. Respostas em streaming (ex.: exportação) são
+comprimidas pedaço a pedaço, com flush a cada pedaço: nada é acumulado
+e o cliente recebe os dados à medida que são gerados.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Tipos de conteúdo textuais que valem a compressão
+TIPOS_COMPRIMIVEIS = ("application/json", "application/x-ndjson", "text/")
+
+
+class Compressor(ABC):
+    """Compressão incremental de um corpo de resposta."""
+
+    @abstractmethod
+    def comprimir(self, dados: bytes) -> bytes:
+        """Comprime um pedaço e já devolve tudo o que pode ser descomprimido até ele."""
+
+    @abstractmethod
+    def finalizar(self) -> bytes:
+        """Encerra o corpo comprimido."""
+
+
+class CompressorGzip(Compressor):
+    def __init__(self, nivel: int):
+        # wbits 16 + 15: formato gzip (cabeçalho e CRC), janela de 32 KB
+        self._compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def comprimir(self, dados: bytes) -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self) -> bytes:
+        return self._compressor.flush()
+
+
+class CompressorBrotli(Compressor):
+    def __init__(self, nivel: int):
+        self._compressor = brotli.Compressor(quality=nivel)
+
+    def comprimir(self, dados: bytes) -> bytes:
+        return self._compressor.process(dados) + self._compressor.flush()
+
+    def finalizar(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressorZstd(Compressor):
+    def __init__(self, nivel: int):
+        self._compressor = zstandard.ZstdCompressor(level=nivel).compressobj()
+
+    def comprimir(self, dados: bytes) -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finalizar(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Codificações suportadas, em ordem de preferência no empate de q
+ALGORITMOS = {
+    "br": CompressorBrotli,
+    "zstd": CompressorZstd,
+    "gzip": CompressorGzip,
+}
+
+
+def algoritmos_disponiveis() -> list[str]:
+    disponiveis = []
+    if brotli is not None:
+        disponiveis.append("br")
+    if zstandard is not None:
+        disponiveis.append("zstd")
+    disponiveis.append("gzip")
+    return disponiveis
+
+
+def escolher_codificacao(accept_encoding: str, disponiveis: list[str]) -> str | None:
+    """Codificação aceita de maior q entre as disponíveis; None para enviar sem compressão."""
+    pesos: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.strip().partition(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+        peso = 1.0
+        parametro, _, valor = parametros.strip().partition("=")
+        if parametro.strip().lower() == "q":
+            try:
+                peso = float(valor)
+            except ValueError:
+                peso = 0.0
+        pesos[nome] = peso
+
+    melhor, melhor_peso = None, 0.0
+    for nome in disponiveis:
+        peso = pesos.get(nome, pesos.get("*", 0.0))
+        if peso > melhor_peso:
+            melhor, melhor_peso = nome, peso
+    return melhor
+
+
+class MiddlewareCompressao:
+    def __init__(
+            self,
+            app: ASGIApp,
+            tamanho_minimo: int = 1024,
+            niveis: dict[str, int] | None = None):
+        self.app = app
+        self.tamanho_minimo = tamanho_minimo
+        self.niveis = {"gzip": 6, "br": 4, "zstd": 3, **(niveis or {})}
+        self.disponiveis = algoritmos_disponiveis()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""), self.disponiveis)
+        inicio: Message | None = None
+        compressor: Compressor | None = None
+        ignorar = False
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal inicio, compressor, ignorar
+
+            if mensagem["type"] == "http.response.start":
+                # Segurado até o primeiro pedaço do corpo, que decide se comprime
+                inicio = mensagem
+                cabecalhos = Headers(raw=mensagem["headers"])
+                tipo = cabecalhos.get("content-type", "")
+                ignorar = (
+                    mensagem["status"] in (204, 304)
+                    or "content-encoding" in cabecalhos
+                    or not tipo.startswith(TIPOS_COMPRIMIVEIS)
+                )
+                # Com uma codificação aceita, o ETag é fraco mesmo que o corpo siga sem
+                # compressão (abaixo do tamanho mínimo): o 304, sem corpo para decidir,
+                # aplica a mesma regra, e o validador não muda na revalidação
+                if mensagem["status"] == 304:
+                    cabecalhos_304 = MutableHeaders(scope=mensagem)
+                    _adicionar_vary(cabecalhos_304)
+                    if codificacao is not None:
+                        _enfraquecer_etag(cabecalhos_304)
+                elif not ignorar and codificacao is not None:
+                    _enfraquecer_etag(MutableHeaders(scope=mensagem))
+                if not ignorar and codificacao is None:
+                    _adicionar_vary(MutableHeaders(scope=mensagem))
+                    ignorar = True
+                if ignorar:
+                    await send(mensagem)
+                return
+
+            if mensagem["type"] != "http.response.body" or ignorar:
+                await send(mensagem)
+                return
+
+            corpo = mensagem.get("body", b"")
+            mais = mensagem.get("more_body", False)
+
+            if compressor is None:
+                cabecalhos = MutableHeaders(scope=inicio)
+                _adicionar_vary(cabecalhos)
+                if mais:
+                    # Em streaming o tamanho só é conhecido pelo Content-Length, quando houver
+                    pequeno = "content-length" in cabecalhos and int(cabecalhos["content-length"]) < self.tamanho_minimo
+                else:
+                    pequeno = len(corpo) < self.tamanho_minimo
+                if pequeno:
+                    ignorar = True
+                    await send(inicio)
+                    await send(mensagem)
+                    return
+
+                compressor = ALGORITMOS[codificacao](self.niveis[codificacao])
+                cabecalhos["Content-Encoding"] = codificacao
+                if mais:
+                    # Tamanho final desconhecido: a resposta segue em chunked
+                    del cabecalhos["content-length"]
+                    await send(inicio)
+                    await send({"type": "http.response.body", "body": compressor.comprimir(corpo), "more_body": True})
+                else:
+                    comprimido = compressor.comprimir(corpo) + compressor.finalizar()
+                    cabecalhos["Content-Length"] = str(len(comprimido))
+                    await send(inicio)
+                    await send({"type": "http.response.body", "body": comprimido})
+                return
+
+            if mais:
+                comprimido = compressor.comprimir(corpo)
+                if comprimido:
+                    await send({"type": "http.response.body", "body": comprimido, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.comprimir(corpo) + compressor.finalizar()})
+
+        await self.app(scope, receive, enviar)
+
+
+def _adicionar_vary(cabecalhos: MutableHeaders) -> None:
+    # A representação depende do Accept-Encoding, mesmo quando vai sem compressão
+    vary = cabecalhos.get("vary", "")
+    if "accept-encoding" not in vary.lower() and vary.strip() != "*":
+        cabecalhos["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+
+def _enfraquecer_etag(cabecalhos: MutableHeaders) -> None:
+    # O corpo comprimido não é byte a byte o mesmo: o ETag passa a fraco.
+    # O If-None-Match continua valendo, pois `etag_corresponde` faz a comparação fraca
+    etag = cabecalhos.get("etag")
+    if etag and not etag.startswith("W/"):
+        cabecalhos["ETag"] = f"W/{etag}"
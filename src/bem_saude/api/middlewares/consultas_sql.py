@@ -0,0 +1,54 @@
+"""
+Middleware de rastreamento das consultas SQL por requisição.
+
+Abre o contexto em que os ganchos de `rastreamento_consultas` acumulam
+a quantidade de comandos e o tempo no banco, e devolve os totais no
+cabeçalho `Server-Timing` (visível na aba Network do navegador).
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bem_saude.infraestrutura.banco_dados.rastreamento_consultas import (
+    encerrar_contexto,
+    iniciar_contexto,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class MiddlewareConsultasSql:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estatisticas, token = iniciar_contexto()
+
+        async def enviar(mensagem: Message) -> None:
+            if mensagem["type"] == "http.response.start":
+                # Em respostas em streaming contabiliza apenas o que rodou antes do cabeçalho
+                cabecalhos = MutableHeaders(scope=mensagem)
+                cabecalhos.append(
+                    "Server-Timing",
+                    f'db;dur={estatisticas.duracao_segundos * 1000:.1f};desc="consultas: {estatisticas.quantidade}"',
+                )
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            encerrar_contexto(token)
+            logger.debug(
+                "%s %s: %d consultas em %.1f ms",
+                scope["method"],
+                scope["path"],
+                estatisticas.quantidade,
+                estatisticas.duracao_segundos * 1000,
+            )
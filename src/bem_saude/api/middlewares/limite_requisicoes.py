@@ -0,0 +1,128 @@
+"""
+Middleware de limite de requisições por cliente e rota.
+
+Identifica o cliente pelo token (claim `sub`, ou `azp` se configurado), com
+a mesma validação de `validar_token`, que reaproveita o resultado (o token
+é validado uma vez por requisição), e aplica dois limites por cliente e
+rota (ex.: "GET /pacientes"):
+- taxa (token bucket): `taxa` requisições por segundo, com rajadas de até `rajada`;
+- concorrência: no máximo `concorrencia` requisições em andamento.
+
+Como cada rota tem o seu limite, um cliente que martela uma listagem cara
+esgota só o limite dela, e não as vagas do pool das demais rotas.
+Excedido o limite, responde 429 com `Retry-After`. Requisições sem token
+válido passam direto: a rota responde 401/403 sem ir ao banco.
+"""
+
+import math
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from bem_saude.api.auth import decodificar_token_da_requisicao
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.limitador.limitador_base import Limitador
+from bem_saude.infraestrutura.servicos.metricas import requisicoes_limitadas
+
+
+class Limite:
+    def __init__(self, taxa: float, rajada: int, concorrencia: int):
+        self.taxa = taxa
+        self.rajada = rajada
+        self.concorrencia = concorrencia
+
+
+def limites_configurados() -> tuple[Limite, dict[str, Limite]]:
+    """Limite padrão e limites por rota; valores omitidos em LIMITE_ROTAS seguem o padrão."""
+    padrao = Limite(
+        taxa=configuracoes.LIMITE_TAXA_PADRAO,
+        rajada=configuracoes.LIMITE_RAJADA_PADRAO,
+        concorrencia=configuracoes.LIMITE_CONCORRENCIA_PADRAO,
+    )
+    por_rota = {
+        rota: Limite(
+            taxa=float(valores.get("taxa", padrao.taxa)),
+            rajada=int(valores.get("rajada", padrao.rajada)),
+            concorrencia=int(valores.get("concorrencia", padrao.concorrencia)),
+        )
+        for rota, valores in configuracoes.LIMITE_ROTAS.items()
+    }
+    return padrao, por_rota
+
+
+class MiddlewareLimiteRequisicoes:
+    def __init__(self, app: ASGIApp, limitador: Limitador, rotas: list[BaseRoute]):
+        self.app = app
+        self.limitador = limitador
+        # A lista de rotas da aplicação (preenchida depois, pelos include_router)
+        self.rotas = rotas
+        self.padrao, self.por_rota = limites_configurados()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rota = self._encontrar_rota(scope)
+        cliente = await self._identificar_cliente(scope) if rota is not None else None
+        if cliente is None:
+            await self.app(scope, receive, send)
+            return
+
+        # O roteador gravaria a mesma rota; gravada antes, as métricas também rotulam os 429
+        scope["route"] = rota
+        nome_rota = f"{scope['method']} {rota.path}"
+        limite = self.por_rota.get(nome_rota, self.padrao)
+        chave = f"{cliente}|{nome_rota}"
+
+        espera = await self.limitador.consumir(chave, limite.taxa, limite.rajada)
+        if espera > 0:
+            await self._recusar(scope, receive, send, nome_rota, "taxa", espera)
+            return
+
+        if not await self.limitador.entrar(chave, limite.concorrencia):
+            await self._recusar(scope, receive, send, nome_rota, "concorrencia", 1)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.limitador.sair(chave)
+
+    def _encontrar_rota(self, scope: Scope) -> BaseRoute | None:
+        for rota in self.rotas:
+            correspondencia, _ = rota.matches(scope)
+            if correspondencia == Match.FULL:
+                return rota
+        return None
+
+    async def _identificar_cliente(self, scope: Scope) -> str | None:
+        esquema, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if esquema.lower() != "bearer" or not token:
+            return None
+
+        try:
+            payload = await decodificar_token_da_requisicao(scope, token)
+        except HTTPException:
+            # validar_token recusa a requisição na rota
+            return None
+        return payload.get(configuracoes.LIMITE_CLAIM_CLIENTE) or payload.get("sub")
+
+    async def _recusar(
+            self,
+            scope: Scope,
+            receive: Receive,
+            send: Send,
+            nome_rota: str,
+            motivo: str,
+            espera: float) -> None:
+        requisicoes_limitadas.incrementar(rota=nome_rota, motivo=motivo)
+        resposta = ORJSONResponse(
+            {"detail": "Limite de requisições excedido. Tente novamente mais tarde."},
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(espera)))},
+        )
+        await resposta(scope, receive, send)
@@ -0,0 +1,52 @@
+"""
+Middleware de métricas HTTP.
+
+Registra, por método e template de rota (ex.: /pacientes/{id}), a
+latência, o status das respostas e as requisições em andamento.
+Implementado como middleware ASGI puro para não bufferizar respostas
+em streaming.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bem_saude.infraestrutura.servicos.metricas import (
+    duracao_requisicoes,
+    requisicoes_em_andamento,
+    requisicoes_total,
+)
+
+
+ROTA_NAO_MAPEADA = "nao_mapeada"
+
+
+class MiddlewareMetricas:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+            await send(mensagem)
+
+        inicio = time.perf_counter()
+        requisicoes_em_andamento.incrementar()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            requisicoes_em_andamento.decrementar()
+            # O roteador do FastAPI grava a rota encontrada no scope;
+            # usar o template evita uma série por id
+            rota = getattr(scope.get("route"), "path", ROTA_NAO_MAPEADA)
+            metodo = scope["method"]
+            duracao_requisicoes.observar(time.perf_counter() - inicio, metodo=metodo, rota=rota)
+            requisicoes_total.incrementar(metodo=metodo, rota=rota, status=str(status_code))
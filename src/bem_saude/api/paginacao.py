@@ -0,0 +1,53 @@
+"""
+Paginação por cursor (keyset) das listagens.
+
+O cursor é opaco para o cliente: guarda a chave de ordenação
+(status, nome, id) do último item da página, cifrada com Fernet (AES +
+HMAC). Com a chave inteira no cursor, a próxima página continua do ponto
+certo mesmo que o último item seja alterado ou removido entre as
+requisições; cifrada, o nome não aparece na query string (nem nos logs de
+acesso), e um cursor adulterado é recusado.
+"""
+
+import base64
+import hashlib
+import json
+from uuid import UUID
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from bem_saude.api.configuracoes import configuracoes
+
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+class CursorInvalidoErro(ValueError):
+    """Cursor recebido não pôde ser decodificado."""
+
+
+def _criar_fernet(segredo: str) -> Fernet:
+    # Fernet exige 32 bytes em base64; o segredo configurado pode ter qualquer formato
+    return Fernet(base64.urlsafe_b64encode(hashlib.sha256(segredo.encode("utf-8")).digest()))
+
+
+# Sem chave configurada, deriva da DATABASE_URL, comum a todos os workers e instâncias
+_fernet = _criar_fernet(configuracoes.PAGINACAO_CHAVE_CURSOR or f"cursor:{configuracoes.DATABASE_URL}")
+
+
+def codificar_cursor(status: str, nome: str, id: UUID) -> str:
+    bruto = json.dumps([status, nome, str(id)], separators=(",", ":")).encode("utf-8")
+    return _fernet.encrypt(bruto).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[str, str, UUID]:
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        bruto = _fernet.decrypt((cursor + preenchimento).encode("ascii"))
+        status, nome, id = json.loads(bruto)
+        if not isinstance(status, str) or not isinstance(nome, str):
+            raise TypeError("chave de ordenação inválida")
+        return status, nome, UUID(id)
+    except (InvalidToken, ValueError, TypeError) as e:
+        raise CursorInvalidoErro("Cursor de paginação inválido") from e
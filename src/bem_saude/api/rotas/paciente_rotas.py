@@ -1,14 +1,48 @@
+import logging
+from datetime import date, datetime
 from http import HTTPStatus
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid6 import uuid7
 
 from bem_saude.api.auth import validar_token
-from bem_saude.infraestrutura.banco_dados.conexao import obter_sessao
+from bem_saude.api.cache_http import cabecalhos_cache, etag_corresponde, etag_da_versao, etag_do_conteudo, resposta_nao_modificada
+from bem_saude.api.idempotencia import Idempotencia, obter_idempotencia
+from bem_saude.api.importacao import (
+    TAMANHO_LOTE as TAMANHO_LOTE_IMPORTACAO,
+    FormatoImportacao,
+    RegistroInvalidoErro,
+    RelatorioImportacao,
+    descrever_erro_validacao,
+    ler_registros,
+)
+from bem_saude.api.exportacao import TAMANHO_LOTE, TIPOS_CONTEUDO, FormatoExportacao, gerar_csv, gerar_ndjson
+from bem_saude.api.serializacao import (
+    CAMPOS_PACIENTE,
+    CAMPOS_PADRAO_PACIENTE,
+    CamposInvalidosErro,
+    interpretar_campos,
+    pacientes_para_resposta,
+)
+from bem_saude.api.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, CursorInvalidoErro, codificar_cursor, decodificar_cursor
+from bem_saude.dominio.enums.status_cadastro import StatusCadastro
+from bem_saude.dominio.excecoes.paciente_excecoes import CpfJaCadastradoErro
+from bem_saude.infraestrutura.banco_dados.conexao import LER_DO_PRIMARIO, obter_sessao_async
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.cache.cache_base import Cache
+from bem_saude.infraestrutura.cache.gerenciador_cache import obter_cache
+from bem_saude.infraestrutura.repositorios.repositorio_estatisticas_pacientes import FAIXAS_ETARIAS, RepositorioEstatisticasPacientes
 from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente
-from bem_saude.api.schemas.pacientes_schemas import PacienteAlterarRequest, PacienteCriarRequest, PacienteResponse
+from bem_saude.api.schemas.status_lote_schemas import AlterarStatusLoteRequest, AlterarStatusLoteResponse
+from bem_saude.api.schemas.pacientes_schemas import EstatisticasPacientesResponse, ImportacaoLoteResponse, PacienteAlterarRequest, PacienteCriarRequest, PacientePaginaResponse, PacienteResponse, normalizar_cpf
+
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(
@@ -21,18 +55,34 @@ router = APIRouter(
     response_model=PacienteResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Criar novo paciente",
+    description="""
+            Cadastra um paciente.
+
+            Com o cabeçalho `Idempotency-Key`, repetições da requisição com a mesma chave
+            devolvem a primeira resposta (com `Idempotent-Replayed: true`) sem cadastrar de novo.""",
     responses={
         201: {
             "description": "Paciente criado com sucesso.",
             "model": PacienteResponse
         },
+        409: {
+            "description": "Já existe um paciente com o CPF informado."
+        },
+        422: {
+            "description": "Dados inválidos ou Idempotency-Key já utilizada com outro corpo."
+        },
     },
 )
-def criar_paciente(
+async def criar_paciente(
     dados: PacienteCriarRequest,
-    session: Session = Depends(obter_sessao)
-) -> PacienteResponse:
+    idempotencia: Idempotencia = Depends(obter_idempotencia),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
     """Cadastrar um paciente."""
+    repetida = await idempotencia.resposta_repetida(dados)
+    if repetida is not None:
+        return repetida
+
     paciente = ModeloPaciente(
         id=uuid7(),
         nome=dados.nome,
@@ -44,59 +94,418 @@ def criar_paciente(
         observacoes=dados.observacoes,
         endereco=dados.endereco,
         data_nascimento=dados.data_nascimento,
+        criado_em=datetime.now(),
     )
+    # A resposta é montada antes do commit para ser guardada na mesma transação
+    corpo = PacienteResponse.model_validate(paciente, from_attributes=True).model_dump_json().encode("utf-8")
+    await idempotencia.guardar(status.HTTP_201_CREATED, corpo)
+
+    repositorio = RepositorioPaciente(sessao=session)
+    try:
+        await repositorio.criar(paciente)
+    except (IntegrityError, CpfJaCadastradoErro):
+        repetida = await idempotencia.resposta_concorrente()
+        if repetida is None:
+            raise
+        return repetida
+    return Response(content=corpo, status_code=status.HTTP_201_CREATED, media_type="application/json")
+
+
+@router.post(
+    "/lote",
+    response_model=ImportacaoLoteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Importar pacientes em lote",
+    description="""
+            Cadastra pacientes a partir de um arquivo NDJSON (um objeto por linha) ou CSV
+            (com cabeçalho, um registro por linha), enviado no corpo da requisição.
+
+            Os registros são validados e gravados em lotes, cada lote em uma transação.
+            Registros inválidos ou com CPF já cadastrado não interrompem a importação
+            e são relatados por linha.""",
+    responses={
+        200: {
+            "description": "Resultado da importação",
+            "model": ImportacaoLoteResponse
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        },
+    },
+)
+async def importar_pacientes(
+    request: Request,
+    formato: FormatoImportacao = Query(FormatoImportacao.NDJSON, description="Formato do arquivo enviado."),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Importa pacientes em lote a partir do corpo da requisição."""
     repositorio = RepositorioPaciente(sessao=session)
-    paciente = repositorio.criar(paciente)
-    return paciente
+    relatorio = RelatorioImportacao()
+    lote: list[tuple[int, dict]] = []
+
+    async def gravar_lote():
+        try:
+            inseridos = await repositorio.criar_em_lote([dados for _, dados in lote])
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao gravar lote de pacientes: {e}")
+            for linha, _ in lote:
+                relatorio.registrar_erro(linha, "Erro ao gravar o lote no banco de dados")
+        else:
+            relatorio.inseridos += len(inseridos)
+            for linha, dados in lote:
+                if dados["id"] not in inseridos:
+                    relatorio.registrar_erro(linha, "CPF já cadastrado")
+        lote.clear()
+
+    async for linha, registro in ler_registros(request.stream(), formato):
+        if isinstance(registro, RegistroInvalidoErro):
+            relatorio.registrar_erro(linha, str(registro))
+            continue
+
+        try:
+            dados = PacienteCriarRequest.model_validate(registro)
+        except ValidationError as e:
+            relatorio.registrar_erro(linha, descrever_erro_validacao(e))
+            continue
+
+        lote.append((linha, {"id": uuid7(), **dados.model_dump()}))
+        if len(lote) >= TAMANHO_LOTE_IMPORTACAO:
+            await gravar_lote()
+
+    await gravar_lote()
+    return relatorio.como_resposta()
+
+
+@router.post(
+    "/status",
+    response_model=AlterarStatusLoteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Alterar status de pacientes em lote",
+    description="""
+            Ativa ou inativa vários pacientes de uma vez, em uma única atualização no banco.
+
+            Retorna quais identificadores foram encontrados e quais não existem.""",
+    responses={
+        200: {
+            "description": "Resultado da alteração de status.",
+            "model": AlterarStatusLoteResponse
+        },
+    },
+)
+async def alterar_status_pacientes(
+    dados: AlterarStatusLoteRequest,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
+    """Altera o status de vários pacientes."""
+    repositorio = RepositorioPaciente(sessao=session, cache=cache)
+    encontrados = set(await repositorio.alterar_status_em_lote(dados.ids, dados.status.value))
+
+    ids = list(dict.fromkeys(dados.ids))
+    return {
+        "encontrados": [id for id in ids if id in encontrados],
+        "nao_encontrados": [id for id in ids if id not in encontrados],
+    }
 
 
 @router.get(
     "",
-    response_model=list[PacienteResponse],
+    response_model=PacientePaginaResponse,
     status_code=status.HTTP_200_OK,
     summary="Listar pacientes",
+    description="""
+            Lista os pacientes paginados por cursor, ordenados por status e nome.
+
+            Para buscar a próxima página, envie o `proximo_cursor` da resposta no parâmetro `cursor`,
+            repetindo os mesmos filtros.
+
+            Use `campos` para receber apenas parte dos campos; `observacoes` só é
+            devolvido quando pedido.""",
+    responses={
+        200: {
+            "description": "Página de pacientes",
+            "model": PacientePaginaResponse
+        },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
+        400: {
+            "description": "Cursor de paginação, filtros ou campos inválidos."
+        },
+    },
+)
+async def listar_pacientes(
+    request: Request,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de pacientes na página."),
+    cursor: str | None = Query(None, description="Cursor retornado pela página anterior."),
+    filtro_status: StatusCadastro | None = Query(None, alias="status", description="Filtra pelo status do cadastro."),
+    tipo_sanguineo: str | None = Query(None, max_length=3, description="Filtra pelo tipo sanguíneo.", examples=["O-"]),
+    nascidos_de: date | None = Query(None, description="Data de nascimento mínima (inclusive)."),
+    nascidos_ate: date | None = Query(None, description="Data de nascimento máxima (inclusive)."),
+    criado_desde: datetime | None = Query(None, description="Cadastrados a partir desta data e hora."),
+    campos: str | None = Query(
+        None,
+        description="Campos da resposta separados por vírgula (ex.: id,nome,cpf). "
+                    "Por padrão todos, exceto observacoes.",
+    ),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Listagem paginada dos pacientes cadastrados, com filtros opcionais."""
+    try:
+        apos = decodificar_cursor(cursor) if cursor else None
+        campos_resposta = interpretar_campos(campos, CAMPOS_PACIENTE, CAMPOS_PADRAO_PACIENTE)
+    except (CursorInvalidoErro, CamposInvalidosErro) as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+    if nascidos_de and nascidos_ate and nascidos_de > nascidos_ate:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="nascidos_de deve ser anterior ou igual a nascidos_ate."
+            )
+
+    repositorio = RepositorioPaciente(sessao=session)
+    etag = etag_da_versao(await repositorio.versao(), request)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+
+    # Busca um registro a mais para saber se existe próxima página
+    pacientes = await repositorio.listar(
+        limite + 1,
+        apos,
+        status=filtro_status.value if filtro_status else None,
+        tipo_sanguineo=tipo_sanguineo,
+        nascidos_de=nascidos_de,
+        nascidos_ate=nascidos_ate,
+        criado_desde=criado_desde,
+        campos=campos_resposta,
+    )
+
+    proximo_cursor = None
+    if len(pacientes) > limite:
+        pacientes = pacientes[:limite]
+        ultimo = pacientes[-1]
+        proximo_cursor = codificar_cursor(ultimo.status, ultimo.nome, ultimo.id)
+
+    return ORJSONResponse(
+        {"itens": pacientes_para_resposta(pacientes, campos_resposta), "proximo_cursor": proximo_cursor},
+        headers=cabecalhos_cache(etag),
+    )
+
+
+@router.get(
+    "/exportar",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Exportar todos os pacientes",
+    description="""
+            Exporta o cadastro completo de pacientes em NDJSON ou CSV.
+
+            Os registros são lidos do banco em lotes e enviados conforme são codificados.""",
+    responses={
+        200: {
+            "description": "Arquivo de exportação dos pacientes",
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {},
+            },
+        },
+    },
+)
+async def exportar_pacientes(
+    formato: FormatoExportacao = Query(FormatoExportacao.NDJSON, description="Formato do arquivo exportado."),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Exporta todos os pacientes via streaming."""
+    repositorio = RepositorioPaciente(sessao=session)
+    lotes = repositorio.exportar(TAMANHO_LOTE)
+    conteudo = gerar_csv(lotes) if formato == FormatoExportacao.CSV else gerar_ndjson(lotes)
+
+    return StreamingResponse(
+        conteudo,
+        media_type=TIPOS_CONTEUDO[formato],
+        headers={"Content-Disposition": f'attachment; filename="pacientes.{formato.value}"'},
+    )
+
+
+@router.get(
+    "/buscar",
+    response_model=list[PacienteResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Buscar pacientes por nome, CPF ou telefone",
+    description="""
+            Busca pacientes por parte do nome, CPF ou telefone.
+
+            CPF e telefone são comparados apenas pelos dígitos, com ou sem pontuação.
+            Os resultados são ordenados por relevância.""",
     responses={
         200: {
-            "description": "Lista de pacientes",
+            "description": "Pacientes encontrados",
             "model": list[PacienteResponse]
         },
     },
 )
-def listar_pacientes(session: Session = Depends(obter_sessao)):
-    """Listagem de todos os pacientes cadastrados."""
+async def buscar_pacientes(
+    q: str = Query(..., min_length=2, max_length=100, description="Parte do nome, CPF ou telefone."),
+    limite: int = Query(20, ge=1, le=100, description="Quantidade máxima de resultados."),
+    campos: str | None = Query(
+        None,
+        description="Campos da resposta separados por vírgula (ex.: id,nome,cpf). "
+                    "Por padrão todos, exceto observacoes.",
+    ),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Busca pacientes por termo livre."""
+    try:
+        campos_resposta = interpretar_campos(campos, CAMPOS_PACIENTE, CAMPOS_PADRAO_PACIENTE)
+    except CamposInvalidosErro as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
     repositorio = RepositorioPaciente(sessao=session)
-    pacientes = repositorio.listar()
-    return pacientes
+    pacientes = await repositorio.buscar(q, limite, campos=campos_resposta)
+    return ORJSONResponse(pacientes_para_resposta(pacientes, campos_resposta))
 
 
 @router.get(
-    "/{id}",
+    "/estatisticas",
+    response_model=EstatisticasPacientesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Estatísticas de pacientes",
+    description="""
+            Quantidade de pacientes por status, tipo sanguíneo e faixa etária.
+
+            Lê um resumo recalculado periodicamente em segundo plano, então o tempo de
+            resposta não depende da quantidade de pacientes. Os números podem estar
+            atrasados em até `ESTATISTICAS_INTERVALO_SEGUNDOS` (veja `atualizado_em`).""",
+    responses={
+        200: {
+            "description": "Estatísticas de pacientes",
+            "model": EstatisticasPacientesResponse
+        },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
+    },
+)
+async def estatisticas_pacientes(
+    request: Request,
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Estatísticas agregadas de pacientes para os painéis."""
+    repositorio = RepositorioEstatisticasPacientes(sessao=session)
+    conteudo = {
+        "total": 0,
+        "por_status": {},
+        "por_tipo_sanguineo": {},
+        "por_faixa_etaria": {rotulo: 0 for rotulo, _ in FAIXAS_ETARIAS},
+        "atualizado_em": None,
+    }
+    for estatistica in await repositorio.obter():
+        conteudo[f"por_{estatistica.dimensao}"][estatistica.valor] = estatistica.quantidade
+        conteudo["atualizado_em"] = estatistica.atualizado_em
+    conteudo["total"] = sum(conteudo["por_status"].values())
+
+    corpo = orjson.dumps(conteudo)
+    etag = etag_do_conteudo(corpo)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos_cache(etag))
+
+
+@router.get(
+    "/cpf/{cpf}",
     response_model=PacienteResponse,
     status_code=status.HTTP_200_OK,
-    summary="Buscar paciente filtrando por ID",
+    summary="Buscar paciente pelo CPF",
     description="""
-            Busca um paciente específico pelo seu ID (UUID v7).""",
+            Busca um paciente pelo CPF exato, com ou sem pontuação, usando o índice único de CPF.""",
     responses={
         200: {
             "description": "Paciente encontrado",
             "model": PacienteResponse
         },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
+        404: {
+            "description": "Paciente não encontrado."
+        },
     },
 )
-def buscar_paciente(
-    id: UUID,
-    session: Session = Depends(obter_sessao)
+async def buscar_paciente_por_cpf(
+    request: Request,
+    cpf: str = Path(..., max_length=14, description="CPF do paciente, com ou sem pontuação."),
+    session: AsyncSession = Depends(obter_sessao_async)
 ):
-    """Busca um paciente por seu ID."""
+    """Busca um paciente pelo CPF."""
     repositorio = RepositorioPaciente(sessao=session)
-    paciente = repositorio.buscar_por_id(id)
+    paciente = await repositorio.buscar_por_cpf(normalizar_cpf(cpf))
     if not paciente:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Paciente não encontrado."
             )
-    
-    return paciente
+
+    corpo = PacienteResponse.model_validate(paciente, from_attributes=True).model_dump_json().encode("utf-8")
+    etag = etag_do_conteudo(corpo)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos_cache(etag))
+
+
+@router.get(
+    "/{id}",
+    response_model=PacienteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Buscar paciente filtrando por ID",
+    description="""
+            Busca um paciente específico pelo seu ID (UUID v7).""",
+    responses={
+        200: {
+            "description": "Paciente encontrado",
+            "model": PacienteResponse
+        },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
+    },
+)
+async def buscar_paciente(
+    id: UUID,
+    request: Request,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
+    """Busca um paciente por seu ID, usando a resposta em cache quando houver."""
+    chave = RepositorioPaciente.chave_cache(id)
+    # Com X-Ler-Do-Primario o cache é ignorado: a resposta reflete a última escrita
+    corpo = None if session.info.get(LER_DO_PRIMARIO) else await cache.obter(chave)
+    if corpo is None:
+        # Lida antes do banco: se o paciente for alterado durante a leitura, o corpo não é guardado
+        geracao = await cache.geracao(chave)
+        # O cache só é preenchido com leituras do primário: uma réplica atrasada
+        # devolveria a versão anterior à última alteração, que ficaria até o TTL
+        session.info[LER_DO_PRIMARIO] = True
+        repositorio = RepositorioPaciente(sessao=session)
+        paciente = await repositorio.buscar_por_id(id)
+        if not paciente:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail="Paciente não encontrado."
+                )
+
+        corpo = PacienteResponse.model_validate(paciente, from_attributes=True).model_dump_json().encode("utf-8")
+        await cache.definir(chave, corpo, geracao)
+
+    etag = etag_do_conteudo(corpo)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos_cache(etag))
 
 
 @router.delete(
@@ -110,14 +519,15 @@ def buscar_paciente(
         },
     },
 )
-def inativar_paciente(
+async def inativar_paciente(
     id: UUID,
-    session: Session = Depends(obter_sessao)
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
 ):
     """Inativa um paciente por seu ID."""
 
-    repositorio = RepositorioPaciente(sessao=session)
-    inativou = repositorio.inativar(id)
+    repositorio = RepositorioPaciente(sessao=session, cache=cache)
+    inativou = await repositorio.inativar(id)
     if not inativou:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
@@ -138,20 +548,21 @@ def inativar_paciente(
         },
     },
 )
-def alterar_paciente(
+async def alterar_paciente(
     id: UUID,
     dados: PacienteAlterarRequest,
-    session: Session = Depends(obter_sessao)
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
 ):
     """Alterar os dados de um paciente por seu ID."""
-    repositorio = RepositorioPaciente(sessao=session)
-    alterou = repositorio.editar(
+    repositorio = RepositorioPaciente(sessao=session, cache=cache)
+    alterou = await repositorio.editar(
         id,
-        dados.nome,
-        dados.email,
-        dados.endereco,
-        dados.telefone,
-        dados.observacoes
+        nome=dados.nome,
+        telefone=dados.telefone,
+        endereco=dados.endereco,
+        observacoes=dados.observacoes,
+        email=dados.email
     )
     if not alterou:
         raise HTTPException(
@@ -173,11 +584,12 @@ def alterar_paciente(
         },
     },
 )
-def ativar_paciente(
+async def ativar_paciente(
     id: UUID,
-    session: Session = Depends(obter_sessao)
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
 ):
-    repositorio = RepositorioPaciente(sessao=session)
-    ativou = repositorio.ativar(id)
+    repositorio = RepositorioPaciente(sessao=session, cache=cache)
+    ativou = await repositorio.ativar(id)
     if not ativou:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Paciente não encontrado")
@@ -1,13 +1,23 @@
+from datetime import datetime
 from http import HTTPStatus
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid6 import uuid7
 
 from bem_saude.api.auth import validar_token
-from bem_saude.api.schemas.recepcionista_schemas import RecepcionistaAlterarRequest, RecepcionistaCriarRequest, RecepcionistaResponse
-from bem_saude.infraestrutura.banco_dados.conexao import obter_sessao
+from bem_saude.api.cache_http import cabecalhos_cache, etag_corresponde, etag_da_versao, etag_do_conteudo, resposta_nao_modificada
+from bem_saude.api.idempotencia import Idempotencia, obter_idempotencia
+from bem_saude.api.serializacao import CAMPOS_RECEPCIONISTA, CamposInvalidosErro, interpretar_campos, recepcionistas_para_resposta
+from bem_saude.api.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, CursorInvalidoErro, codificar_cursor, decodificar_cursor
+from bem_saude.api.schemas.status_lote_schemas import AlterarStatusLoteRequest, AlterarStatusLoteResponse
+from bem_saude.api.schemas.recepcionista_schemas import RecepcionistaAlterarRequest, RecepcionistaCriarRequest, RecepcionistaPaginaResponse, RecepcionistaResponse
+from bem_saude.infraestrutura.banco_dados.conexao import LER_DO_PRIMARIO, obter_sessao_async
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+from bem_saude.infraestrutura.cache.cache_base import Cache
+from bem_saude.infraestrutura.cache.gerenciador_cache import obter_cache
 from bem_saude.infraestrutura.repositorios.repositorio_recepcionista import RepositorioRecepcionista
 
 # Router para endpoints de recepcionistas
@@ -23,43 +33,136 @@ router = APIRouter(
     response_model=RecepcionistaResponse, 
     status_code=status.HTTP_201_CREATED,
     summary="Criar novo recepcionista",
+    description="""
+            Cadastra um recepcionista.
+
+            Com o cabeçalho `Idempotency-Key`, repetições da requisição com a mesma chave
+            devolvem a primeira resposta (com `Idempotent-Replayed: true`) sem cadastrar de novo.""",
     responses={
         201: {
             "description": "Recepcionista criado com sucesso",
             "model": RecepcionistaResponse
-        }
+        },
+        422: {
+            "description": "Dados inválidos ou Idempotency-Key já utilizada com outro corpo."
+        },
     }
 )
-def criar_recepcionista(
+async def criar_recepcionista(
     dados: RecepcionistaCriarRequest,
-    session: Session = Depends(obter_sessao)) -> RecepcionistaResponse:
+    idempotencia: Idempotencia = Depends(obter_idempotencia),
+    session: AsyncSession = Depends(obter_sessao_async)):
+    repetida = await idempotencia.resposta_repetida(dados)
+    if repetida is not None:
+        return repetida
+
     recepcionista = ModeloRecepcionista(
         id=uuid7(),
         nome=dados.nome,
         status=dados.status,
+        criado_em=datetime.now(),
     )
+    # A resposta é montada antes do commit para ser guardada na mesma transação
+    corpo = RecepcionistaResponse.model_validate(recepcionista, from_attributes=True).model_dump_json().encode("utf-8")
+    await idempotencia.guardar(status.HTTP_201_CREATED, corpo)
+
     repositorio = RepositorioRecepcionista(sessao=session)
-    recepcionista = repositorio.criar(recepcionista)
-    return recepcionista
+    try:
+        await repositorio.criar(recepcionista)
+    except IntegrityError:
+        repetida = await idempotencia.resposta_concorrente()
+        if repetida is None:
+            raise
+        return repetida
+    return Response(content=corpo, status_code=status.HTTP_201_CREATED, media_type="application/json")
+
+
+@router.post(
+    "/status",
+    response_model=AlterarStatusLoteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Alterar status de recepcionistas em lote",
+    description="""
+            Ativa ou inativa vários recepcionistas de uma vez, em uma única atualização no banco.
+
+            Retorna quais identificadores foram encontrados e quais não existem""",
+    responses={
+        200: {
+            "description": "Resultado da alteração de status",
+            "model": AlterarStatusLoteResponse
+        },
+    },
+)
+async def alterar_status_recepcionistas(
+    dados: AlterarStatusLoteRequest,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
+    """Altera o status de vários recepcionistas"""
+    repositorio = RepositorioRecepcionista(sessao=session, cache=cache)
+    encontrados = set(await repositorio.alterar_status_em_lote(dados.ids, dados.status.value))
+
+    ids = list(dict.fromkeys(dados.ids))
+    return {
+        "encontrados": [id for id in ids if id in encontrados],
+        "nao_encontrados": [id for id in ids if id not in encontrados],
+    }
 
 
 @router.get(
     "",
-    response_model=list[RecepcionistaResponse],
+    response_model=RecepcionistaPaginaResponse,
     status_code=status.HTTP_200_OK,
     summary="Listar recepcionistas",
+    description="""
+            Lista os recepcionistas paginados por cursor, ordenados por status e nome.
+
+            Para buscar a próxima página, envie o `proximo_cursor` da resposta no parâmetro `cursor`.""",
     responses={
         200: {
-            "description": "Lista de recepcionistas",
-            "model": list[RecepcionistaResponse]
+            "description": "Página de recepcionistas",
+            "model": RecepcionistaPaginaResponse
+        },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
+        400: {
+            "description": "Cursor de paginação ou campos inválidos"
         },
     },
 )
-def listar_recepcionistas(session: Session = Depends(obter_sessao)):
-    """Lista todos os recepcionistas"""
+async def listar_recepcionistas(
+    request: Request,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de recepcionistas na página"),
+    cursor: str | None = Query(None, description="Cursor retornado pela página anterior"),
+    campos: str | None = Query(None, description="Campos da resposta separados por vírgula (ex.: id,nome). Por padrão todos."),
+    session: AsyncSession = Depends(obter_sessao_async)
+):
+    """Lista os recepcionistas de forma paginada"""
+    try:
+        apos = decodificar_cursor(cursor) if cursor else None
+        campos_resposta = interpretar_campos(campos, CAMPOS_RECEPCIONISTA, CAMPOS_RECEPCIONISTA)
+    except (CursorInvalidoErro, CamposInvalidosErro) as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
     repositorio = RepositorioRecepcionista(sessao=session)
-    recepcionistas = repositorio.listar()
-    return recepcionistas
+    etag = etag_da_versao(await repositorio.versao(), request)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+
+    # Busca um registro a mais para saber se existe próxima página
+    recepcionistas = await repositorio.listar(limite + 1, apos, campos=campos_resposta)
+
+    proximo_cursor = None
+    if len(recepcionistas) > limite:
+        recepcionistas = recepcionistas[:limite]
+        ultimo = recepcionistas[-1]
+        proximo_cursor = codificar_cursor(ultimo.status, ultimo.nome, ultimo.id)
+
+    return ORJSONResponse(
+        {"itens": recepcionistas_para_resposta(recepcionistas, campos_resposta), "proximo_cursor": proximo_cursor},
+        headers=cabecalhos_cache(etag),
+    )
 
 
 @router.get(
@@ -76,15 +179,39 @@ def listar_recepcionistas(session: Session = Depends(obter_sessao)):
             "description": "Recepcionista encontrado",
             "model": RecepcionistaResponse
         },
+        304: {
+            "description": "Não modificado desde o ETag enviado em If-None-Match."
+        },
     },
 )
-def buscar_recepcionista(id: UUID, session: Session = Depends(obter_sessao)):
-    """Busca um recepcionista por ID."""
-    repositorio = RepositorioRecepcionista(sessao=session)
-    recepcionista = repositorio.buscar_por_id(id)
-    if not recepcionista:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Recepcionista não encontrado")
-    return recepcionista
+async def buscar_recepcionista(
+    id: UUID,
+    request: Request,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
+    """Busca um recepcionista por ID, usando a resposta em cache quando houver."""
+    chave = RepositorioRecepcionista.chave_cache(id)
+    # Com X-Ler-Do-Primario o cache é ignorado: a resposta reflete a última escrita
+    corpo = None if session.info.get(LER_DO_PRIMARIO) else await cache.obter(chave)
+    if corpo is None:
+        # Lida antes do banco: se o recepcionista for alterado durante a leitura, o corpo não é guardado
+        geracao = await cache.geracao(chave)
+        # O cache só é preenchido com leituras do primário: uma réplica atrasada
+        # devolveria a versão anterior à última alteração, que ficaria até o TTL
+        session.info[LER_DO_PRIMARIO] = True
+        repositorio = RepositorioRecepcionista(sessao=session)
+        recepcionista = await repositorio.buscar_por_id(id)
+        if not recepcionista:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Recepcionista não encontrado")
+
+        corpo = RecepcionistaResponse.model_validate(recepcionista, from_attributes=True).model_dump_json().encode("utf-8")
+        await cache.definir(chave, corpo, geracao)
+
+    etag = etag_do_conteudo(corpo)
+    if etag_corresponde(request, etag):
+        return resposta_nao_modificada(etag)
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos_cache(etag))
 
 
 @router.delete(
@@ -98,10 +225,14 @@ def buscar_recepcionista(id: UUID, session: Session = Depends(obter_sessao)):
         },
     },
 )
-def inativar_recepcionista(id: UUID, session: Session = Depends(obter_sessao)):
+async def inativar_recepcionista(
+    id: UUID,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
     """Inativa um recepcionista por ID."""
-    repositorio = RepositorioRecepcionista(sessao=session)
-    inativou = repositorio.remover(id)
+    repositorio = RepositorioRecepcionista(sessao=session, cache=cache)
+    inativou = await repositorio.remover(id)
     if not inativou:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Recepcionista não encontrado")
 
@@ -119,9 +250,14 @@ def inativar_recepcionista(id: UUID, session: Session = Depends(obter_sessao)):
         }
     }
 )
-def alterar_recepcionista(id: UUID, dados: RecepcionistaAlterarRequest, session: Session = Depends(obter_sessao)):
-    repositorio = RepositorioRecepcionista(sessao=session)
-    alterou = repositorio.editar(id, dados.nome)
+async def alterar_recepcionista(
+    id: UUID,
+    dados: RecepcionistaAlterarRequest,
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache)
+):
+    repositorio = RepositorioRecepcionista(sessao=session, cache=cache)
+    alterou = await repositorio.editar(id, dados.nome)
     if not alterou:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Recepcionista não encontrado")
     
@@ -139,13 +275,14 @@ def alterar_recepcionista(id: UUID, dados: RecepcionistaAlterarRequest, session:
         },
     },
 )
-def ativar_recepcionista(
+async def ativar_recepcionista(
     id: UUID,
-    session: Session = Depends(obter_sessao),
+    session: AsyncSession = Depends(obter_sessao_async),
+    cache: Cache = Depends(obter_cache),
 ):
-    repositorio = RepositorioRecepcionista(sessao=session)
+    repositorio = RepositorioRecepcionista(sessao=session, cache=cache)
 
-    ativou = repositorio.ativar(id)
+    ativou = await repositorio.ativar(id)
     if not ativou:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="Recepcionista não encontrado."
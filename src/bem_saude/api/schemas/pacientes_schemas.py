@@ -5,12 +5,18 @@ Define os DTOs (Data Transfer Objects) para requisições e respostas relacionad
 a pacientes.
 """
 
+import re
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from bem_saude.dominio.enums.status_cadastro import StatusCadastro
 
 
+def normalizar_cpf(cpf: str) -> str:
+    """Mantém apenas os dígitos: "123.456.789-10" -> "12345678910"."""
+    return re.sub(r"\D", "", cpf)
+
+
 class PacienteCriarRequest(BaseModel):
     nome: str = Field(
         ...,
@@ -29,7 +35,7 @@ class PacienteCriarRequest(BaseModel):
     cpf: str = Field(
         ...,
         max_length=14,
-        description="CPF do paciente",
+        description="CPF do paciente, com ou sem pontuação (gravado apenas com os dígitos)",
         examples=["123.456.789-10"]
     )
 
@@ -72,6 +78,15 @@ class PacienteCriarRequest(BaseModel):
         examples=[""]
     )
 
+    @field_validator("cpf")
+    @classmethod
+    def validar_cpf(cls, cpf: str) -> str:
+        # O índice único compara o valor gravado: a pontuação não pode diferenciar CPFs
+        digitos = normalizar_cpf(cpf)
+        if not digitos:
+            raise ValueError("CPF deve conter dígitos")
+        return digitos
+
     model_config= {
         "json_schema_extra": {
             "examples": [
@@ -164,7 +179,7 @@ class PacienteResponse(BaseModel):
     cpf: str = Field(
         ...,
         description="CPF do paciente",
-        examples=["123.456.789-10"]
+        examples=["12345678910"]
     )
 
     data_nascimento: datetime = Field(
@@ -221,7 +236,7 @@ class PacienteResponse(BaseModel):
                 {
                 "nome": "Ana Paula Ferreira",
                 "status": "ATIVO",
-                "cpf": "123.456.789-10",
+                "cpf": "12345678910",
                 "data_nascimento": "1997-12-03",
                 "telefone": "(47)91234-4321",
                 "email": "anaferreira@hotmail.com",
@@ -234,3 +249,81 @@ class PacienteResponse(BaseModel):
             ]
         }
     }
+
+
+class PacientePaginaResponse(BaseModel):
+    itens: list[PacienteResponse] = Field(
+        ...,
+        description="Pacientes da página atual."
+    )
+
+    proximo_cursor: str | None = Field(
+        None,
+        description="Cursor opaco para buscar a próxima página. Nulo quando não há mais registros.",
+        examples=["gAAAAABq1QhyCvm49E06GrQjwo4OzMjxq5PrzhqJaso3ceBQcXu_z_EpY8aCo0sCKrZ5W_3n7UFb8nhhRGx0qLVNr1ziXq0SG2VQrBOonZIZICEBY16d2SaGbR-CkezjwAm8YL96BqInNMnIE820ZNMH3S5BWm925uY-ATeS30ZbkBZn2LGvNYI"]
+    )
+
+
+class EstatisticasPacientesResponse(BaseModel):
+    total: int = Field(
+        ...,
+        description="Quantidade total de pacientes.",
+        examples=[1520]
+    )
+
+    por_status: dict[str, int] = Field(
+        ...,
+        description="Quantidade de pacientes por status.",
+        examples=[{"ATIVO": 1400, "INATIVO": 120}]
+    )
+
+    por_tipo_sanguineo: dict[str, int] = Field(
+        ...,
+        description="Quantidade de pacientes por tipo sanguíneo.",
+        examples=[{"O+": 610, "A+": 520, "B+": 390}]
+    )
+
+    por_faixa_etaria: dict[str, int] = Field(
+        ...,
+        description="Quantidade de pacientes por faixa etária (anos), em ordem crescente.",
+        examples=[{"0-17": 200, "18-29": 310, "30-44": 420, "45-59": 330, "60+": 260}]
+    )
+
+    atualizado_em: datetime | None = Field(
+        None,
+        description="Momento do último recálculo. Nulo antes do primeiro recálculo.",
+        examples=["2026-02-11T14:30:00"]
+    )
+
+
+class ErroImportacaoResponse(BaseModel):
+    linha: int = Field(
+        ...,
+        description="Número da linha do arquivo enviado.",
+        examples=[12]
+    )
+
+    mensagem: str = Field(
+        ...,
+        description="Motivo da rejeição do registro.",
+        examples=["cpf: Field required"]
+    )
+
+
+class ImportacaoLoteResponse(BaseModel):
+    inseridos: int = Field(
+        ...,
+        description="Quantidade de pacientes cadastrados.",
+        examples=[9998]
+    )
+
+    total_erros: int = Field(
+        ...,
+        description="Quantidade de registros rejeitados.",
+        examples=[2]
+    )
+
+    erros: list[ErroImportacaoResponse] = Field(
+        ...,
+        description="Erros por linha (limitado aos primeiros registros rejeitados)."
+    )
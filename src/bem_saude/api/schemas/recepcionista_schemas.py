@@ -122,3 +122,19 @@ class RecepcionistaResponse(BaseModel):
     }
 
 
+class RecepcionistaPaginaResponse(BaseModel):
+    """
+    Schema de resposta paginada de recepcionistas
+
+    Retorna uma página da listagem e o cursor para a próxima
+    """
+    itens: list[RecepcionistaResponse] = Field(
+        ...,
+        description="Recepcionistas da página atual"
+    )
+
+    proximo_cursor: str | None = Field(
+        None,
+        description="Cursor opaco para buscar a próxima página. Nulo quando não há mais registros",
+        examples=["gAAAAABq1Qhyqqdlhdkhsc91FxfbhdunW4SwHkdQLL_S-PdBKtD8reQ57uUkPQgkIdQa5OqFxOH2Y2fyRihvtkIn-exNMgUsJZpMclZMtSB8u0YN7c68bDpQcfHH-GNtJUXrYxASu4nIivXQES3RclhVmUhVUIeZ9DHnQ3jFbOpDtgozo8MG9z4"]
+    )
@@ -0,0 +1,48 @@
+"""
+Schemas Pydantic para alteração de status em lote.
+
+Usados tanto por pacientes quanto por recepcionistas.
+"""
+
+from uuid import UUID
+from pydantic import BaseModel, Field
+from bem_saude.dominio.enums.status_cadastro import StatusCadastro
+
+
+class AlterarStatusLoteRequest(BaseModel):
+    """
+    Schema para alterar o status de vários cadastros de uma vez
+
+    Validações:
+    - ids: mínimo 1, máximo 1000 identificadores
+    """
+
+    ids: list[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Identificadores (UUID v7) dos cadastros",
+        examples=[["019c4cba-31a4-7db7-9097-de70dcaf012b"]]
+    )
+    status: StatusCadastro = Field(
+        ...,
+        description="Novo status dos cadastros",
+        examples=["INATIVO"]
+    )
+
+
+class AlterarStatusLoteResponse(BaseModel):
+    """
+    Schema de resposta da alteração de status em lote
+
+    Separa os identificadores alterados dos que não foram encontrados
+    """
+
+    encontrados: list[UUID] = Field(
+        ...,
+        description="Identificadores encontrados e alterados"
+    )
+    nao_encontrados: list[UUID] = Field(
+        ...,
+        description="Identificadores que não existem"
+    )
@@ -0,0 +1,86 @@
+"""
+Serialização rápida das listagens.
+
+As listagens consultam apenas as colunas da resposta (`Row`) e montam os
+dicionários diretamente, sem instanciar os modelos Pydantic; o JSON é gerado
+pelo orjson (`ORJSONResponse`). As colunas já vêm tipadas do banco, então a
+revalidação do `response_model` não acrescentaria nada além de custo.
+
+O parâmetro `campos` das rotas escolhe quais campos do schema de resposta
+são devolvidos (e consultados). Os valores seguem os schemas: campos sem
+coluna no banco saem como nulos e `data_nascimento` (DATE) sai como datetime.
+"""
+
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from typing import Any
+
+from sqlalchemy import Row
+
+from bem_saude.api.schemas.pacientes_schemas import PacienteResponse
+from bem_saude.api.schemas.recepcionista_schemas import RecepcionistaResponse
+
+
+CAMPOS_PACIENTE = tuple(PacienteResponse.model_fields)
+# Observações é texto livre sem limite de tamanho: só vem quando pedido em `campos`
+CAMPOS_PADRAO_PACIENTE = tuple(campo for campo in CAMPOS_PACIENTE if campo != "observacoes")
+
+CAMPOS_RECEPCIONISTA = tuple(RecepcionistaResponse.model_fields)
+
+
+class CamposInvalidosErro(ValueError):
+    """Parâmetro `campos` com nomes que não existem na resposta."""
+
+
+def interpretar_campos(
+        valor: str | None,
+        disponiveis: tuple[str, ...],
+        padrao: tuple[str, ...]) -> tuple[str, ...]:
+    """Converte "nome,cpf" nos campos pedidos, na ordem do schema de resposta."""
+    if not valor:
+        return padrao
+
+    pedidos = {campo.strip() for campo in valor.split(",") if campo.strip()}
+    desconhecidos = sorted(pedidos.difference(disponiveis))
+    if desconhecidos:
+        raise CamposInvalidosErro(f"Campos desconhecidos: {', '.join(desconhecidos)}")
+    if not pedidos:
+        raise CamposInvalidosErro("Informe ao menos um campo")
+    return tuple(campo for campo in disponiveis if campo in pedidos)
+
+
+def _como_datetime(valor: date | None) -> datetime | None:
+    if type(valor) is date:
+        return datetime.combine(valor, time.min)
+    return valor
+
+
+def _projetar(linhas: Sequence[Row], campos: Sequence[str]) -> list[dict[str, Any]]:
+    """Dicionários só com os `campos`: remove as colunas extras (ordenação) e completa as sem coluna."""
+    if not linhas:
+        return []
+
+    colunas = linhas[0]._fields
+    extras = [coluna for coluna in colunas if coluna not in campos]
+    ausentes = [campo for campo in campos if campo not in colunas]
+    itens = []
+    for linha in linhas:
+        item = linha._asdict()
+        for coluna in extras:
+            del item[coluna]
+        for campo in ausentes:
+            item[campo] = None
+        itens.append(item)
+    return itens
+
+
+def pacientes_para_resposta(linhas: Sequence[Row], campos: Sequence[str]) -> list[dict[str, Any]]:
+    itens = _projetar(linhas, campos)
+    if "data_nascimento" in campos:
+        for item in itens:
+            item["data_nascimento"] = _como_datetime(item["data_nascimento"])
+    return itens
+
+
+def recepcionistas_para_resposta(linhas: Sequence[Row], campos: Sequence[str]) -> list[dict[str, Any]]:
+    return _projetar(linhas, campos)
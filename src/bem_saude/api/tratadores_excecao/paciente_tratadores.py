@@ -0,0 +1,8 @@
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+
+from bem_saude.dominio.excecoes.paciente_excecoes import CpfJaCadastradoErro
+
+
+async def tratar_cpf_ja_cadastrado(request: Request, erro: CpfJaCadastradoErro) -> ORJSONResponse:
+    return ORJSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": str(erro)})
@@ -0,0 +1,5 @@
+class CpfJaCadastradoErro(Exception):
+    """Já existe um paciente com o CPF informado (violação do índice único de CPF)."""
+
+    def __init__(self):
+        super().__init__("Já existe um paciente cadastrado com este CPF.")
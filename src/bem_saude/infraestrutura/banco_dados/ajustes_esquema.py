@@ -0,0 +1,163 @@
+"""
+Ajustes de esquema em bancos já existentes.
+
+O `create_all` da subida só cria as tabelas ausentes, com os índices
+delas: um índice acrescentado depois ao modelo não chega a uma tabela que
+já existe. Cada ajuste daqui é identificado pelo índice que ele cria e roda
+na subida, logo após o `create_all`, apenas se o índice ainda não existir.
+Uma falha é registrada no log sem impedir a subida; o ajuste é tentado de
+novo na próxima.
+
+No PostgreSQL os índices são criados com CONCURRENTLY, sem bloquear as
+escritas na tabela; como CONCURRENTLY não roda dentro de uma transação, os
+comandos vão em autocommit, e um advisory lock faz os workers aplicarem os
+ajustes um de cada vez. Uma criação interrompida deixa o índice inválido,
+que conta como ausente e é removido antes da nova tentativa. Nos demais
+bancos (SQLite, em desenvolvimento) cada ajuste roda em uma transação.
+"""
+
+import logging
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+# Chave do advisory lock do PostgreSQL: um worker por vez aplica os ajustes
+CHAVE_BLOQUEIO_AJUSTES = 7_318_240_001
+
+# Índices válidos da tabela; um CREATE INDEX CONCURRENTLY interrompido deixa o índice inválido
+CONSULTA_INDICES_VALIDOS_POSTGRESQL = """
+SELECT indice.relname
+FROM pg_index
+JOIN pg_class AS indice ON indice.oid = pg_index.indexrelid
+JOIN pg_class AS tabela ON tabela.oid = pg_index.indrelid
+WHERE tabela.relname = :tabela AND pg_index.indisvalid
+"""
+
+
+def _indice(tabela: str, indice: str, definicao: str, unico: bool = False, somente_postgresql: bool = False):
+    """Ajuste que cria um índice; `definicao` é o trecho depois de `ON tabela`."""
+    tipo = "UNIQUE INDEX" if unico else "INDEX"
+    comandos = {
+        "postgresql": (
+            f"DROP INDEX CONCURRENTLY IF EXISTS {indice}",
+            f"CREATE {tipo} CONCURRENTLY {indice} ON {tabela} {definicao}",
+        ),
+    }
+    if not somente_postgresql:
+        comandos["sqlite"] = (f"CREATE {tipo} {indice} ON {tabela} {definicao}",)
+    return tabela, indice, comandos
+
+
+# (tabela, índice criado, comandos por dialeto), aplicados em ordem
+AJUSTES = (
+    (
+        "pacientes",
+        "ux_pacientes_cpf",
+        {
+            # CPFs gravados antes da normalização ficam só com dígitos; se houver
+            # repetidos depois disso, o índice não é criado e o erro vai para o log
+            # (no SQLite, em transação, nada é alterado)
+            "postgresql": (
+                r"UPDATE pacientes SET cpf = regexp_replace(cpf, '\D', '', 'g') WHERE cpf ~ '\D'",
+                "DROP INDEX CONCURRENTLY IF EXISTS ux_pacientes_cpf",
+                "CREATE UNIQUE INDEX CONCURRENTLY ux_pacientes_cpf ON pacientes (cpf)",
+            ),
+            "sqlite": (
+                "UPDATE pacientes SET cpf = replace(replace(replace(replace(cpf, '.', ''), '-', ''), ' ', ''), '/', '') "
+                "WHERE cpf GLOB '*[^0-9]*'",
+                "CREATE UNIQUE INDEX ux_pacientes_cpf ON pacientes (cpf)",
+            ),
+        },
+    ),
+    (
+        "pacientes",
+        "ix_pacientes_cpf_trgm",
+        {
+            # O CPF já é gravado só com dígitos: o índice de expressão deu lugar ao da coluna
+            "postgresql": (
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "DROP INDEX CONCURRENTLY IF EXISTS ix_pacientes_cpf_digitos_trgm",
+                "DROP INDEX CONCURRENTLY IF EXISTS ix_pacientes_cpf_trgm",
+                "CREATE INDEX CONCURRENTLY ix_pacientes_cpf_trgm ON pacientes USING gin (cpf gin_trgm_ops)",
+            ),
+        },
+    ),
+    # Busca textual (pg_trgm); a extensão é criada antes do primeiro índice
+    (
+        "pacientes",
+        "ix_pacientes_nome_trgm",
+        {
+            "postgresql": (
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "DROP INDEX CONCURRENTLY IF EXISTS ix_pacientes_nome_trgm",
+                "CREATE INDEX CONCURRENTLY ix_pacientes_nome_trgm ON pacientes USING gin (nome gin_trgm_ops)",
+            ),
+        },
+    ),
+    _indice(
+        "pacientes",
+        "ix_pacientes_telefone_digitos_trgm",
+        r"USING gin ((regexp_replace(telefone, '\D', '', 'g')) gin_trgm_ops)",
+        somente_postgresql=True,
+    ),
+    # Ordenação das listagens paginadas por cursor (keyset)
+    _indice("pacientes", "ix_pacientes_status_nome_id", "(status, nome, id)"),
+    _indice("recepcionistas", "ix_recepcionistas_status_nome_id", "(status, nome, id)"),
+    # Filtros da listagem de pacientes
+    _indice("pacientes", "ix_pacientes_tipo_sanguineo_status_nome_id", "(tipo_sanguineo, status, nome, id)"),
+    _indice("pacientes", "ix_pacientes_data_nascimento", "(data_nascimento)"),
+    _indice("pacientes", "ix_pacientes_criado_em", "(criado_em)"),
+)
+
+
+def _indices(conexao: Connection, tabela: str) -> set[str]:
+    return {indice["name"] for indice in inspect(conexao).get_indexes(tabela)}
+
+
+async def _indices_validos(conexao: AsyncConnection, tabela: str) -> set[str]:
+    if conexao.dialect.name == "postgresql":
+        return set((await conexao.execute(text(CONSULTA_INDICES_VALIDOS_POSTGRESQL), {"tabela": tabela})).scalars())
+    return await conexao.run_sync(_indices, tabela)
+
+
+async def _aplicar(conexao: AsyncConnection, tabela: str, indice: str, comandos: tuple[str, ...]) -> None:
+    try:
+        async with conexao.begin():
+            if indice in await _indices_validos(conexao, tabela):
+                return
+            logger.info(f"Aplicando ajuste de esquema: {indice}")
+            for comando in comandos:
+                await conexao.execute(text(comando))
+    except SQLAlchemyError as e:
+        logger.error(f"Ajuste de esquema {indice} não aplicado: {e}")
+
+
+async def aplicar_ajustes_esquema(engine: AsyncEngine) -> None:
+    dialeto = engine.dialect.name
+    ajustes = [
+        (tabela, indice, comandos_por_dialeto[dialeto])
+        for tabela, indice, comandos_por_dialeto in AJUSTES
+        if dialeto in comandos_por_dialeto
+    ]
+    if not ajustes:
+        return
+
+    postgresql = dialeto == "postgresql"
+    async with engine.connect() as conexao:
+        if postgresql:
+            conexao = await conexao.execution_options(isolation_level="AUTOCOMMIT")
+            await conexao.execute(select(func.pg_advisory_lock(CHAVE_BLOQUEIO_AJUSTES)))
+            await conexao.commit()
+        try:
+            for tabela, indice, comandos in ajustes:
+                await _aplicar(conexao, tabela, indice, comandos)
+        finally:
+            if postgresql:
+                await conexao.execute(select(func.pg_advisory_unlock(CHAVE_BLOQUEIO_AJUSTES)))
+                await conexao.commit()
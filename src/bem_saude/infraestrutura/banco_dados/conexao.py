@@ -1,31 +1,92 @@
 """
 Configuração de conexão com o banco de dados.
 
-Gerencia o engine do SQLAlchemy e a factory de sessões.
+Gerencia os engines do SQLAlchemy e as factories de sessões.
+As rotas da API usam o engine assíncrono; o engine síncrono fica disponível
+para scripts e migrações. Com DATABASE_READ_URLS, as leituras das rotas são
+roteadas para as réplicas (`SessaoRoteada`).
 """
 
 
+import itertools
 import logging
-from sqlalchemy import create_engine
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+from fastapi import Header
+from psycopg import AsyncClientCursor, ClientCursor
+from sqlalchemy import Engine, Select, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.sql.dml import UpdateBase
 from sqlalchemy.orm import sessionmaker, Session
-from bem_saude.api.configuracoes import configuracoes
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from bem_saude.api.configuracoes import Configuracoes, configuracoes
+from bem_saude.infraestrutura.banco_dados.rastreamento_consultas import instalar_rastreamento
+from bem_saude.infraestrutura.servicos.metricas import MetricaColetada, checkout_pool, registro
 
 
 logger = logging.getLogger(__name__)
 
 
+class PoolInstrumentado(AsyncAdaptedQueuePool):
+    """Mede o tempo de checkout: espera na fila do pool ou abertura de nova conexão."""
+
+    # Mantém os logs do pool no namespace do SQLAlchemy
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_pool.observar(time.perf_counter() - inicio)
+
+
+def argumentos_engine(config: Configuracoes, assincrono: bool) -> dict[str, Any]:
+    """
+    Monta os argumentos de `create_engine`/`create_async_engine` a partir das configurações.
+
+    Com DB_POOL_NULO cada sessão abre e fecha a própria conexão (NullPool), para
+    quando um PgBouncer já faz o pool na frente do PostgreSQL.
+    """
+    argumentos: dict[str, Any] = {
+        "echo": False,
+        # Sem pre-ping, uma conexão derrubada só é descartada quando o erro de
+        # desconexão aparece no uso; o pool é invalidado e a próxima sessão reconecta
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+    if config.DB_POOL_NULO:
+        argumentos["poolclass"] = NullPool
+    else:
+        if assincrono:
+            argumentos["poolclass"] = PoolInstrumentado
+        argumentos.update(
+            pool_size=config.DB_POOL_TAMANHO,
+            max_overflow=config.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT_SEGUNDOS,
+            pool_recycle=config.DB_POOL_RECICLAR_SEGUNDOS,
+            pool_use_lifo=config.DB_POOL_LIFO,
+        )
+
+    if make_url(config.DATABASE_URL).get_driver_name() == "psycopg":
+        # None desativa os prepared statements (obrigatório com PgBouncer em modo transaction)
+        connect_args: dict[str, Any] = {
+            "prepare_threshold": config.DB_PREPARE_THRESHOLD if config.DB_PREPARED_STATEMENTS else None,
+        }
+        if config.DB_BINDING_NO_CLIENTE:
+            # Interpola os parâmetros no cliente em vez de enviá-los separados ao servidor
+            connect_args["cursor_factory"] = AsyncClientCursor if assincrono else ClientCursor
+        argumentos["connect_args"] = connect_args
+
+    return argumentos
+
+
 # Engine do SQLAlchemy
-# Pool de conexões configurado para uso em produção
-# echo=False para não logar SQL (apenas em modo debug)
+# Pool de conexões configurado em Configuracoes (DB_POOL_*)
 
 
-engine = create_engine(
-    configuracoes.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True, # Validar conexões antes de usar
-    pool_size=5, #Número de conexões no pool
-    max_overflow=10 #Conexões extras permitidas
-)
+engine = create_engine(configuracoes.DATABASE_URL, **argumentos_engine(configuracoes, assincrono=False))
 
 
 SessionLocal = sessionmaker(
@@ -35,6 +96,118 @@ SessionLocal = sessionmaker(
 )
 
 
+# Engine assíncrono (postgresql+psycopg usa o driver async do psycopg)
+# Não ocupa uma thread do threadpool durante a ida ao banco
+
+async_engine = create_async_engine(configuracoes.DATABASE_URL, **argumentos_engine(configuracoes, assincrono=True))
+
+
+# Réplicas de leitura (DATABASE_READ_URLS); vazio mantém todo o tráfego no primário
+
+async_engines_leitura = [
+    create_async_engine(url, **argumentos_engine(configuracoes.model_copy(update={"DATABASE_URL": url}), assincrono=True))
+    for url in configuracoes.database_read_urls
+]
+
+
+class SeletorReplicas:
+    """Escolhe a réplica de cada sessão: "round_robin" ou "menos_conexoes" (menos checkouts no pool)."""
+
+    ESTRATEGIAS = ("round_robin", "menos_conexoes")
+
+    def __init__(self, engines: list[AsyncEngine], estrategia: str):
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estratégia de réplicas desconhecida: {estrategia}")
+        self.engines = [engine.sync_engine for engine in engines]
+        self.estrategia = estrategia
+        self._ciclo = itertools.cycle(self.engines)
+
+    @staticmethod
+    def _conexoes_em_uso(engine: Engine) -> int:
+        # Com NullPool não há contagem; todas empatam e vale a primeira
+        return engine.pool.checkedout() if isinstance(engine.pool, QueuePool) else 0
+
+    def escolher(self) -> Engine:
+        if self.estrategia == "menos_conexoes":
+            return min(self.engines, key=self._conexoes_em_uso)
+        return next(self._ciclo)
+
+
+seletor_replicas = SeletorReplicas(async_engines_leitura, configuracoes.DATABASE_READ_ESTRATEGIA)
+
+
+# Chave em Session.info que fixa a sessão no primário
+LER_DO_PRIMARIO = "ler_do_primario"
+
+
+class SessaoRoteada(Session):
+    """
+    Sessão que envia SELECTs a uma réplica e escritas ao primário.
+
+    A réplica é escolhida uma vez por sessão, para leituras consistentes entre si.
+    Depois da primeira escrita a sessão passa a ler do primário (read-your-writes);
+    `info={LER_DO_PRIMARIO: True}` fixa o primário desde o início.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[LER_DO_PRIMARIO] = True
+            return async_engine.sync_engine
+
+        eh_leitura = isinstance(clause, Select) and clause._for_update_arg is None
+        if not eh_leitura or self.info.get(LER_DO_PRIMARIO):
+            return async_engine.sync_engine
+
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = seletor_replicas.escolher()
+        return replica
+
+
+if configuracoes.SQL_RASTREAMENTO_HABILITADO:
+    for _engine in (engine, async_engine.sync_engine, *seletor_replicas.engines):
+        instalar_rastreamento(_engine, limite_lento_ms=configuracoes.SQL_LIMITE_CONSULTA_LENTA_MS)
+
+
+def _coletar_pool(atributo: str):
+    # Apenas o engine assíncrono atende as rotas da API
+    def coletar():
+        pool = async_engine.sync_engine.pool
+        if isinstance(pool, QueuePool):
+            yield {}, getattr(pool, atributo)()
+    return coletar
+
+
+registro.registrar(MetricaColetada(
+    "bem_saude_db_pool_tamanho", "Conexões permanentes configuradas no pool.", "gauge",
+    _coletar_pool("size"),
+))
+registro.registrar(MetricaColetada(
+    "bem_saude_db_pool_em_uso", "Conexões emprestadas às sessões.", "gauge",
+    _coletar_pool("checkedout"),
+))
+registro.registrar(MetricaColetada(
+    "bem_saude_db_pool_disponiveis", "Conexões ociosas no pool.", "gauge",
+    _coletar_pool("checkedin"),
+))
+registro.registrar(MetricaColetada(
+    "bem_saude_db_pool_overflow",
+    "Conexões além de pool_size (negativo enquanto o pool não está cheio).", "gauge",
+    _coletar_pool("overflow"),
+))
+
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    autocommit=False,
+    bind=async_engine,
+    # Sem réplicas configuradas a sessão padrão evita o roteamento por comando
+    sync_session_class=SessaoRoteada if async_engines_leitura else Session,
+    # Evita recarregar atributos após o commit (lazy load não é permitido em async)
+    expire_on_commit=False,
+)
+
+
 def obter_sessao() -> Session:
     db = SessionLocal()
     try:
@@ -44,3 +217,15 @@ def obter_sessao() -> Session:
         db.close() # Sessão fechada automaticamente após o uso
         logger.debug("Sessão de banco de dados fechada")
 
+
+async def obter_sessao_async(
+    ler_do_primario: bool = Header(
+        default=False,
+        alias="X-Ler-Do-Primario",
+        description="Lê do primário mesmo com réplicas configuradas, sem o cache de detalhes (ex.: logo após uma alteração)",
+    ),
+) -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal(info={LER_DO_PRIMARIO: ler_do_primario}) as db:
+        logger.debug("Sessão assíncrona de banco de dados criada")
+        yield db
+    logger.debug("Sessão assíncrona de banco de dados fechada")
@@ -0,0 +1,32 @@
+"""
+Modelo ORM para a tabela de resumo das estatísticas de pacientes.
+
+Guarda as contagens de pacientes por status, tipo sanguíneo e faixa etária,
+recalculadas periodicamente pelo `AtualizadorEstatisticas`. A rota de
+estatísticas lê só esta tabela (algumas dezenas de linhas), sem agrupar a
+tabela de pacientes.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+
+
+class ModeloEstatisticaPaciente(Base):
+    """
+    Modelo ORM da tabela 'estatisticas_pacientes'
+    """
+
+    __tablename__ = "estatisticas_pacientes"
+
+    # "status", "tipo_sanguineo" ou "faixa_etaria"
+    dimensao = Column(String(30), primary_key=True)
+
+    # Ex.: "ATIVO", "O+", "18-29"
+    valor = Column(String(20), primary_key=True)
+
+    quantidade = Column(BigInteger, nullable=False)
+
+    # Momento do recálculo; igual em todas as linhas
+    atualizado_em = Column(DateTime, nullable=False)
@@ -0,0 +1,37 @@
+"""
+Modelo ORM para a tabela de eventos pendentes (outbox transacional).
+
+Cada alteração de paciente ou recepcionista grava um evento nesta tabela
+na mesma transação da alteração. O `DespachanteEventos` lê os eventos em
+lotes, entrega ao destino configurado e os remove.
+"""
+
+from sqlalchemy import JSON, BigInteger, Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import ModeloBase
+
+
+class ModeloEventoOutbox(ModeloBase):
+    """
+    Modelo ORM da tabela 'eventos_outbox'
+    """
+
+    __tablename__ = "eventos_outbox"
+
+    # Sequencial: define a ordem de entrega (INTEGER no SQLite para o autoincremento)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    # Tabela da entidade alterada: "pacientes" ou "recepcionistas"
+    entidade = Column(String(60), nullable=False)
+
+    entidade_id = Column(UUID(as_uuid=True), nullable=False)
+
+    # Ex.: "criado", "editado", "inativado", "ativado"
+    tipo = Column(String(30), nullable=False)
+
+    # Valores gravados pela alteração
+    dados = Column(JSON, nullable=False)
@@ -4,13 +4,23 @@ Modelo ORM para a tabela de pacientes.
 Mapeia a entidade Recepcionista para a tabela 'pacientes' no PostgreSQL.
 """
 
-from sqlalchemy import Column, String, Date, Text
+from sqlalchemy import DDL, Column, Index, String, Date, Text, event, func, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import ModeloBase
 
 
 class ModeloPaciente(ModeloBase):
     __tablename__ = "pacientes"
+    __table_args__ = (
+        # CPF único, gravado apenas com dígitos; atende também a busca exata por CPF
+        Index("ux_pacientes_cpf", "cpf", unique=True),
+        # Cobre a ordenação da listagem paginada por cursor (keyset)
+        Index("ix_pacientes_status_nome_id", "status", "nome", "id"),
+        # Filtros da listagem; o tipo sanguíneo mantém a ordenação do keyset após o filtro
+        Index("ix_pacientes_tipo_sanguineo_status_nome_id", "tipo_sanguineo", "status", "nome", "id"),
+        Index("ix_pacientes_data_nascimento", "data_nascimento"),
+        Index("ix_pacientes_criado_em", "criado_em"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -62,3 +72,50 @@ class ModeloPaciente(ModeloBase):
         String(3),
         nullable=False
     )
+
+
+def somente_digitos(coluna):
+    """
+    Expressão do PostgreSQL que remove da coluna tudo que não for dígito.
+
+    Os argumentos são literais (e não parâmetros) para que a expressão da
+    consulta seja idêntica à dos índices e o planejador consiga usá-los.
+    """
+    return func.regexp_replace(
+        coluna,
+        literal_column(r"'\D'"),
+        literal_column("''"),
+        literal_column("'g'"),
+    )
+
+
+# Índices de busca textual (pg_trgm), criados apenas no PostgreSQL
+# Atendem `nome % termo`, `nome ILIKE '%termo%'`, LIKE sobre o CPF (gravado só
+# com dígitos) e sobre os dígitos do telefone
+
+Index(
+    "ix_pacientes_nome_trgm",
+    ModeloPaciente.nome,
+    postgresql_using="gin",
+    postgresql_ops={"nome": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+Index(
+    "ix_pacientes_cpf_trgm",
+    ModeloPaciente.cpf,
+    postgresql_using="gin",
+    postgresql_ops={"cpf": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+Index(
+    "ix_pacientes_telefone_digitos_trgm",
+    somente_digitos(ModeloPaciente.telefone).label("telefone_digitos"),
+    postgresql_using="gin",
+    postgresql_ops={"telefone_digitos": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    ModeloPaciente.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -4,7 +4,7 @@ Modelo ORM para a tabela de recepcionistas.
 Mapeia a entidade Recepcionista para a tabela 'recepcionistas' no PostgreSQL.
 """
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import ModeloBase
 
@@ -18,6 +18,10 @@ class ModeloRecepcionista(ModeloBase):
     """
 
     __tablename__ = "recepcionistas"
+    __table_args__ = (
+        # Cobre a ordenação da listagem paginada por cursor (keyset)
+        Index("ix_recepcionistas_status_nome_id", "status", "nome", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
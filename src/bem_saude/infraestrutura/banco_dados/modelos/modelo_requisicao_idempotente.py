@@ -0,0 +1,35 @@
+"""
+Modelo ORM para a tabela de requisições idempotentes.
+
+Guarda a primeira resposta de cada `Idempotency-Key`, gravada na mesma
+transação do cadastro. Repetições da requisição recebem a resposta guardada
+em vez de cadastrar de novo, até `expira_em`.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import ModeloBase
+
+
+class ModeloRequisicaoIdempotente(ModeloBase):
+    """
+    Modelo ORM da tabela 'requisicoes_idempotentes'
+    """
+
+    __tablename__ = "requisicoes_idempotentes"
+
+    # Usuário do token (sub): chaves de usuários diferentes não colidem
+    escopo = Column(String(255), primary_key=True)
+
+    # Método e rota, ex.: "POST /pacientes"
+    rota = Column(String(100), primary_key=True)
+
+    chave = Column(String(255), primary_key=True)
+
+    # SHA-256 do corpo da requisição: a mesma chave com outro corpo é rejeitada
+    hash_requisicao = Column(String(64), nullable=False)
+
+    status_code = Column(Integer, nullable=False)
+
+    corpo = Column(LargeBinary, nullable=False)
+
+    expira_em = Column(DateTime, nullable=False)
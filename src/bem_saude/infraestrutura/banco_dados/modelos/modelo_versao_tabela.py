@@ -0,0 +1,32 @@
+"""
+Modelo ORM para a tabela de versões das tabelas.
+
+Guarda um contador por tabela, incrementado na mesma transação de cada
+escrita. As rotas de leitura derivam dele o ETag das respostas.
+"""
+
+from sqlalchemy import BigInteger, Column, String, event
+
+
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+
+
+# Tabelas versionadas; uma linha de cada é criada junto com a tabela
+TABELAS_VERSIONADAS = ("pacientes", "recepcionistas")
+
+
+class ModeloVersaoTabela(Base):
+    """
+    Modelo ORM da tabela 'versoes_tabelas'
+    """
+
+    __tablename__ = "versoes_tabelas"
+
+    tabela = Column(String(60), primary_key=True)
+
+    versao = Column(BigInteger, nullable=False, default=0)
+
+
+@event.listens_for(ModeloVersaoTabela.__table__, "after_create")
+def _semear_versoes(tabela, conexao, **kw):
+    conexao.execute(tabela.insert(), [{"tabela": nome, "versao": 0} for nome in TABELAS_VERSIONADAS])
@@ -0,0 +1,76 @@
+"""
+Rastreamento das consultas SQL.
+
+Ganchos `before/after_cursor_execute` que medem cada comando enviado ao
+banco. Dentro de uma requisição (contexto aberto pelo
+`MiddlewareConsultasSql`) acumulam a quantidade de comandos e o tempo
+total; fora dela apenas registram as consultas lentas.
+"""
+
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+
+class EstatisticasConsultas:
+    def __init__(self):
+        self.quantidade = 0
+        self.duracao_segundos = 0.0
+
+
+_estatisticas_atuais: ContextVar[EstatisticasConsultas | None] = ContextVar(
+    "estatisticas_consultas", default=None
+)
+
+
+def iniciar_contexto() -> tuple[EstatisticasConsultas, Token]:
+    estatisticas = EstatisticasConsultas()
+    return estatisticas, _estatisticas_atuais.set(estatisticas)
+
+
+def encerrar_contexto(token: Token) -> None:
+    _estatisticas_atuais.reset(token)
+
+
+def _ocultar_parametros(parametros: Any, executemany: bool) -> str:
+    """Descreve os parâmetros sem expor valores (dados de pacientes)."""
+    if executemany:
+        return f"<{len(parametros)} conjuntos de parâmetros>"
+    if isinstance(parametros, dict):
+        return str({nome: "***" for nome in parametros})
+    if isinstance(parametros, (list, tuple)):
+        return str(["***"] * len(parametros))
+    return "***"
+
+
+def instalar_rastreamento(engine: Engine, limite_lento_ms: float) -> None:
+    """Registra os ganchos no engine (para o engine assíncrono, use `.sync_engine`)."""
+    limite_lento = limite_lento_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def antes_do_comando(conexao, cursor, comando, parametros, contexto, executemany):
+        conexao.info["inicio_comando"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def depois_do_comando(conexao, cursor, comando, parametros, contexto, executemany):
+        duracao = time.perf_counter() - conexao.info.pop("inicio_comando")
+
+        estatisticas = _estatisticas_atuais.get()
+        if estatisticas is not None:
+            estatisticas.quantidade += 1
+            estatisticas.duracao_segundos += duracao
+
+        if duracao >= limite_lento:
+            logger.warning(
+                "Consulta lenta (%.1f ms): %s | parâmetros: %s",
+                duracao * 1000,
+                " ".join(comando.split()),
+                _ocultar_parametros(parametros, executemany),
+            )
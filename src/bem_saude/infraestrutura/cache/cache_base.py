@@ -0,0 +1,69 @@
+"""
+Contrato dos backends de cache.
+
+Os valores são bytes já serializados; cada backend só guarda, devolve e
+remove, e mantém os contadores de acertos e falhas.
+
+Para não gravar uma leitura que ficou velha no meio do caminho, o
+preenchimento é condicionado a uma geração: a rota lê `geracao(chave)`
+antes de ir ao banco e passa o valor a `definir`, que só grava se não
+houve `remover` da chave nesse intervalo. Sem isso, uma leitura que
+começou antes de uma alteração poderia regravar o valor anterior logo
+depois da invalidação, e ele ficaria no cache até o TTL.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class Cache(ABC):
+    def __init__(self):
+        self.acertos = 0
+        self.falhas = 0
+
+
+    async def obter(self, chave: str) -> bytes | None:
+        valor = await self._obter(chave)
+        if valor is None:
+            self.falhas += 1
+        else:
+            self.acertos += 1
+        return valor
+
+
+    @abstractmethod
+    async def _obter(self, chave: str) -> bytes | None:
+        ...
+
+
+    @abstractmethod
+    async def geracao(self, chave: str) -> int:
+        """Marca de invalidações da chave; muda a cada `remover` dela."""
+
+
+    @abstractmethod
+    async def definir(self, chave: str, valor: bytes, geracao: int) -> None:
+        """Guarda o valor, se a chave não foi removida desde que `geracao` foi lida."""
+
+
+    @abstractmethod
+    async def remover(self, *chaves: str) -> None:
+        ...
+
+
+    async def fechar(self) -> None:
+        pass
+
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+
+    def estatisticas(self) -> dict[str, int | float | str]:
+        return {
+            "backend": type(self).__name__,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.taxa_acerto, 4),
+        }
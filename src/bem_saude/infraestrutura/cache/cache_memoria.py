@@ -0,0 +1,58 @@
+"""
+Backend de cache em memória do processo (LRU com TTL).
+
+Cada worker tem o seu; use o backend Redis para compartilhar entre processos.
+A geração é um contador único de remoções: qualquer invalidação durante uma
+leitura descarta o preenchimento dela, sem guardar uma marca por chave.
+"""
+
+import time
+from collections import OrderedDict
+
+from bem_saude.infraestrutura.cache.cache_base import Cache
+
+
+class CacheMemoria(Cache):
+    def __init__(self, tamanho_maximo: int, ttl_segundos: float):
+        super().__init__()
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl_segundos = ttl_segundos
+        self._itens: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._remocoes = 0
+
+
+    async def _obter(self, chave: str) -> bytes | None:
+        item = self._itens.get(chave)
+        if item is None:
+            return None
+
+        expira_em, valor = item
+        if expira_em <= time.monotonic():
+            del self._itens[chave]
+            return None
+
+        self._itens.move_to_end(chave)
+        return valor
+
+
+    async def geracao(self, chave: str) -> int:
+        return self._remocoes
+
+
+    async def definir(self, chave: str, valor: bytes, geracao: int) -> None:
+        if geracao != self._remocoes:
+            return
+        self._itens[chave] = (time.monotonic() + self.ttl_segundos, valor)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.tamanho_maximo:
+            self._itens.popitem(last=False)
+
+
+    async def remover(self, *chaves: str) -> None:
+        self._remocoes += 1
+        for chave in chaves:
+            self._itens.pop(chave, None)
+
+
+    def estatisticas(self) -> dict[str, int | float | str]:
+        return {**super().estatisticas(), "tamanho": len(self._itens)}
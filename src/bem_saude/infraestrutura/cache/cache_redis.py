@@ -0,0 +1,116 @@
+"""
+Backend de cache em servidor compatível com o protocolo Redis.
+
+Recebe o cliente já criado (`redis.asyncio.Redis` ou um fake compatível,
+como o `fakeredis.aioredis.FakeRedis`), o que permite testá-lo sem servidor.
+A geração de cada chave fica em uma chave irmã (`geracao:`), incrementada
+na remoção; gravar e remover são scripts Lua, atômicos entre os workers.
+
+Falhas do servidor não derrubam a requisição: a leitura vira uma falha de
+cache (a rota vai ao banco), o preenchimento é descartado e a remoção só é
+registrada no log.
+"""
+
+import logging
+from typing import Any
+
+from bem_saude.infraestrutura.cache.cache_base import Cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Grava só se a geração não mudou desde a leitura da rota
+SCRIPT_DEFINIR = """
+if tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+# Remove os valores e incrementa a geração de cada chave (KEYS: valor1, geracao1, valor2, geracao2, ...)
+SCRIPT_REMOVER = """
+for i = 1, #KEYS, 2 do
+    redis.call('DEL', KEYS[i])
+    redis.call('INCR', KEYS[i + 1])
+    redis.call('EXPIRE', KEYS[i + 1], ARGV[1])
+end
+"""
+
+
+def criar_cliente_redis(url: str) -> Any:
+    try:
+        from redis import asyncio as redis_asyncio
+    except ImportError as e:
+        raise RuntimeError(
+            "O backend de cache 'redis' requer o pacote redis (pip install redis)"
+        ) from e
+
+    return redis_asyncio.from_url(url)
+
+
+def erros_redis() -> tuple[type[Exception], ...]:
+    """Exceções de falha do servidor: conexão, timeout ou erro na resposta."""
+    from redis.exceptions import RedisError
+
+    return (RedisError, OSError)
+
+
+class CacheRedis(Cache):
+    def __init__(self, cliente: Any, ttl_segundos: int, prefixo: str = "bem_saude:"):
+        super().__init__()
+        self.cliente = cliente
+        self.ttl_segundos = ttl_segundos
+        self.prefixo = prefixo
+        self._erros = erros_redis()
+        self._definir = cliente.register_script(SCRIPT_DEFINIR)
+        self._remover = cliente.register_script(SCRIPT_REMOVER)
+
+
+    def _chave_geracao(self, chave: str) -> str:
+        return f"{self.prefixo}geracao:{chave}"
+
+
+    async def _obter(self, chave: str) -> bytes | None:
+        try:
+            return await self.cliente.get(self.prefixo + chave)
+        except self._erros as e:
+            logger.warning(f"Cache Redis indisponível ao ler {chave}: {e}")
+            return None
+
+
+    async def geracao(self, chave: str) -> int:
+        try:
+            return int(await self.cliente.get(self._chave_geracao(chave)) or 0)
+        except self._erros as e:
+            logger.warning(f"Cache Redis indisponível ao ler a geração de {chave}: {e}")
+            # Nenhuma geração gravada é negativa: o preenchimento é descartado
+            return -1
+
+
+    async def definir(self, chave: str, valor: bytes, geracao: int) -> None:
+        try:
+            await self._definir(
+                keys=[self.prefixo + chave, self._chave_geracao(chave)],
+                args=[valor, geracao, self.ttl_segundos],
+            )
+        except self._erros as e:
+            logger.warning(f"Cache Redis indisponível ao gravar {chave}: {e}")
+
+
+    async def remover(self, *chaves: str) -> None:
+        if not chaves:
+            return
+        try:
+            # A geração dura mais que o valor, para cobrir leituras lentas em andamento
+            await self._remover(
+                keys=[nome for chave in chaves for nome in (self.prefixo + chave, self._chave_geracao(chave))],
+                args=[self.ttl_segundos * 2],
+            )
+        except self._erros as e:
+            logger.error(f"Cache Redis indisponível ao invalidar {', '.join(chaves)}: {e}")
+
+
+    async def fechar(self) -> None:
+        await self.cliente.aclose()
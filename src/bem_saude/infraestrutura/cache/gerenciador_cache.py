@@ -0,0 +1,48 @@
+"""
+Criação do cache da aplicação conforme as configurações.
+
+Fornece a instância única `cache` e a dependência `obter_cache`.
+"""
+
+import logging
+
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.cache.cache_base import Cache
+from bem_saude.infraestrutura.cache.cache_memoria import CacheMemoria
+from bem_saude.infraestrutura.cache.cache_redis import CacheRedis, criar_cliente_redis
+from bem_saude.infraestrutura.servicos.metricas import MetricaColetada, registro
+
+
+logger = logging.getLogger(__name__)
+
+
+def criar_cache() -> Cache:
+    backend = configuracoes.CACHE_BACKEND.lower()
+    if backend == "redis":
+        logger.info("Cache configurado com backend Redis")
+        return CacheRedis(
+            criar_cliente_redis(configuracoes.CACHE_REDIS_URL),
+            ttl_segundos=configuracoes.CACHE_TTL_SEGUNDOS,
+        )
+    if backend != "memoria":
+        raise ValueError(f"Backend de cache desconhecido: {configuracoes.CACHE_BACKEND}")
+
+    return CacheMemoria(
+        tamanho_maximo=configuracoes.CACHE_TAMANHO_MAXIMO,
+        ttl_segundos=configuracoes.CACHE_TTL_SEGUNDOS,
+    )
+
+
+cache = criar_cache()
+
+
+registro.registrar(MetricaColetada(
+    "bem_saude_cache_consultas_total",
+    "Consultas ao cache de leitura por resultado.",
+    "counter",
+    lambda: [({"resultado": "acerto"}, cache.acertos), ({"resultado": "falha"}, cache.falhas)],
+))
+
+
+def obter_cache() -> Cache:
+    return cache
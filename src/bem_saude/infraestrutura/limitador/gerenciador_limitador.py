@@ -0,0 +1,25 @@
+"""
+Criação do limitador de requisições conforme as configurações.
+"""
+
+import logging
+
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.cache.cache_redis import criar_cliente_redis
+from bem_saude.infraestrutura.limitador.limitador_base import Limitador
+from bem_saude.infraestrutura.limitador.limitador_memoria import LimitadorMemoria
+from bem_saude.infraestrutura.limitador.limitador_redis import LimitadorRedis
+
+
+logger = logging.getLogger(__name__)
+
+
+def criar_limitador() -> Limitador:
+    backend = configuracoes.LIMITE_BACKEND.lower()
+    if backend == "redis":
+        logger.info("Limite de requisições configurado com backend Redis")
+        return LimitadorRedis(criar_cliente_redis(configuracoes.LIMITE_REDIS_URL))
+    if backend != "memoria":
+        raise ValueError(f"Backend de limite de requisições desconhecido: {configuracoes.LIMITE_BACKEND}")
+
+    return LimitadorMemoria()
@@ -0,0 +1,29 @@
+"""
+Contrato dos backends do limitador de requisições.
+
+Dois limites por chave (cliente + rota):
+- taxa: token bucket com `taxa` fichas por segundo e capacidade `rajada`;
+- concorrência: no máximo `maximo` requisições em andamento ao mesmo tempo.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class Limitador(ABC):
+    @abstractmethod
+    async def consumir(self, chave: str, taxa: float, rajada: int) -> float:
+        """Consome uma ficha. Retorna 0 se havia ficha, ou os segundos até a próxima."""
+
+
+    @abstractmethod
+    async def entrar(self, chave: str, maximo: int) -> bool:
+        """Ocupa uma vaga de concorrência. Retorna False se todas estão ocupadas."""
+
+
+    @abstractmethod
+    async def sair(self, chave: str) -> None:
+        """Libera a vaga ocupada por `entrar`."""
+
+
+    async def fechar(self) -> None:
+        pass
@@ -0,0 +1,55 @@
+"""
+Backend do limitador em memória do processo.
+
+Cada worker tem os seus contadores: com N workers o limite efetivo de um
+cliente é até N vezes o configurado. Use o backend Redis para um limite
+compartilhado.
+"""
+
+import time
+from collections import OrderedDict
+
+from bem_saude.infraestrutura.limitador.limitador_base import Limitador
+
+
+class LimitadorMemoria(Limitador):
+    def __init__(self, tamanho_maximo: int = 100_000):
+        # Baldes menos usados são descartados primeiro; um balde descartado
+        # volta cheio, o que só favorece o cliente
+        self.tamanho_maximo = tamanho_maximo
+        self._baldes: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._em_andamento: dict[str, int] = {}
+
+
+    async def consumir(self, chave: str, taxa: float, rajada: int) -> float:
+        agora = time.monotonic()
+        fichas, ultimo = self._baldes.get(chave, (rajada, agora))
+        fichas = min(rajada, fichas + (agora - ultimo) * taxa)
+
+        espera = 0.0
+        if fichas >= 1:
+            fichas -= 1
+        else:
+            espera = (1 - fichas) / taxa
+
+        self._baldes[chave] = (fichas, agora)
+        self._baldes.move_to_end(chave)
+        while len(self._baldes) > self.tamanho_maximo:
+            self._baldes.popitem(last=False)
+        return espera
+
+
+    async def entrar(self, chave: str, maximo: int) -> bool:
+        atual = self._em_andamento.get(chave, 0)
+        if atual >= maximo:
+            return False
+        self._em_andamento[chave] = atual + 1
+        return True
+
+
+    async def sair(self, chave: str) -> None:
+        atual = self._em_andamento.get(chave, 0) - 1
+        if atual > 0:
+            self._em_andamento[chave] = atual
+        else:
+            self._em_andamento.pop(chave, None)
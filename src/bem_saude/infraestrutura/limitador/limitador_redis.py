@@ -0,0 +1,102 @@
+"""
+Backend do limitador em servidor compatível com o protocolo Redis.
+
+Compartilha os limites entre workers e instâncias. Cada operação é um
+script Lua (atômico e com uma ida ao servidor); o token bucket usa o
+relógio do servidor (TIME), não o de cada worker.
+
+Falhas do servidor não derrubam a requisição: são registradas no log e a
+requisição passa sem limite até o servidor voltar.
+"""
+
+import logging
+from typing import Any
+
+from bem_saude.infraestrutura.cache.cache_redis import erros_redis
+from bem_saude.infraestrutura.limitador.limitador_base import Limitador
+
+
+logger = logging.getLogger(__name__)
+
+
+# Retorna a espera em segundos como texto (números Lua viram inteiros na resposta)
+SCRIPT_CONSUMIR = """
+local taxa = tonumber(ARGV[1])
+local rajada = tonumber(ARGV[2])
+local tempo = redis.call('TIME')
+local agora = tonumber(tempo[1]) + tonumber(tempo[2]) / 1000000
+local estado = redis.call('HMGET', KEYS[1], 'fichas', 'ultimo')
+local fichas = tonumber(estado[1]) or rajada
+local ultimo = tonumber(estado[2]) or agora
+fichas = math.min(rajada, fichas + math.max(0, agora - ultimo) * taxa)
+local espera = 0
+if fichas >= 1 then
+    fichas = fichas - 1
+else
+    espera = (1 - fichas) / taxa
+end
+redis.call('HSET', KEYS[1], 'fichas', tostring(fichas), 'ultimo', tostring(agora))
+redis.call('EXPIRE', KEYS[1], math.ceil(rajada / taxa) + 1)
+return tostring(espera)
+"""
+
+SCRIPT_ENTRAR = """
+local atual = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+if atual > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return 0
+end
+return 1
+"""
+
+# Não deixa o contador negativo se a chave expirou durante a requisição
+SCRIPT_SAIR = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') > 0 then
+    redis.call('DECR', KEYS[1])
+end
+"""
+
+
+class LimitadorRedis(Limitador):
+    def __init__(self, cliente: Any, prefixo: str = "bem_saude:limite:", ttl_concorrencia_segundos: int = 300):
+        self.cliente = cliente
+        self.prefixo = prefixo
+        # Vagas de um worker que morreu sem liberar expiram depois deste tempo
+        self.ttl_concorrencia_segundos = ttl_concorrencia_segundos
+        self._erros = erros_redis()
+        self._consumir = cliente.register_script(SCRIPT_CONSUMIR)
+        self._entrar = cliente.register_script(SCRIPT_ENTRAR)
+        self._sair = cliente.register_script(SCRIPT_SAIR)
+
+
+    async def consumir(self, chave: str, taxa: float, rajada: int) -> float:
+        try:
+            espera = await self._consumir(keys=[f"{self.prefixo}taxa:{chave}"], args=[taxa, rajada])
+        except self._erros as e:
+            logger.warning(f"Limitador Redis indisponível ao consumir {chave}: {e}")
+            return 0.0
+        return float(espera)
+
+
+    async def entrar(self, chave: str, maximo: int) -> bool:
+        try:
+            entrou = await self._entrar(
+                keys=[f"{self.prefixo}concorrencia:{chave}"],
+                args=[maximo, self.ttl_concorrencia_segundos],
+            )
+        except self._erros as e:
+            logger.warning(f"Limitador Redis indisponível ao entrar em {chave}: {e}")
+            return True
+        return bool(entrou)
+
+
+    async def sair(self, chave: str) -> None:
+        try:
+            await self._sair(keys=[f"{self.prefixo}concorrencia:{chave}"])
+        except self._erros as e:
+            logger.warning(f"Limitador Redis indisponível ao sair de {chave}: {e}")
+
+
+    async def fechar(self) -> None:
+        await self.cliente.aclose()
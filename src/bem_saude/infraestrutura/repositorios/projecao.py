@@ -0,0 +1,21 @@
+"""
+Projeção de colunas das listagens e buscas.
+
+As rotas aceitam `campos` para devolver só parte dos dados; os repositórios
+consultam apenas as colunas correspondentes, mais as da chave de ordenação
+(usadas no keyset e no cursor), sempre presentes.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+# Sempre consultadas: chave de ordenação e do cursor das listagens
+COLUNAS_ORDENACAO = ("status", "nome", "id")
+
+
+def colunas_projetadas(colunas: Mapping[str, InstrumentedAttribute], campos: Iterable[str]) -> list[InstrumentedAttribute]:
+    """Colunas para os campos pedidos mais as de ordenação, na ordem de `colunas`; campos sem coluna são ignorados."""
+    nomes = {*COLUNAS_ORDENACAO, *campos}
+    return [coluna for nome, coluna in colunas.items() if nome in nomes]
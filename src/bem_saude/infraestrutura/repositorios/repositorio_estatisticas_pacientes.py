@@ -0,0 +1,102 @@
+from datetime import date, datetime
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_estatistica_paciente import ModeloEstatisticaPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.repositorios.repositorio_versao_tabela import RepositorioVersaoTabela
+
+
+# Faixas etárias: rótulo e idade mínima, em ordem crescente
+FAIXAS_ETARIAS = (
+    ("0-17", 0),
+    ("18-29", 18),
+    ("30-44", 30),
+    ("45-59", 45),
+    ("60+", 60),
+)
+
+# Chave do advisory lock do PostgreSQL: um recálculo por vez entre os workers
+CHAVE_BLOQUEIO_RECALCULO = 7_318_240_023
+
+# Linha de `versoes_tabelas` com a versão da tabela de pacientes que o resumo reflete
+VERSAO_RESUMO = "estatisticas_pacientes"
+
+
+def _anos_antes(hoje: date, anos: int) -> date:
+    try:
+        return hoje.replace(year=hoje.year - anos)
+    except ValueError:
+        # 29 de fevereiro em ano não bissexto
+        return hoje.replace(year=hoje.year - anos, day=28)
+
+
+def _faixa_etaria(hoje: date):
+    """CASE com a faixa etária de cada paciente, por comparação de datas (portável entre bancos)."""
+    condicoes = [
+        (ModeloPaciente.data_nascimento > _anos_antes(hoje, idade_seguinte), rotulo)
+        for (rotulo, _), (_, idade_seguinte) in zip(FAIXAS_ETARIAS, FAIXAS_ETARIAS[1:])
+    ]
+    return case(*condicoes, else_=FAIXAS_ETARIAS[-1][0])
+
+
+class RepositorioEstatisticasPacientes:
+    def __init__(self, sessao: AsyncSession):
+        self.sessao = sessao
+
+
+    async def obter(self) -> list[ModeloEstatisticaPaciente]:
+        return list((await self.sessao.scalars(select(ModeloEstatisticaPaciente))).all())
+
+
+    async def recalcular(self, hoje: date | None = None) -> bool:
+        """
+        Recalcula o resumo a partir da tabela de pacientes, em uma transação,
+        se a tabela mudou (versão em `versoes_tabelas`) ou o dia mudou (as
+        faixas etárias dependem dele) desde o último recálculo.
+
+        A versão refletida pelo resumo fica gravada no banco, junto com ele:
+        com vários workers, só o primeiro a notar a mudança recalcula. Os
+        leitores continuam vendo o resumo anterior até o commit. No
+        PostgreSQL, se outro worker já estiver recalculando, não faz nada.
+        Retorna se recalculou.
+        """
+        if self.sessao.get_bind().dialect.name == "postgresql":
+            bloqueou = await self.sessao.scalar(select(func.pg_try_advisory_xact_lock(CHAVE_BLOQUEIO_RECALCULO)))
+            if not bloqueou:
+                await self.sessao.rollback()
+                return False
+
+        hoje = hoje or date.today()
+        versoes = RepositorioVersaoTabela(self.sessao)
+        # Lida antes do agrupamento: o resumo reflete ao menos esta versão
+        versao = await versoes.obter(ModeloPaciente.__tablename__)
+        ultimo_recalculo = await self.sessao.scalar(select(func.max(ModeloEstatisticaPaciente.atualizado_em)))
+        if (
+            ultimo_recalculo is not None
+            and ultimo_recalculo.date() == hoje
+            and await versoes.obter(VERSAO_RESUMO) == versao
+        ):
+            await self.sessao.rollback()
+            return False
+
+        agora = datetime.now()
+        await self.sessao.execute(delete(ModeloEstatisticaPaciente))
+        for dimensao, expressao in (
+                ("status", ModeloPaciente.status),
+                ("tipo_sanguineo", ModeloPaciente.tipo_sanguineo),
+                ("faixa_etaria", _faixa_etaria(hoje))):
+            # Agrupa pela coluna da subconsulta: a expressão da faixa tem parâmetros,
+            # e o PostgreSQL não reconhece a mesma expressão repetida no GROUP BY
+            valores = select(expressao.label("valor")).subquery()
+            agrupamento = (
+                select(literal(dimensao), valores.c.valor, func.count(), literal(agora))
+                .group_by(valores.c.valor)
+            )
+            await self.sessao.execute(
+                insert(ModeloEstatisticaPaciente).from_select(
+                    ["dimensao", "valor", "quantidade", "atualizado_em"], agrupamento
+                )
+            )
+        await versoes.definir(VERSAO_RESUMO, versao)
+        await self.sessao.commit()
+        return True
@@ -0,0 +1,71 @@
+from collections.abc import Iterable
+from datetime import date
+from enum import Enum
+from typing import Any
+from uuid import UUID
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_evento_outbox import ModeloEventoOutbox
+
+
+# Tipo do evento gravado por cada alteração de status
+TIPOS_POR_STATUS = {"ATIVO": "ativado", "INATIVO": "inativado"}
+
+
+def _valor_json(valor: Any) -> Any:
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    if isinstance(valor, Enum):
+        return valor.value
+    return valor
+
+
+class RepositorioEventoOutbox:
+    def __init__(self, sessao: AsyncSession):
+        self.sessao = sessao
+
+
+    async def registrar(self, entidade: str, tipo: str, eventos: Iterable[tuple[UUID, dict[str, Any]]]) -> None:
+        """
+        Grava os eventos na transação corrente, sem commit.
+
+        Um único INSERT (em lote quando há vários eventos): é todo o custo
+        da auditoria no caminho da requisição.
+        """
+        registros = [
+            {
+                "entidade": entidade,
+                "entidade_id": entidade_id,
+                "tipo": tipo,
+                "dados": {campo: _valor_json(valor) for campo, valor in dados.items()},
+            }
+            for entidade_id, dados in eventos
+        ]
+        if registros:
+            await self.sessao.execute(insert(ModeloEventoOutbox), registros)
+
+
+    async def pendentes(self, limite: int) -> list[ModeloEventoOutbox]:
+        """
+        Eventos mais antigos ainda não entregues, bloqueados até o fim da transação.
+
+        Com SKIP LOCKED (PostgreSQL) despachantes de workers diferentes
+        pegam lotes distintos em vez de esperar uns pelos outros.
+        """
+        consulta = (
+            select(ModeloEventoOutbox)
+            .order_by(ModeloEventoOutbox.id)
+            .limit(limite)
+            .with_for_update(skip_locked=True)
+        )
+        return list((await self.sessao.scalars(consulta)).all())
+
+
+    async def remover(self, ids: list[int]) -> None:
+        await self.sessao.execute(
+            delete(ModeloEventoOutbox)
+            .where(ModeloEventoOutbox.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
@@ -1,22 +1,184 @@
+import re
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, datetime
 from uuid import UUID
-from sqlalchemy.orm import Session
-from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from sqlalchemy import Row, case, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.dominio.excecoes.paciente_excecoes import CpfJaCadastradoErro
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente, somente_digitos
+from bem_saude.infraestrutura.cache.cache_base import Cache
+from bem_saude.infraestrutura.repositorios.projecao import colunas_projetadas
+from bem_saude.infraestrutura.repositorios.repositorio_evento_outbox import TIPOS_POR_STATUS, RepositorioEventoOutbox
+from bem_saude.infraestrutura.repositorios.repositorio_versao_tabela import RepositorioVersaoTabela
+
+
+# Colunas que as listagens e buscas podem projetar, por nome
+COLUNAS_LISTAGEM = {
+    coluna.key: coluna
+    for coluna in (
+        ModeloPaciente.id,
+        ModeloPaciente.nome,
+        ModeloPaciente.status,
+        ModeloPaciente.cpf,
+        ModeloPaciente.data_nascimento,
+        ModeloPaciente.telefone,
+        ModeloPaciente.email,
+        ModeloPaciente.endereco,
+        ModeloPaciente.tipo_sanguineo,
+        ModeloPaciente.observacoes,
+        ModeloPaciente.criado_em,
+    )
+}
+
+# Menos dígitos que isso casariam com quase todo CPF/telefone
+MINIMO_DIGITOS_BUSCA = 3
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _somente_digitos_sqlite(coluna):
+    # SQLite não tem regexp_replace; remove a pontuação usual do telefone
+    for caractere in (".", "-", "(", ")", " ", "/"):
+        coluna = func.replace(coluna, caractere, "")
+    return coluna
+
+
+def _viola_cpf_unico(erro: IntegrityError) -> bool:
+    # PostgreSQL cita o nome do índice; SQLite, a coluna
+    mensagem = str(erro.orig)
+    return "ux_pacientes_cpf" in mensagem or "pacientes.cpf" in mensagem
+
+
+def _dados_paciente(paciente: ModeloPaciente) -> dict:
+    # Valores gravados no evento de criação; id e criado_em já estão no próprio evento
+    return {
+        coluna.key: getattr(paciente, coluna.key)
+        for coluna in ModeloPaciente.__table__.columns
+        if coluna.key not in ("id", "criado_em")
+    }
 
 
 class RepositorioPaciente:
-    def __init__(self, sessao: Session):
+    def __init__(self, sessao: AsyncSession, cache: Cache | None = None):
         self.sessao = sessao
+        self.cache = cache
+
+
+    @staticmethod
+    def chave_cache(id: UUID) -> str:
+        return f"paciente:{id}"
+
+
+    async def versao(self) -> int:
+        """Versão atual da tabela, incrementada a cada escrita."""
+        return await RepositorioVersaoTabela(self.sessao).obter(ModeloPaciente.__tablename__)
+
 
+    async def _registrar_escrita(self, tipo: str, eventos: list[tuple[UUID, dict]]) -> None:
+        """
+        Chamado antes de cada commit de escrita: grava o evento de auditoria
+        no outbox e incrementa a versão da tabela (ETags).
+        """
+        await RepositorioEventoOutbox(self.sessao).registrar(ModeloPaciente.__tablename__, tipo, eventos)
+        await RepositorioVersaoTabela(self.sessao).incrementar(ModeloPaciente.__tablename__)
 
-    def criar(self, paciente: ModeloPaciente) -> ModeloPaciente:
+
+    async def _invalidar_cache(self, id: UUID) -> None:
+        if self.cache is not None:
+            await self.cache.remover(self.chave_cache(id))
+
+
+    async def criar(self, paciente: ModeloPaciente) -> ModeloPaciente:
+        """
+        Grava o paciente. CPF repetido é recusado pelo índice único
+        (`CpfJaCadastradoErro`), sem uma consulta prévia.
+        """
         self.sessao.add(paciente)
-        self.sessao.commit()
-        self.sessao.flush(paciente)
+        try:
+            await self._registrar_escrita("criado", [(paciente.id, _dados_paciente(paciente))])
+            await self.sessao.commit()
+        except IntegrityError as e:
+            await self.sessao.rollback()
+            if _viola_cpf_unico(e):
+                raise CpfJaCadastradoErro() from e
+            raise
 
         return paciente
-    
 
-    def editar(
+
+    async def criar_em_lote(self, pacientes: list[dict]) -> set[UUID]:
+        """
+        Insere vários pacientes em uma única transação.
+
+        Usa um INSERT em lote (executemany/insertmanyvalues) em vez de uma
+        ida ao banco por paciente. Pacientes com CPF já cadastrado (no banco
+        ou repetido no lote) são ignorados com ON CONFLICT DO NOTHING, sem
+        derrubar o lote. Retorna os ids inseridos.
+        Em caso de erro nenhum registro do lote é gravado.
+        """
+        if not pacientes:
+            return set()
+
+        try:
+            resultado = await self.sessao.execute(
+                self._insert_ignorando_cpf_repetido().returning(ModeloPaciente.id),
+                pacientes,
+            )
+            inseridos = set(resultado.scalars().all())
+            if inseridos:
+                await self._registrar_escrita(
+                    "criado",
+                    [
+                        (paciente["id"], {campo: valor for campo, valor in paciente.items() if campo != "id"})
+                        for paciente in pacientes
+                        if paciente["id"] in inseridos
+                    ],
+                )
+            await self.sessao.commit()
+        except SQLAlchemyError:
+            await self.sessao.rollback()
+            raise
+
+        return inseridos
+
+
+    def _insert_ignorando_cpf_repetido(self):
+        dialeto = self.sessao.get_bind().dialect.name
+        if dialeto == "postgresql":
+            return postgresql.insert(ModeloPaciente).on_conflict_do_nothing(index_elements=[ModeloPaciente.cpf])
+        if dialeto == "sqlite":
+            return sqlite.insert(ModeloPaciente).on_conflict_do_nothing(index_elements=[ModeloPaciente.cpf])
+        return insert(ModeloPaciente)
+
+
+    async def _atualizar(self, id: UUID, tipo: str, **valores) -> bool:
+        """
+        Atualiza o paciente com um único `UPDATE ... WHERE id = :id RETURNING id`.
+
+        Sem SELECT prévio: o paciente não existe quando nenhuma linha é retornada.
+        """
+        resultado = await self.sessao.execute(
+            update(ModeloPaciente)
+            .where(ModeloPaciente.id == id)
+            .values(**valores)
+            .returning(ModeloPaciente.id)
+            .execution_options(synchronize_session=False)
+        )
+        encontrado = resultado.scalar_one_or_none() is not None
+        if encontrado:
+            await self._registrar_escrita(tipo, [(id, valores)])
+        await self.sessao.commit()
+
+        if encontrado:
+            await self._invalidar_cache(id)
+        return encontrado
+
+
+    async def editar(
             self,
             id: UUID,
             nome: str,
@@ -24,49 +186,175 @@ class RepositorioPaciente:
             endereco: str,
             observacoes: str,
             email: str):
-        modelo = self.sessao.query(ModeloPaciente).filter(ModeloPaciente.id == id).first()
-        if not modelo:
-            return False
-        
-        modelo.nome = nome
-        modelo.telefone = telefone
-        modelo.endereco = endereco
-        modelo.observacoes = observacoes
-        modelo.email = email
-
-        self.sessao.commit()
-        return True
-    
-
-    def inativar(self, id: UUID):
-        paciente = self.sessao.query(ModeloPaciente).filter(ModeloPaciente.id == id).first()
-        if not paciente:
-            return False
-        
-        paciente.status = "INATIVO"
-        self.sessao.commit()
-        return True
-    
-
-    def ativar(self, id: UUID):
-        paciente = self.sessao.query(ModeloPaciente).filter(ModeloPaciente.id == id).first()
-        if not paciente:
-            return False
-        
-        paciente.status = "ATIVO"
-        self.sessao.commit()
-        return True
-    
+        return await self._atualizar(
+            id,
+            "editado",
+            nome=nome,
+            telefone=telefone,
+            endereco=endereco,
+            observacoes=observacoes,
+            email=email,
+        )
+
+
+    async def inativar(self, id: UUID):
+        return await self._atualizar(id, "inativado", status="INATIVO")
+
+
+    async def ativar(self, id: UUID):
+        return await self._atualizar(id, "ativado", status="ATIVO")
+
+
+    async def alterar_status_em_lote(self, ids: list[UUID], status: str) -> list[UUID]:
+        """
+        Altera o status de vários pacientes com um único UPDATE.
+
+        Retorna os ids encontrados; os demais não existem.
+        """
+        resultado = await self.sessao.execute(
+            update(ModeloPaciente)
+            .where(ModeloPaciente.id.in_(set(ids)))
+            .values(status=status)
+            .returning(ModeloPaciente.id)
+            .execution_options(synchronize_session=False)
+        )
+        encontrados = list(resultado.scalars())
+        if encontrados:
+            await self._registrar_escrita(TIPOS_POR_STATUS[status], [(id, {"status": status}) for id in encontrados])
+        await self.sessao.commit()
+
+        if self.cache is not None and encontrados:
+            await self.cache.remover(*(self.chave_cache(id) for id in encontrados))
+        return encontrados
+
+
+    async def listar(
+            self,
+            limite: int,
+            apos: tuple[str, str, UUID] | None = None,
+            status: str | None = None,
+            tipo_sanguineo: str | None = None,
+            nascidos_de: date | None = None,
+            nascidos_ate: date | None = None,
+            criado_desde: datetime | None = None,
+            campos: Iterable[str] = COLUNAS_LISTAGEM) -> list[Row]:
+        """
+        Lista uma página de pacientes ordenada por (status, nome, id).
+
+        `apos` é a chave de ordenação do último item da página anterior;
+        a comparação por tupla permite percorrer o índice composto sem OFFSET.
+        Os filtros informados são aplicados na própria consulta.
+        Retorna linhas só com as colunas dos `campos` (e as de ordenação),
+        sem carregar entidades nem passar pelo identity map.
+        """
+        consulta = select(*colunas_projetadas(COLUNAS_LISTAGEM, campos))
+        if status is not None:
+            consulta = consulta.where(ModeloPaciente.status == status)
+        if tipo_sanguineo is not None:
+            consulta = consulta.where(ModeloPaciente.tipo_sanguineo == tipo_sanguineo)
+        if nascidos_de is not None:
+            consulta = consulta.where(ModeloPaciente.data_nascimento >= nascidos_de)
+        if nascidos_ate is not None:
+            consulta = consulta.where(ModeloPaciente.data_nascimento <= nascidos_ate)
+        if criado_desde is not None:
+            consulta = consulta.where(ModeloPaciente.criado_em >= criado_desde)
+        if apos is not None:
+            consulta = consulta.where(
+                tuple_(ModeloPaciente.status, ModeloPaciente.nome, ModeloPaciente.id) > tuple_(*apos)
+            )
 
-    def listar(self) -> list[ModeloPaciente]:
-        pacientes = self.sessao.query(ModeloPaciente).order_by(ModeloPaciente.status, ModeloPaciente.nome).all()
+        consulta = consulta.order_by(
+            ModeloPaciente.status,
+            ModeloPaciente.nome,
+            ModeloPaciente.id
+        ).limit(limite)
 
-        return pacientes
-    
+        pacientes = (await self.sessao.execute(consulta)).all()
+        return list(pacientes)
 
-    def buscar_por_id(self, id: UUID) -> ModeloPaciente | None:
-        paciente = self.sessao.query(ModeloPaciente).filter(ModeloPaciente.id == id).first()
+
+    async def buscar_por_cpf(self, cpf: str) -> ModeloPaciente | None:
+        """Busca exata pelo CPF (apenas dígitos), pelo índice único."""
+        return await self.sessao.scalar(select(ModeloPaciente).where(ModeloPaciente.cpf == cpf))
+
+
+    async def buscar_por_id(self, id: UUID) -> ModeloPaciente | None:
+        paciente = await self.sessao.get(ModeloPaciente, id)
         if not paciente:
             return False
-        
-        return paciente
\ No newline at end of file
+
+        return paciente
+
+
+    async def exportar(self, tamanho_lote: int) -> AsyncIterator[list[ModeloPaciente]]:
+        """
+        Percorre todos os pacientes em lotes usando cursor no servidor.
+
+        Com `yield_per` o driver busca `tamanho_lote` linhas por vez,
+        mantendo a memória constante independente do tamanho da tabela.
+        """
+        consulta = (
+            select(ModeloPaciente)
+            .order_by(ModeloPaciente.id)
+            .execution_options(yield_per=tamanho_lote)
+        )
+        resultado = await self.sessao.stream_scalars(consulta)
+        async for lote in resultado.partitions():
+            yield lote
+
+
+    async def buscar(
+            self,
+            termo: str,
+            limite: int,
+            campos: Iterable[str] = COLUNAS_LISTAGEM) -> list[Row]:
+        """
+        Busca pacientes por parte do nome, CPF ou telefone.
+
+        No PostgreSQL usa os índices pg_trgm (similaridade e ILIKE no nome,
+        LIKE sobre o CPF e os dígitos do telefone). Em outros bancos, como o
+        SQLite usado em desenvolvimento, cai para LIKE simples.
+        """
+        termo = termo.strip()
+        digitos = re.sub(r"\D", "", termo)
+        padrao_nome = f"%{_escapar_like(termo)}%"
+
+        # O CPF já é gravado só com dígitos
+        cpf = ModeloPaciente.cpf
+        if self.sessao.get_bind().dialect.name == "postgresql":
+            telefone = somente_digitos(ModeloPaciente.telefone)
+            condicoes = [
+                ModeloPaciente.nome.op("%")(termo),
+                ModeloPaciente.nome.ilike(padrao_nome, escape="\\"),
+            ]
+            similaridade = func.similarity(ModeloPaciente.nome, termo)
+        else:
+            telefone = _somente_digitos_sqlite(ModeloPaciente.telefone)
+            condicoes = [ModeloPaciente.nome.ilike(padrao_nome, escape="\\")]
+            similaridade = case(
+                (ModeloPaciente.nome.ilike(f"{_escapar_like(termo)}%", escape="\\"), 1.0),
+                else_=0.5,
+            )
+
+        # Documentos têm prioridade sobre nomes parecidos
+        prioridade = case((ModeloPaciente.nome == termo, 1), else_=0)
+        if len(digitos) >= MINIMO_DIGITOS_BUSCA:
+            condicoes.append(cpf.like(f"%{digitos}%"))
+            condicoes.append(telefone.like(f"%{digitos}%"))
+            prioridade = case(
+                (cpf == digitos, 5),
+                (cpf.like(f"{digitos}%"), 4),
+                (cpf.like(f"%{digitos}%"), 3),
+                (telefone.like(f"%{digitos}%"), 2),
+                else_=prioridade,
+            )
+
+        consulta = (
+            select(*colunas_projetadas(COLUNAS_LISTAGEM, campos))
+            .where(or_(*condicoes))
+            .order_by(prioridade.desc(), similaridade.desc(), ModeloPaciente.nome, ModeloPaciente.id)
+            .limit(limite)
+        )
+
+        pacientes = (await self.sessao.execute(consulta)).all()
+        return list(pacientes)
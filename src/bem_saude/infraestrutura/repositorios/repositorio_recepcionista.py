@@ -1,60 +1,161 @@
+from collections.abc import Iterable
 from uuid import UUID
 from bem_saude.dominio.enums.status_cadastro import StatusCadastro
 from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.infraestrutura.cache.cache_base import Cache
+from bem_saude.infraestrutura.repositorios.projecao import colunas_projetadas
+from bem_saude.infraestrutura.repositorios.repositorio_evento_outbox import TIPOS_POR_STATUS, RepositorioEventoOutbox
+from bem_saude.infraestrutura.repositorios.repositorio_versao_tabela import RepositorioVersaoTabela
+
+
+# Colunas que a listagem pode projetar, por nome
+COLUNAS_LISTAGEM = {
+    coluna.key: coluna
+    for coluna in (
+        ModeloRecepcionista.id,
+        ModeloRecepcionista.nome,
+        ModeloRecepcionista.status,
+        ModeloRecepcionista.criado_em,
+    )
+}
+
+def _dados_recepcionista(recepcionista: ModeloRecepcionista) -> dict:
+    # Valores gravados no evento de criação; id e criado_em já estão no próprio evento
+    return {
+        coluna.key: getattr(recepcionista, coluna.key)
+        for coluna in ModeloRecepcionista.__table__.columns
+        if coluna.key not in ("id", "criado_em")
+    }
 
 
 class RepositorioRecepcionista:
-    def __init__(self, sessao: Session):
+    def __init__(self, sessao: AsyncSession, cache: Cache | None = None):
         self.sessao = sessao
+        self.cache = cache
+
+
+    @staticmethod
+    def chave_cache(id: UUID) -> str:
+        return f"recepcionista:{id}"
+
+
+    async def versao(self) -> int:
+        """Versão atual da tabela, incrementada a cada escrita."""
+        return await RepositorioVersaoTabela(self.sessao).obter(ModeloRecepcionista.__tablename__)
+
+
+    async def _registrar_escrita(self, tipo: str, eventos: list[tuple[UUID, dict]]) -> None:
+        """
+        Chamado antes de cada commit de escrita: grava o evento de auditoria
+        no outbox e incrementa a versão da tabela (ETags).
+        """
+        await RepositorioEventoOutbox(self.sessao).registrar(ModeloRecepcionista.__tablename__, tipo, eventos)
+        await RepositorioVersaoTabela(self.sessao).incrementar(ModeloRecepcionista.__tablename__)
+
+
+    async def _invalidar_cache(self, id: UUID) -> None:
+        if self.cache is not None:
+            await self.cache.remover(self.chave_cache(id))
+
+
+    async def _atualizar(self, id: UUID, tipo: str, **valores) -> bool:
+        """
+        Atualiza o recepcionista com um único `UPDATE ... WHERE id = :id RETURNING id`.
+
+        Sem SELECT prévio: o recepcionista não existe quando nenhuma linha é retornada.
+        """
+        resultado = await self.sessao.execute(
+            update(ModeloRecepcionista)
+            .where(ModeloRecepcionista.id == id)
+            .values(**valores)
+            .returning(ModeloRecepcionista.id)
+            .execution_options(synchronize_session=False)
+        )
+        encontrado = resultado.scalar_one_or_none() is not None
+        if encontrado:
+            await self._registrar_escrita(tipo, [(id, valores)])
+        await self.sessao.commit()
 
+        if encontrado:
+            await self._invalidar_cache(id)
+        return encontrado
 
-    def criar(self, recepcionista: ModeloRecepcionista) -> ModeloRecepcionista:
+
+    async def criar(self, recepcionista: ModeloRecepcionista) -> ModeloRecepcionista:
         self.sessao.add(recepcionista)
-        self.sessao.commit()
-        self.sessao.flush(recepcionista)
+        await self._registrar_escrita("criado", [(recepcionista.id, _dados_recepcionista(recepcionista))])
+        await self.sessao.commit()
 
         return recepcionista
 
 
-    def listar(self) -> list[ModeloRecepcionista]:
-        modelos = self.sessao.query(ModeloRecepcionista).order_by(ModeloRecepcionista.status, ModeloRecepcionista.nome).all()
-        return modelos
-    
+    async def listar(
+            self,
+            limite: int,
+            apos: tuple[str, str, UUID] | None = None,
+            campos: Iterable[str] = COLUNAS_LISTAGEM) -> list[Row]:
+        """
+        Lista uma página de recepcionistas ordenada por (status, nome, id).
+
+        `apos` é a chave de ordenação do último item da página anterior.
+
+        Consulta só as colunas dos `campos` (e as de ordenação); campos sem coluna são ignorados.
+        """
+        consulta = select(*colunas_projetadas(COLUNAS_LISTAGEM, campos))
+        if apos is not None:
+            consulta = consulta.where(
+                tuple_(ModeloRecepcionista.status, ModeloRecepcionista.nome, ModeloRecepcionista.id) > tuple_(*apos)
+            )
+
+        consulta = consulta.order_by(
+            ModeloRecepcionista.status,
+            ModeloRecepcionista.nome,
+            ModeloRecepcionista.id
+        ).limit(limite)
+
+        linhas = (await self.sessao.execute(consulta)).all()
+        return list(linhas)
+
+
+    async def remover(self, id: UUID):
+        return await self._atualizar(id, "inativado", status="INATIVO")
 
-    def remover(self, id: UUID):
-        modelo = self.sessao.query(ModeloRecepcionista).filter(ModeloRecepcionista.id == id).first()
-        if not modelo:
-            return False
-        
-        modelo.status = "INATIVO"
-        self.sessao.commit()
-        return True
 
+    async def alterar_status_em_lote(self, ids: list[UUID], status: str) -> list[UUID]:
+        """
+        Altera o status de vários recepcionistas com um único UPDATE.
 
-    def buscar_por_id(self, id: UUID) -> ModeloRecepcionista | None:
-        modelo = self.sessao.query(ModeloRecepcionista).filter(ModeloRecepcionista.id == id).first()
+        Retorna os ids encontrados; os demais não existem.
+        """
+        resultado = await self.sessao.execute(
+            update(ModeloRecepcionista)
+            .where(ModeloRecepcionista.id.in_(set(ids)))
+            .values(status=status)
+            .returning(ModeloRecepcionista.id)
+            .execution_options(synchronize_session=False)
+        )
+        encontrados = list(resultado.scalars())
+        if encontrados:
+            await self._registrar_escrita(TIPOS_POR_STATUS[status], [(id, {"status": status}) for id in encontrados])
+        await self.sessao.commit()
+
+        if self.cache is not None and encontrados:
+            await self.cache.remover(*(self.chave_cache(id) for id in encontrados))
+        return encontrados
+
+
+    async def buscar_por_id(self, id: UUID) -> ModeloRecepcionista | None:
+        modelo = await self.sessao.get(ModeloRecepcionista, id)
 
         return modelo
-    
-
-    def editar(self, id: UUID, nome: str):
-        modelo = self.sessao.query(ModeloRecepcionista).filter(ModeloRecepcionista.id == id).first()
-        if not modelo:
-            return False
-        
-        modelo.nome = nome
-        self.sessao.commit()
-        return True
-    
-
-    def ativar(self, id: UUID):
-        recepcionista = self.sessao.query(ModeloRecepcionista).filter(ModeloRecepcionista.id == id).first()
-        if not recepcionista:
-            return False
-        
-        recepcionista.status = StatusCadastro.ATIVO.value
-        self.sessao.commit()
-
-        return True
\ No newline at end of file
+
+
+    async def editar(self, id: UUID, nome: str):
+        return await self._atualizar(id, "editado", nome=nome)
+
+
+    async def ativar(self, id: UUID):
+        return await self._atualizar(id, "ativado", status=StatusCadastro.ATIVO.value)
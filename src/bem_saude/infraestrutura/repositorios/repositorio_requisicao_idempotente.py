@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_requisicao_idempotente import ModeloRequisicaoIdempotente
+
+
+class RepositorioRequisicaoIdempotente:
+    def __init__(self, sessao: AsyncSession):
+        self.sessao = sessao
+
+
+    async def obter(self, escopo: str, rota: str, chave: str) -> ModeloRequisicaoIdempotente | None:
+        """Resposta guardada para a chave, se ainda não expirou."""
+        consulta = select(ModeloRequisicaoIdempotente).where(
+            ModeloRequisicaoIdempotente.escopo == escopo,
+            ModeloRequisicaoIdempotente.rota == rota,
+            ModeloRequisicaoIdempotente.chave == chave,
+            ModeloRequisicaoIdempotente.expira_em > datetime.now(),
+        )
+        return await self.sessao.scalar(consulta)
+
+
+    async def registrar(self, requisicao: ModeloRequisicaoIdempotente) -> None:
+        """
+        Guarda a resposta na transação corrente, sem commit.
+
+        Remove antes as chaves expiradas do mesmo escopo, o que também libera
+        uma chave expirada que esteja sendo reutilizada.
+        """
+        await self.sessao.execute(
+            delete(ModeloRequisicaoIdempotente)
+            .where(
+                ModeloRequisicaoIdempotente.escopo == requisicao.escopo,
+                ModeloRequisicaoIdempotente.expira_em <= datetime.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.sessao.add(requisicao)
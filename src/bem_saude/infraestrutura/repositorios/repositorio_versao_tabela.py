@@ -0,0 +1,42 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_versao_tabela import ModeloVersaoTabela
+
+
+class RepositorioVersaoTabela:
+    def __init__(self, sessao: AsyncSession):
+        self.sessao = sessao
+
+
+    async def obter(self, tabela: str) -> int:
+        versao = await self.sessao.scalar(
+            select(ModeloVersaoTabela.versao).where(ModeloVersaoTabela.tabela == tabela)
+        )
+        return versao or 0
+
+
+    async def definir(self, tabela: str, versao: int) -> None:
+        """Grava a versão na transação corrente, criando a linha se ainda não existir."""
+        resultado = await self.sessao.execute(
+            update(ModeloVersaoTabela)
+            .where(ModeloVersaoTabela.tabela == tabela)
+            .values(versao=versao)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0:
+            await self.sessao.execute(insert(ModeloVersaoTabela).values(tabela=tabela, versao=versao))
+
+
+    async def incrementar(self, tabela: str) -> None:
+        """
+        Incrementa a versão da tabela na transação corrente.
+
+        Deve ser o último comando antes do commit: a linha fica bloqueada até o
+        fim da transação, serializando as escritas concorrentes na mesma tabela.
+        """
+        await self.sessao.execute(
+            update(ModeloVersaoTabela)
+            .where(ModeloVersaoTabela.tabela == tabela)
+            .values(versao=ModeloVersaoTabela.versao + 1)
+            .execution_options(synchronize_session=False)
+        )
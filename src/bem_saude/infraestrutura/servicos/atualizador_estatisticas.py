@@ -0,0 +1,58 @@
+"""
+Recálculo periódico do resumo de estatísticas de pacientes.
+
+Roda em segundo plano a cada `intervalo_segundos` e só recalcula quando a
+tabela de pacientes mudou (versão em `versoes_tabelas`) ou a data mudou
+(as faixas etárias dependem do dia). A versão refletida pelo resumo fica no
+banco, não no processo: com vários workers, cada mudança gera um único
+recálculo. O recálculo agrupa a tabela de pacientes uma vez; a rota de
+estatísticas só lê o resumo.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bem_saude.infraestrutura.banco_dados.conexao import LER_DO_PRIMARIO
+from bem_saude.infraestrutura.repositorios.repositorio_estatisticas_pacientes import RepositorioEstatisticasPacientes
+
+
+logger = logging.getLogger(__name__)
+
+
+class AtualizadorEstatisticas:
+    def __init__(self, fabrica_sessao: async_sessionmaker[AsyncSession], intervalo_segundos: float = 60):
+        self.fabrica_sessao = fabrica_sessao
+        self.intervalo_segundos = intervalo_segundos
+        self._tarefa: asyncio.Task | None = None
+
+
+    async def iniciar(self) -> None:
+        self._tarefa = asyncio.create_task(self._atualizar_continuamente())
+
+
+    async def encerrar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+
+    async def atualizar(self) -> bool:
+        """Recalcula o resumo se houve mudança desde o último recálculo. Retorna se recalculou."""
+        # No primário: o advisory lock e a versão precisam ser os do banco de escrita
+        async with self.fabrica_sessao(info={LER_DO_PRIMARIO: True}) as sessao:
+            return await RepositorioEstatisticasPacientes(sessao).recalcular()
+
+
+    async def _atualizar_continuamente(self) -> None:
+        while True:
+            try:
+                await self.atualizar()
+            except Exception:
+                logger.exception("Erro ao recalcular as estatísticas de pacientes")
+            await asyncio.sleep(self.intervalo_segundos)
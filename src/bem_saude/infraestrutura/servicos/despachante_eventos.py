@@ -0,0 +1,144 @@
+"""
+Despacho dos eventos de auditoria gravados no outbox.
+
+As rotas só gravam o evento na tabela `eventos_outbox`, na mesma transação
+da alteração. O `DespachanteEventos` roda em segundo plano: lê os eventos
+em lotes, entrega ao destino configurado (arquivo NDJSON ou fila local) e
+os remove da tabela. A entrega é "ao menos uma vez": se a remoção falhar
+depois do envio, o lote é reenviado na próxima rodada.
+"""
+
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_evento_outbox import ModeloEventoOutbox
+from bem_saude.infraestrutura.repositorios.repositorio_evento_outbox import RepositorioEventoOutbox
+from bem_saude.infraestrutura.servicos.metricas import eventos_despachados
+
+
+logger = logging.getLogger(__name__)
+
+
+class DestinoEventos(ABC):
+    @abstractmethod
+    async def enviar(self, eventos: list[dict[str, Any]]) -> None:
+        ...
+
+    async def fechar(self) -> None:
+        pass
+
+
+class DestinoArquivo(DestinoEventos):
+    """Acrescenta os eventos a um arquivo NDJSON, um evento por linha."""
+
+    def __init__(self, caminho: str | Path):
+        self.caminho = Path(caminho)
+
+    async def enviar(self, eventos: list[dict[str, Any]]) -> None:
+        await asyncio.to_thread(self._gravar, eventos)
+
+    def _gravar(self, eventos: list[dict[str, Any]]) -> None:
+        with self.caminho.open("ab") as arquivo:
+            arquivo.write(b"".join(orjson.dumps(evento) + b"\n" for evento in eventos))
+            arquivo.flush()
+            # Os eventos saem do outbox em seguida; precisam estar no disco
+            os.fsync(arquivo.fileno())
+
+
+class DestinoFila(DestinoEventos):
+    """Entrega os eventos em uma fila asyncio do próprio processo (consumidores locais e testes)."""
+
+    def __init__(self, tamanho_maximo: int = 0):
+        self.fila: asyncio.Queue[dict[str, Any]] = asyncio.Queue(tamanho_maximo)
+
+    async def enviar(self, eventos: list[dict[str, Any]]) -> None:
+        for evento in eventos:
+            await self.fila.put(evento)
+
+
+def criar_destino_eventos() -> DestinoEventos:
+    destino = configuracoes.OUTBOX_DESTINO.lower()
+    if destino == "arquivo":
+        return DestinoArquivo(configuracoes.OUTBOX_ARQUIVO)
+    if destino == "fila":
+        return DestinoFila()
+    raise ValueError(f"Destino de eventos desconhecido: {configuracoes.OUTBOX_DESTINO}")
+
+
+def _como_mensagem(evento: ModeloEventoOutbox) -> dict[str, Any]:
+    return {
+        "id": evento.id,
+        "entidade": evento.entidade,
+        "entidade_id": evento.entidade_id,
+        "tipo": evento.tipo,
+        "dados": evento.dados,
+        "criado_em": evento.criado_em,
+    }
+
+
+class DespachanteEventos:
+    def __init__(
+            self,
+            fabrica_sessao: async_sessionmaker[AsyncSession],
+            destino: DestinoEventos,
+            tamanho_lote: int = 500,
+            intervalo_segundos: float = 1):
+        self.fabrica_sessao = fabrica_sessao
+        self.destino = destino
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_segundos = intervalo_segundos
+        self._tarefa: asyncio.Task | None = None
+
+
+    async def iniciar(self) -> None:
+        self._tarefa = asyncio.create_task(self._despachar_continuamente())
+
+
+    async def encerrar(self) -> None:
+        # Eventos não despachados continuam no outbox para a próxima execução
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+        await self.destino.fechar()
+
+
+    async def despachar_lote(self) -> int:
+        """Entrega um lote de eventos e os remove do outbox. Retorna quantos foram entregues."""
+        async with self.fabrica_sessao() as sessao:
+            repositorio = RepositorioEventoOutbox(sessao)
+            eventos = await repositorio.pendentes(self.tamanho_lote)
+            if not eventos:
+                return 0
+
+            await self.destino.enviar([_como_mensagem(evento) for evento in eventos])
+            await repositorio.remover([evento.id for evento in eventos])
+            await sessao.commit()
+
+        eventos_despachados.incrementar(len(eventos))
+        return len(eventos)
+
+
+    async def _despachar_continuamente(self) -> None:
+        while True:
+            try:
+                despachados = await self.despachar_lote()
+            except Exception:
+                # Banco ou destino indisponível: tenta de novo no próximo intervalo
+                logger.exception("Erro ao despachar eventos do outbox")
+                despachados = 0
+
+            # Lote cheio indica fila acumulada: segue drenando sem esperar
+            if despachados < self.tamanho_lote:
+                await asyncio.sleep(self.intervalo_segundos)
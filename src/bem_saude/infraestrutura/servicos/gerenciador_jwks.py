@@ -0,0 +1,176 @@
+"""
+Gerenciador das chaves públicas (JWKS) do Auth0.
+
+Mantém as chaves RSA já construídas e indexadas por `kid`, renova o
+conjunto em segundo plano a cada TTL e, quando chega um `kid`
+desconhecido (rotação de chaves), faz uma única busca por vez.
+
+O espaço entre buscas conta a partir da última tentativa, com ou sem
+sucesso: depois de uma busca bem-sucedida, o intervalo mínimo; depois de
+falhas seguidas, uma espera que dobra a cada falha, até um máximo. Dentro
+dessa janela, um `kid` desconhecido (inclusive forjado) não gera uma busca:
+recebe o resultado da última tentativa (chave não encontrada, ou
+`ErroBuscaJwks` enquanto o JWKS estiver inacessível).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+
+logger = logging.getLogger(__name__)
+
+
+class ErroBuscaJwks(Exception):
+    """O JWKS não pôde ser obtido: servidor inacessível, erro HTTP ou conteúdo inválido."""
+
+
+class GerenciadorJwks:
+    def __init__(
+            self,
+            url: str,
+            ttl_segundos: float,
+            intervalo_minimo_segundos: float,
+            espera_falha_inicial_segundos: float = 1,
+            espera_falha_maxima_segundos: float = 60,
+            timeout_segundos: float = 10,
+            transporte: httpx.AsyncBaseTransport | None = None):
+        self.url = url
+        self.ttl_segundos = ttl_segundos
+        self.intervalo_minimo_segundos = intervalo_minimo_segundos
+        self.espera_falha_inicial_segundos = espera_falha_inicial_segundos
+        self.espera_falha_maxima_segundos = espera_falha_maxima_segundos
+        self.timeout_segundos = timeout_segundos
+        self._transporte = transporte
+        self._chaves: dict[str, Key] = {}
+        self._tentativas = 0
+        self._falhas_seguidas = 0
+        self._ultimo_erro: ErroBuscaJwks | None = None
+        self._ultima_tentativa: float | None = None
+        self._lock = asyncio.Lock()
+        self._tarefa: asyncio.Task | None = None
+
+
+    async def iniciar(self) -> None:
+        """Carrega as chaves antecipadamente e inicia a renovação em segundo plano."""
+        try:
+            async with self._lock:
+                await self._buscar()
+        except ErroBuscaJwks as e:
+            # Não impede a subida da API; a primeira requisição tentará de novo
+            logger.error(f"Erro ao carregar JWKS na inicialização: {e}")
+
+        self._tarefa = asyncio.create_task(self._renovar_periodicamente())
+
+
+    async def encerrar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+
+    async def obter_chave(self, kid: str | None) -> Key | None:
+        """
+        Retorna a chave pública do `kid` informado.
+
+        Para um `kid` desconhecido, busca o JWKS novamente antes de desistir.
+        Requisições simultâneas aguardam a mesma busca. Lança `ErroBuscaJwks`
+        se a busca falhar.
+        """
+        chave = self._chaves.get(kid)
+        if chave is not None:
+            return chave
+
+        await self._atualizar()
+        return self._chaves.get(kid)
+
+
+    def _espera_entre_buscas(self) -> float:
+        if self._falhas_seguidas == 0:
+            return self.intervalo_minimo_segundos
+        return min(
+            self.espera_falha_inicial_segundos * 2 ** (self._falhas_seguidas - 1),
+            self.espera_falha_maxima_segundos,
+        )
+
+
+    async def _atualizar(self) -> None:
+        tentativa = self._tentativas
+        async with self._lock:
+            if self._tentativas == tentativa:
+                if (
+                    self._ultima_tentativa is None
+                    or time.monotonic() - self._ultima_tentativa >= self._espera_entre_buscas()
+                ):
+                    await self._buscar()
+                    return
+                logger.warning("JWKS buscado recentemente; nova busca ignorada")
+
+            # Outra requisição buscou enquanto esta aguardava, ou a última tentativa
+            # foi recente demais: usa o resultado dela
+            if self._ultimo_erro is not None:
+                raise ErroBuscaJwks(str(self._ultimo_erro))
+
+
+    async def _buscar(self) -> None:
+        try:
+            jwks = await self._baixar()
+        except ErroBuscaJwks as e:
+            self._ultimo_erro = e
+            self._falhas_seguidas += 1
+            raise
+        finally:
+            # Contada ao terminar: quem aguardava o lock reaproveita o resultado
+            self._tentativas += 1
+            self._ultima_tentativa = time.monotonic()
+
+        chaves: dict[str, Key] = {}
+        for dados in jwks.get("keys", []):
+            if not isinstance(dados, dict) or dados.get("kty") != "RSA" or dados.get("use", "sig") != "sig":
+                continue
+            try:
+                chaves[dados["kid"]] = jwk.construct(dados, algorithm=dados.get("alg", "RS256"))
+            except (KeyError, JWKError) as e:
+                logger.warning(f"Chave do JWKS ignorada: {e}")
+
+        self._chaves = chaves
+        self._ultimo_erro = None
+        self._falhas_seguidas = 0
+
+
+    async def _baixar(self) -> dict[str, Any]:
+        logger.info(f"Buscando JWKS em {self.url}")
+        try:
+            async with httpx.AsyncClient(transport=self._transporte, timeout=self.timeout_segundos) as cliente:
+                response = await cliente.get(self.url)
+                response.raise_for_status()
+                jwks = response.json()
+        except httpx.HTTPError as e:
+            raise ErroBuscaJwks(f"JWKS inacessível: {e}") from e
+        except ValueError as e:
+            raise ErroBuscaJwks(f"JWKS com JSON inválido: {e}") from e
+
+        if not isinstance(jwks, dict) or not isinstance(jwks.get("keys", []), list):
+            raise ErroBuscaJwks("JWKS sem a lista de chaves 'keys'")
+        return jwks
+
+
+    async def _renovar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_segundos)
+            try:
+                async with self._lock:
+                    await self._buscar()
+            except ErroBuscaJwks as e:
+                # Mantém as chaves atuais até a próxima tentativa
+                logger.error(f"Erro ao renovar JWKS: {e}")
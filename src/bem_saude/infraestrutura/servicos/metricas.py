@@ -0,0 +1,201 @@
+"""
+Métricas da aplicação no formato texto do Prometheus.
+
+Implementação mínima de contadores, medidores e histogramas com rótulos,
+sem dependências externas. As métricas são registradas no `registro`
+global e expostas em `/metrics`.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+
+
+Amostra = tuple[str, dict[str, str], float]
+
+
+def _formatar_rotulos(rotulos: dict[str, str]) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(
+        f'{nome}="{str(valor).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for nome, valor in rotulos.items()
+    )
+    return "{" + pares + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+class Metrica(ABC):
+    tipo = "untyped"
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+
+    def _chave(self, valores: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(valores[rotulo]) for rotulo in self.rotulos)
+
+    @abstractmethod
+    def amostras(self) -> Iterator[Amostra]:
+        ...
+
+    def exportar(self) -> str:
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"]
+        for nome, rotulos, valor in self.amostras():
+            linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}")
+        return "\n".join(linhas)
+
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...] = ()):
+        super().__init__(nome, descricao, rotulos)
+        self._valores: dict[tuple[str, ...], float] = {}
+
+    def incrementar(self, valor: float = 1, **rotulos: str) -> None:
+        chave = self._chave(rotulos)
+        self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def amostras(self) -> Iterator[Amostra]:
+        for chave, valor in self._valores.items():
+            yield self.nome, dict(zip(self.rotulos, chave)), valor
+
+
+class Medidor(Contador):
+    tipo = "gauge"
+
+    def decrementar(self, valor: float = 1, **rotulos: str) -> None:
+        self.incrementar(-valor, **rotulos)
+
+
+class MetricaColetada(Metrica):
+    """Métrica lida de outro componente (pool, cache) no momento da exportação."""
+
+    def __init__(
+            self,
+            nome: str,
+            descricao: str,
+            tipo: str,
+            coletar: Callable[[], Iterable[tuple[dict[str, str], float]]]):
+        super().__init__(nome, descricao)
+        self.tipo = tipo
+        self._coletar = coletar
+
+    def amostras(self) -> Iterator[Amostra]:
+        for rotulos, valor in self._coletar():
+            yield self.nome, rotulos, valor
+
+
+class Histograma(Metrica):
+    tipo = "histogram"
+
+    LIMITES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(
+            self,
+            nome: str,
+            descricao: str,
+            rotulos: tuple[str, ...] = (),
+            limites: tuple[float, ...] = LIMITES_PADRAO):
+        super().__init__(nome, descricao, rotulos)
+        self.limites = tuple(sorted(limites)) + (math.inf,)
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observar(self, valor: float, **rotulos: str) -> None:
+        chave = self._chave(rotulos)
+        serie = self._series.get(chave)
+        if serie is None:
+            # Contagem por faixa, seguida da soma e da contagem total
+            serie = self._series[chave] = [0.0] * (len(self.limites) + 2)
+
+        for indice, limite in enumerate(self.limites):
+            if valor <= limite:
+                serie[indice] += 1
+                break
+        serie[-2] += valor
+        serie[-1] += 1
+
+    def amostras(self) -> Iterator[Amostra]:
+        for chave, serie in self._series.items():
+            rotulos = dict(zip(self.rotulos, chave))
+            acumulado = 0.0
+            for indice, limite in enumerate(self.limites):
+                acumulado += serie[indice]
+                yield f"{self.nome}_bucket", {**rotulos, "le": _formatar_valor(limite)}, acumulado
+            yield f"{self.nome}_sum", rotulos, serie[-2]
+            yield f"{self.nome}_count", rotulos, serie[-1]
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas: dict[str, Metrica] = {}
+
+    def registrar(self, metrica: Metrica) -> Metrica:
+        self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def exportar(self) -> str:
+        return "\n".join(metrica.exportar() for metrica in self._metricas.values()) + "\n"
+
+
+registro = RegistroMetricas()
+
+
+# Métricas HTTP (preenchidas pelo MiddlewareMetricas)
+
+requisicoes_total = registro.registrar(Contador(
+    "bem_saude_http_requisicoes_total",
+    "Requisições HTTP atendidas por rota e status.",
+    ("metodo", "rota", "status"),
+))
+
+duracao_requisicoes = registro.registrar(Histograma(
+    "bem_saude_http_requisicao_duracao_segundos",
+    "Latência das requisições HTTP por rota.",
+    ("metodo", "rota"),
+))
+
+requisicoes_em_andamento = registro.registrar(Medidor(
+    "bem_saude_http_requisicoes_em_andamento",
+    "Requisições HTTP em processamento.",
+))
+
+requisicoes_limitadas = registro.registrar(Contador(
+    "bem_saude_http_requisicoes_limitadas_total",
+    "Requisições recusadas com 429 pelo limite de taxa ou de concorrência.",
+    ("rota", "motivo"),
+))
+
+
+# Banco de dados
+
+checkout_pool = registro.registrar(Histograma(
+    "bem_saude_db_pool_checkout_segundos",
+    "Tempo para obter uma conexão do pool (espera na fila ou abertura de nova conexão).",
+    limites=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+))
+
+
+# Auditoria
+
+eventos_despachados = registro.registrar(Contador(
+    "bem_saude_outbox_eventos_despachados_total",
+    "Eventos de auditoria entregues pelo despachante do outbox.",
+))
+
+
+# Autenticação
+
+validacao_token = registro.registrar(Histograma(
+    "bem_saude_auth_validacao_token_segundos",
+    "Tempo de validação do token JWT por resultado.",
+    ("resultado",),
+    limites=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1),
+))
@@ -0,0 +1,105 @@
+"""
+Configuração comum dos testes.
+
+As configurações da aplicação são lidas na importação do pacote, então o
+ambiente (SQLite temporário, Auth0 de teste, limite desligado) é preparado
+aqui, antes de qualquer `import bem_saude`. Rode a partir da raiz do
+repositório:
+
+    pip install -r src/requirements.txt aiosqlite pytest fakeredis lupa
+    python -m pytest -q tests
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+_TEMPORARIO = Path(tempfile.mkdtemp())
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_TEMPORARIO / 'testes.db'}")
+os.environ.setdefault("OUTBOX_ARQUIVO", str(_TEMPORARIO / "eventos_auditoria.ndjson"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LIMITE_HABILITADO", "false")
+
+from jwks_stub import AUDIENCIA, DOMINIO, ServidorJwks  # noqa: E402
+
+os.environ.setdefault("AUTH0_DOMAIN", DOMINIO)
+os.environ.setdefault("AUTH0_AUDIENCE", AUDIENCIA)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def servidor_jwks():
+    servidor = ServidorJwks()
+    yield servidor
+    servidor.encerrar()
+
+
+_numeros = itertools.count(1)
+
+
+@pytest.fixture
+async def cliente():
+    """Cliente HTTP da aplicação, com o banco criado e a autenticação dispensada."""
+    from bem_saude.api.app import app
+    from bem_saude.api.auth import validar_token
+    from bem_saude.infraestrutura.banco_dados.conexao import async_engine
+    from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+
+    async with async_engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+
+    app.dependency_overrides[validar_token] = lambda: {"sub": "testes|usuario"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testes") as cliente:
+        yield cliente
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def dados_paciente():
+    """Gera os dados de um paciente novo a cada chamada (CPF único)."""
+    from uuid6 import uuid7
+
+    def gerar(**campos) -> dict:
+        numero = next(_numeros)
+        return {
+            "id": uuid7(),
+            "nome": f"Paciente Teste {numero:05d}",
+            "status": "ATIVO",
+            "cpf": f"{90_000_000_000 + numero:011d}",
+            "telefone": "(47)91234-4321",
+            "email": f"paciente{numero}@exemplo.com",
+            "endereco": "Rua dos Caçadores, 191",
+            "data_nascimento": date(1990, 1, 1),
+            "tipo_sanguineo": "O+",
+            "observacoes": "",
+            **campos,
+        }
+
+    return gerar
+
+
+@pytest.fixture
+async def banco_vazio(cliente):
+    """Remove os pacientes e recepcionistas deixados por outros testes (listagens e agregados)."""
+    from sqlalchemy import delete
+
+    from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+    from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+    from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(delete(ModeloPaciente))
+        await sessao.execute(delete(ModeloRecepcionista))
+        await sessao.commit()
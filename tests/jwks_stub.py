@@ -0,0 +1,99 @@
+"""
+Servidor JWKS local para os testes de autenticação.
+
+Serve o JWKS em um servidor HTTP de verdade (em uma thread), com as chaves
+publicadas pelo teste; permite rotacionar chaves e simular falhas (erro
+HTTP, JSON inválido, servidor fora do ar). `EmissorTokens` assina tokens
+RS256 com o domínio e a audiência configurados nos testes.
+
+Não importa o pacote `bem_saude`.
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+
+DOMINIO = "bem-saude-testes.local"
+AUDIENCIA = "bem-saude-api"
+
+
+def _base64url(numero: int) -> str:
+    dados = numero.to_bytes((numero.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode("ascii")
+
+
+class EmissorTokens:
+    def __init__(self, kid: str):
+        self.kid = kid
+        chave_privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        numeros = chave_privada.public_key().public_numbers()
+        self.jwk = {
+            "kty": "RSA",
+            "kid": kid,
+            "use": "sig",
+            "alg": "RS256",
+            "n": _base64url(numeros.n),
+            "e": _base64url(numeros.e),
+        }
+        self._pem = chave_privada.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    def emitir(self, sub: str = "testes|usuario", validade_segundos: int = 3600, **reivindicacoes) -> str:
+        agora = int(time.time())
+        reivindicacoes = {
+            "sub": sub,
+            "aud": AUDIENCIA,
+            "iss": f"https://{DOMINIO}/",
+            "iat": agora,
+            "exp": agora + validade_segundos,
+            **reivindicacoes,
+        }
+        return jwt.encode(reivindicacoes, self._pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+class ServidorJwks:
+    def __init__(self):
+        self.buscas = 0
+        self._status = 200
+        self._corpo = b'{"keys": []}'
+        servidor = self
+
+        class ManipuladorJwks(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.buscas += 1
+                self.send_response(servidor._status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(servidor._corpo)))
+                self.end_headers()
+                self.wfile.write(servidor._corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), ManipuladorJwks)
+        self.url = f"http://127.0.0.1:{self._http.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+    def publicar(self, *emissores: EmissorTokens) -> None:
+        """Passa a servir as chaves públicas dos emissores."""
+        self._status = 200
+        self._corpo = json.dumps({"keys": [emissor.jwk for emissor in emissores]}).encode("utf-8")
+
+    def responder(self, status: int, corpo: bytes) -> None:
+        self._status = status
+        self._corpo = corpo
+
+    def encerrar(self) -> None:
+        """Derruba o servidor: as próximas buscas falham na conexão."""
+        self._http.shutdown()
+        self._http.server_close()
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import insert, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from bem_saude.infraestrutura.banco_dados.ajustes_esquema import AJUSTES, aplicar_ajustes_esquema
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista  # noqa: F401 (tabela no metadata)
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _banco_anterior_ao_indice(tmp_path, dados_paciente, *cpfs):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'anterior.db'}")
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+        await conexao.execute(text("DROP INDEX ux_pacientes_cpf"))
+        await conexao.execute(insert(ModeloPaciente), [dados_paciente(cpf=cpf) for cpf in cpfs])
+    return engine
+
+
+async def _estado(engine):
+    async with engine.connect() as conexao:
+        indices = await conexao.run_sync(lambda sync: {i["name"] for i in inspect(sync).get_indexes("pacientes")})
+        cpfs = sorted((await conexao.execute(text("SELECT cpf FROM pacientes"))).scalars())
+    return indices, cpfs
+
+
+async def test_cria_o_indice_unico_e_normaliza_os_cpfs(tmp_path, dados_paciente):
+    engine = await _banco_anterior_ao_indice(tmp_path, dados_paciente, "123.456.789-09", "98765432100")
+
+    await aplicar_ajustes_esquema(engine)
+    indices, cpfs = await _estado(engine)
+    assert "ux_pacientes_cpf" in indices
+    assert cpfs == ["12345678909", "98765432100"]
+
+    # Já aplicado: nada muda na subida seguinte
+    await aplicar_ajustes_esquema(engine)
+    await engine.dispose()
+
+
+async def test_cpfs_repetidos_mantem_o_banco_como_estava(tmp_path, dados_paciente, caplog):
+    engine = await _banco_anterior_ao_indice(tmp_path, dados_paciente, "123.456.789-09", "12345678909")
+
+    await aplicar_ajustes_esquema(engine)
+    indices, cpfs = await _estado(engine)
+    assert "ux_pacientes_cpf" not in indices
+    assert cpfs == ["123.456.789-09", "12345678909"]
+    assert "ux_pacientes_cpf não aplicado" in caplog.text
+    await engine.dispose()
+
+
+async def test_cria_os_indices_ausentes_em_tabelas_existentes(tmp_path):
+    ajustados = [(tabela, indice) for tabela, indice, comandos in AJUSTES if "sqlite" in comandos]
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'anterior.db'}")
+    async with engine.begin() as conexao:
+        await conexao.run_sync(Base.metadata.create_all)
+        for _, indice in ajustados:
+            await conexao.execute(text(f"DROP INDEX {indice}"))
+
+    await aplicar_ajustes_esquema(engine)
+
+    async with engine.connect() as conexao:
+        for tabela, indice in ajustados:
+            assert indice in await conexao.run_sync(lambda sync: {i["name"] for i in inspect(sync).get_indexes(tabela)})
+    await engine.dispose()
+
+
+def test_todo_indice_dos_modelos_tem_ajuste():
+    # Sem ajuste, um índice novo no modelo só existiria em bancos criados depois dele
+    ajustados = {(tabela, indice) for tabela, indice, _ in AJUSTES}
+    for tabela in ("pacientes", "recepcionistas"):
+        for indice in Base.metadata.tables[tabela].indexes:
+            assert (tabela, indice.name) in ajustados
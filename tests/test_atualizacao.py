@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, insert, select
+from uuid6 import uuid7
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal, async_engine
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+
+pytestmark = pytest.mark.anyio
+
+
+@contextmanager
+def comandos_sql():
+    comandos: list[str] = []
+
+    def registrar(conexao, cursor, comando, parametros, contexto, executemany):
+        comandos.append(" ".join(comando.split()))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", registrar)
+    try:
+        yield comandos
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", registrar)
+
+
+@pytest.fixture
+async def paciente(dados_paciente):
+    registro = dados_paciente(nome="Nome Anterior")
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [registro])
+        await sessao.commit()
+    return registro
+
+
+@pytest.fixture
+async def recepcionista():
+    registro = {"id": uuid7(), "nome": "Recepcionista Anterior", "status": "ATIVO"}
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloRecepcionista), [registro])
+        await sessao.commit()
+    return registro
+
+
+async def _coluna(modelo, coluna, id):
+    async with AsyncSessionLocal() as sessao:
+        return await sessao.scalar(select(getattr(modelo, coluna)).where(modelo.id == id))
+
+
+def _alteracao(paciente, **campos) -> dict:
+    return {**{campo: paciente[campo] for campo in ("nome", "telefone", "email", "endereco", "observacoes")}, **campos}
+
+
+async def test_alteracao_e_um_unico_update_sem_select(cliente, paciente):
+    with comandos_sql() as comandos:
+        resposta = await cliente.put(f"/pacientes/{paciente['id']}", json=_alteracao(paciente, nome="Nome Novo"))
+
+    assert resposta.status_code == 204
+    assert await _coluna(ModeloPaciente, "nome", paciente["id"]) == "Nome Novo"
+    sobre_pacientes = [comando for comando in comandos if " pacientes " in f"{comando} "]
+    assert len(sobre_pacientes) == 1
+    assert sobre_pacientes[0].startswith("UPDATE pacientes SET")
+    assert "RETURNING" in sobre_pacientes[0]
+
+
+@pytest.mark.parametrize("metodo, caminho, status", [
+    ("delete", "", "INATIVO"),
+    ("put", "/ativar", "ATIVO"),
+])
+async def test_inativa_e_ativa(cliente, paciente, metodo, caminho, status):
+    if status == "ATIVO":
+        await cliente.delete(f"/pacientes/{paciente['id']}")
+
+    resposta = await getattr(cliente, metodo)(f"/pacientes/{paciente['id']}{caminho}")
+
+    assert resposta.status_code == 204
+    assert await _coluna(ModeloPaciente, "status", paciente["id"]) == status
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["status"] == status
+
+
+async def test_alteracao_invalida_o_detalhe_em_cache(cliente, paciente):
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["status"] == "ATIVO"
+
+    await cliente.delete(f"/pacientes/{paciente['id']}")
+
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["status"] == "INATIVO"
+
+
+@pytest.mark.parametrize("metodo, caminho, corpo", [
+    ("put", "/pacientes/{id}", {
+        "nome": "Nome Novo", "telefone": "", "email": "", "endereco": "", "observacoes": "",
+    }),
+    ("delete", "/pacientes/{id}", None),
+    ("put", "/pacientes/{id}/ativar", None),
+    ("put", "/recepcionistas/{id}", {"nome": "Nome Novo"}),
+    ("delete", "/recepcionistas/{id}", None),
+    ("put", "/recepcionistas/{id}/ativar", None),
+])
+async def test_id_inexistente_responde_404(cliente, metodo, caminho, corpo):
+    argumentos = {"json": corpo} if corpo is not None else {}
+
+    resposta = await cliente.request(metodo.upper(), caminho.format(id=uuid7()), **argumentos)
+
+    assert resposta.status_code == 404
+
+
+async def test_recepcionista_alterado_inativado_e_ativado(cliente, recepcionista):
+    url = f"/recepcionistas/{recepcionista['id']}"
+
+    assert (await cliente.put(url, json={"nome": "Recepcionista Novo"})).status_code == 204
+    assert (await cliente.delete(url)).status_code == 204
+    assert await _coluna(ModeloRecepcionista, "status", recepcionista["id"]) == "INATIVO"
+    assert (await cliente.put(f"{url}/ativar")).status_code == 204
+
+    detalhe = (await cliente.get(url)).json()
+    assert (detalhe["nome"], detalhe["status"]) == ("Recepcionista Novo", "ATIVO")
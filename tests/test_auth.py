@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from bem_saude.api import auth
+from bem_saude.infraestrutura.servicos.gerenciador_jwks import ErroBuscaJwks, GerenciadorJwks
+from jwks_stub import EmissorTokens
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def gerenciador(servidor_jwks, monkeypatch):
+    gerenciador = GerenciadorJwks(
+        servidor_jwks.url,
+        ttl_segundos=3600,
+        intervalo_minimo_segundos=30,
+        espera_falha_inicial_segundos=0.5,
+        espera_falha_maxima_segundos=1,
+        timeout_segundos=2,
+    )
+    monkeypatch.setattr(auth, "gerenciador_jwks", gerenciador)
+    return gerenciador
+
+
+async def _status_http(token: str) -> int:
+    try:
+        await auth.decodificar_token(token)
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+async def test_valida_token_com_chave_do_jwks(servidor_jwks, gerenciador):
+    emissor = EmissorTokens("chave-1")
+    servidor_jwks.publicar(emissor)
+    await gerenciador.iniciar()
+
+    payload = await auth.decodificar_token(emissor.emitir(sub="testes|valido"))
+
+    assert payload["sub"] == "testes|valido"
+    assert servidor_jwks.buscas == 1
+    await gerenciador.encerrar()
+
+
+async def test_rotacao_de_chave_busca_o_jwks_novamente(servidor_jwks, gerenciador):
+    antiga = EmissorTokens("chave-antiga")
+    servidor_jwks.publicar(antiga)
+    await gerenciador.iniciar()
+    # A rotação chega depois do intervalo mínimo desde a última busca
+    gerenciador.intervalo_minimo_segundos = 0
+
+    nova = EmissorTokens("chave-nova")
+    servidor_jwks.publicar(antiga, nova)
+
+    assert await _status_http(nova.emitir(sub="testes|rotacao")) == 200
+    assert servidor_jwks.buscas == 2
+    assert await _status_http(antiga.emitir(sub="testes|antiga")) == 200
+    assert servidor_jwks.buscas == 2
+    await gerenciador.encerrar()
+
+
+async def test_kid_desconhecido_respeita_intervalo_minimo(servidor_jwks, gerenciador):
+    servidor_jwks.publicar(EmissorTokens("chave-1"))
+    await gerenciador.iniciar()
+
+    desconhecida = EmissorTokens("chave-desconhecida")
+    assert await _status_http(desconhecida.emitir(sub="testes|a")) == 401
+    assert await _status_http(desconhecida.emitir(sub="testes|b")) == 401
+    # Só a busca da inicialização: o JWKS acabou de ser buscado
+    assert servidor_jwks.buscas == 1
+    await gerenciador.encerrar()
+
+
+async def test_jwks_com_json_invalido_responde_503(servidor_jwks, gerenciador):
+    servidor_jwks.responder(200, b"<html>manutencao</html>")
+
+    assert await _status_http(EmissorTokens("chave-1").emitir(sub="testes|json")) == 503
+
+
+async def test_jwks_com_erro_http_responde_503(servidor_jwks, gerenciador):
+    servidor_jwks.responder(500, b"{}")
+
+    assert await _status_http(EmissorTokens("chave-1").emitir(sub="testes|500")) == 503
+
+
+async def test_jwks_inacessivel_responde_503(servidor_jwks, gerenciador):
+    servidor_jwks.encerrar()
+
+    assert await _status_http(EmissorTokens("chave-1").emitir(sub="testes|fora")) == 503
+
+
+async def test_falha_na_inicializacao_nao_bloqueia_nova_busca(servidor_jwks, gerenciador):
+    emissor = EmissorTokens("chave-1")
+    servidor_jwks.responder(503, b"{}")
+    await gerenciador.iniciar()
+
+    # Logo após a falha: indisponível (e não "chave não encontrada"), sem nova busca
+    assert await _status_http(emissor.emitir(sub="testes|boot-1")) == 503
+    assert servidor_jwks.buscas == 1
+
+    # Voltou: passada a espera após a falha, bem antes do intervalo mínimo, a
+    # próxima requisição busca de novo
+    servidor_jwks.publicar(emissor)
+    await asyncio.sleep(0.6)
+    assert await _status_http(emissor.emitir(sub="testes|boot-2")) == 200
+    assert servidor_jwks.buscas == 2
+    await gerenciador.encerrar()
+
+
+async def test_kids_forjados_com_jwks_fora_do_ar_nao_geram_uma_busca_cada(servidor_jwks, gerenciador):
+    emissor = EmissorTokens("chave-1")
+    servidor_jwks.responder(500, b"{}")
+
+    # Uma busca; as requisições seguintes, dentro da espera, reaproveitam a falha
+    for numero in range(10):
+        with pytest.raises(ErroBuscaJwks):
+            await gerenciador.obter_chave(f"kid-forjado-{numero}")
+    assert servidor_jwks.buscas == 1
+
+    # A espera dobra a cada falha seguida (0,5 s, depois 1 s)
+    await asyncio.sleep(0.6)
+    with pytest.raises(ErroBuscaJwks):
+        await gerenciador.obter_chave("kid-forjado-a")
+    assert servidor_jwks.buscas == 2
+
+    await asyncio.sleep(0.6)
+    with pytest.raises(ErroBuscaJwks):
+        await gerenciador.obter_chave("kid-forjado-b")
+    assert servidor_jwks.buscas == 2
+
+    # De volta: depois de um sucesso, vale o intervalo mínimo
+    servidor_jwks.publicar(emissor)
+    await asyncio.sleep(0.5)
+    assert await gerenciador.obter_chave("chave-1") is not None
+    assert await gerenciador.obter_chave("kid-forjado-c") is None
+    assert servidor_jwks.buscas == 3
+
+
+async def test_requisicoes_simultaneas_compartilham_busca_com_falha(servidor_jwks, gerenciador):
+    servidor_jwks.responder(500, b"{}")
+
+    resultados = await asyncio.gather(
+        *(gerenciador.obter_chave(f"kid-{numero}") for numero in range(5)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(resultado, ErroBuscaJwks) for resultado in resultados)
+    assert servidor_jwks.buscas == 1
+
+
+async def test_verificacao_da_assinatura_roda_fora_do_event_loop(servidor_jwks, gerenciador, monkeypatch):
+    emissor = EmissorTokens("chave-thread")
+    servidor_jwks.publicar(emissor)
+    await gerenciador.iniciar()
+
+    threads = []
+    decodificar = auth.jwt.decode
+
+    def decodificar_registrando(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return decodificar(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", decodificar_registrando)
+    assert (await auth.decodificar_token(emissor.emitir(sub="testes|thread")))["sub"] == "testes|thread"
+
+    assert threads and threading.get_ident() not in threads
+    await gerenciador.encerrar()
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _inserir(registros):
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), registros)
+        await sessao.commit()
+
+
+async def _buscar(cliente, q, **parametros) -> list[dict]:
+    resposta = await cliente.get("/pacientes/buscar", params={"q": q, **parametros})
+    assert resposta.status_code == 200
+    return resposta.json()
+
+
+async def test_busca_por_parte_do_nome(cliente, banco_vazio, dados_paciente):
+    await _inserir([
+        dados_paciente(nome="Joana Mendes"),
+        dados_paciente(nome="Mendes Joana"),
+        dados_paciente(nome="Carlos Souza"),
+    ])
+
+    itens = await _buscar(cliente, "mendes")
+
+    assert sorted(item["nome"] for item in itens) == ["Joana Mendes", "Mendes Joana"]
+    # Nomes que começam pelo termo vêm primeiro
+    assert itens[0]["nome"] == "Mendes Joana"
+
+
+async def test_busca_por_cpf_com_ou_sem_pontuacao(cliente, banco_vazio, dados_paciente):
+    await _inserir([
+        dados_paciente(nome="Ana", cpf="12345678910"),
+        dados_paciente(nome="Bruno", cpf="98765432100"),
+    ])
+
+    for termo in ("123.456.789-10", "12345678910", "456.789"):
+        assert [item["nome"] for item in await _buscar(cliente, termo)] == ["Ana"]
+
+
+async def test_busca_pelos_digitos_do_telefone(cliente, banco_vazio, dados_paciente):
+    await _inserir([
+        dados_paciente(nome="Ana", telefone="(47) 99876-5432"),
+        dados_paciente(nome="Bruno", telefone="(11)91111-2222"),
+    ])
+
+    for termo in ("99876-5432", "4799876", "(47) 9987"):
+        assert [item["nome"] for item in await _buscar(cliente, termo)] == ["Ana"]
+
+
+async def test_cpf_exato_tem_prioridade_sobre_o_telefone(cliente, banco_vazio, dados_paciente):
+    await _inserir([
+        dados_paciente(nome="Pelo telefone", telefone="(12) 34567-8910"),
+        dados_paciente(nome="Pelo CPF", cpf="12345678910"),
+    ])
+
+    itens = await _buscar(cliente, "123.456.789-10")
+
+    assert [item["nome"] for item in itens] == ["Pelo CPF", "Pelo telefone"]
+
+
+async def test_curingas_do_like_sao_literais(cliente, banco_vazio, dados_paciente):
+    await _inserir([
+        dados_paciente(nome="Ana 100% Silva"),
+        dados_paciente(nome="Ana 1000 Silva"),
+        dados_paciente(nome="Bruno_Souza"),
+        dados_paciente(nome="Bruno Souza"),
+    ])
+
+    assert [item["nome"] for item in await _buscar(cliente, "0%")] == ["Ana 100% Silva"]
+    assert [item["nome"] for item in await _buscar(cliente, "o_S")] == ["Bruno_Souza"]
+
+
+async def test_limite_e_campos(cliente, banco_vazio, dados_paciente):
+    await _inserir([dados_paciente(nome=f"Silva {numero}") for numero in range(5)])
+
+    itens = await _buscar(cliente, "silva", limite=2, campos="id,nome")
+
+    assert len(itens) == 2
+    assert all(set(item) == {"id", "nome"} for item in itens)
+
+
+@pytest.mark.parametrize("parametros", [{"q": "a"}, {"q": "ana", "limite": 0}, {"q": "ana", "limite": 101}])
+async def test_parametros_invalidos_respondem_422(cliente, parametros):
+    resposta = await cliente.get("/pacientes/buscar", params=parametros)
+
+    assert resposta.status_code == 422
+
+
+async def test_campo_desconhecido_responde_400(cliente):
+    resposta = await cliente.get("/pacientes/buscar", params={"q": "ana", "campos": "senha"})
+
+    assert resposta.status_code == 400
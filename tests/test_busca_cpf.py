@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def paciente(dados_paciente):
+    registro = dados_paciente()
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [registro])
+        await sessao.commit()
+    return registro
+
+
+def _pontuado(cpf: str) -> str:
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+@pytest.mark.parametrize("formatar", [str, _pontuado])
+async def test_encontra_pelo_cpf_com_ou_sem_pontuacao(cliente, paciente, formatar):
+    resposta = await cliente.get(f"/pacientes/cpf/{formatar(paciente['cpf'])}")
+
+    assert resposta.status_code == 200
+    assert resposta.json()["id"] == str(paciente["id"])
+    assert resposta.json()["cpf"] == paciente["cpf"]
+
+
+async def test_cpf_desconhecido_responde_404(cliente):
+    resposta = await cliente.get("/pacientes/cpf/000.000.000-00")
+
+    assert resposta.status_code == 404
+
+
+async def test_responde_304_com_o_mesmo_etag(cliente, paciente):
+    resposta = await cliente.get(f"/pacientes/cpf/{paciente['cpf']}")
+
+    nao_modificado = await cliente.get(
+        f"/pacientes/cpf/{paciente['cpf']}",
+        headers={"If-None-Match": resposta.headers["etag"]},
+    )
+
+    assert nao_modificado.status_code == 304
+    assert nao_modificado.headers["etag"] == resposta.headers["etag"]
+
+
+async def test_cadastro_com_cpf_repetido_responde_409(cliente, paciente):
+    resposta = await cliente.post("/pacientes", json={
+        "nome": "Outro Paciente",
+        "cpf": _pontuado(paciente["cpf"]),
+        "telefone": "(47)91234-4321",
+        "email": "outro@exemplo.com",
+        "endereco": "Rua A, 1",
+        "data_nascimento": "1990-01-01",
+        "tipo_sanguineo": "O+",
+        "observacoes": "",
+    })
+
+    assert resposta.status_code == 409
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.cache.cache_memoria import CacheMemoria
+from bem_saude.infraestrutura.cache.cache_redis import CacheRedis
+from bem_saude.infraestrutura.cache.gerenciador_cache import cache as cache_aplicacao
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memoria", "redis"])
+async def cache(request):
+    if request.param == "memoria":
+        yield CacheMemoria(tamanho_maximo=100, ttl_segundos=60)
+        return
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    cache = CacheRedis(fakeredis.FakeAsyncRedis(), ttl_segundos=60)
+    yield cache
+    await cache.fechar()
+
+
+async def test_guarda_e_remove(cache):
+    await cache.definir("paciente:1", b"corpo", await cache.geracao("paciente:1"))
+
+    assert await cache.obter("paciente:1") == b"corpo"
+    await cache.remover("paciente:1")
+    assert await cache.obter("paciente:1") is None
+    assert (cache.acertos, cache.falhas) == (1, 1)
+
+
+async def test_preenchimento_apos_invalidacao_e_descartado(cache):
+    geracao = await cache.geracao("paciente:1")
+    # Alteração concorrente: invalidada entre a leitura do banco e o preenchimento
+    await cache.remover("paciente:1")
+    await cache.definir("paciente:1", b"versao anterior", geracao)
+
+    assert await cache.obter("paciente:1") is None
+
+    await cache.definir("paciente:1", b"versao nova", await cache.geracao("paciente:1"))
+    assert await cache.obter("paciente:1") == b"versao nova"
+
+
+async def test_redis_indisponivel_nao_derruba_a_requisicao():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    servidor = fakeredis.FakeServer()
+    cache = CacheRedis(fakeredis.FakeAsyncRedis(server=servidor), ttl_segundos=60)
+    servidor.connected = False
+
+    assert await cache.obter("paciente:1") is None
+    geracao = await cache.geracao("paciente:1")
+    await cache.definir("paciente:1", b"corpo", geracao)
+    await cache.remover("paciente:1")
+
+    # De volta: o preenchimento com a geração lida durante a queda é descartado
+    servidor.connected = True
+    await cache.definir("paciente:1", b"corpo", geracao)
+    assert await cache.obter("paciente:1") is None
+
+
+async def test_alteracao_invalida_o_detalhe(cliente, dados_paciente):
+    paciente = dados_paciente(nome="Nome Anterior")
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [paciente])
+        await sessao.commit()
+
+    resposta = await cliente.get(f"/pacientes/{paciente['id']}")
+    assert resposta.json()["nome"] == "Nome Anterior"
+    assert await cache_aplicacao.obter(RepositorioPaciente.chave_cache(paciente["id"])) is not None
+
+    alteracao = {campo: paciente[campo] for campo in ("telefone", "email", "endereco", "observacoes")}
+    resposta = await cliente.put(f"/pacientes/{paciente['id']}", json={**alteracao, "nome": "Nome Novo"})
+    assert resposta.status_code == 204
+
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["nome"] == "Nome Novo"
+
+
+async def test_leitura_concorrente_com_alteracao_nao_regrava_o_valor_anterior(cliente, dados_paciente, monkeypatch):
+    paciente = dados_paciente(nome="Nome Anterior")
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [paciente])
+        await sessao.commit()
+
+    buscar_por_id = RepositorioPaciente.buscar_por_id
+
+    async def buscar_e_alterar_em_seguida(self, id):
+        # A leitura termina com o valor anterior; a alteração é confirmada e
+        # invalida o cache antes de a rota guardar o corpo lido
+        encontrado = await buscar_por_id(self, id)
+        async with AsyncSessionLocal() as outra_sessao:
+            repositorio = RepositorioPaciente(sessao=outra_sessao, cache=cache_aplicacao)
+            await repositorio.editar(id, "Nome Novo", paciente["telefone"], paciente["endereco"], "", paciente["email"])
+        return encontrado
+
+    monkeypatch.setattr(RepositorioPaciente, "buscar_por_id", buscar_e_alterar_em_seguida)
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["nome"] == "Nome Anterior"
+    monkeypatch.undo()
+
+    assert await cache_aplicacao.obter(RepositorioPaciente.chave_cache(paciente["id"])) is None
+    assert (await cliente.get(f"/pacientes/{paciente['id']}")).json()["nome"] == "Nome Novo"
@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import insert
+from uuid6 import uuid7
+
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def paciente(dados_paciente):
+    registro = dados_paciente()
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [registro])
+        await sessao.commit()
+    return registro
+
+
+def _alteracao(paciente, **campos) -> dict:
+    return {**{campo: paciente[campo] for campo in ("nome", "telefone", "email", "endereco", "observacoes")}, **campos}
+
+
+async def _condicional(cliente, url, etag, **parametros):
+    return await cliente.get(url, params=parametros, headers={"If-None-Match": etag})
+
+
+async def test_listagem_responde_304_sem_consultar_os_pacientes(cliente, paciente, monkeypatch):
+    resposta = await cliente.get("/pacientes", params={"limite": 5})
+    assert resposta.headers["cache-control"] == configuracoes.HTTP_CACHE_CONTROL
+
+    async def listar(*args, **kwargs):
+        raise AssertionError("a listagem não deveria ser consultada")
+
+    monkeypatch.setattr(RepositorioPaciente, "listar", listar)
+    nao_modificado = await _condicional(cliente, "/pacientes", resposta.headers["etag"], limite=5)
+
+    assert nao_modificado.status_code == 304
+    assert nao_modificado.content == b""
+    assert nao_modificado.headers["etag"] == resposta.headers["etag"]
+
+
+async def test_etag_da_listagem_muda_com_a_url(cliente, paciente):
+    primeira = await cliente.get("/pacientes", params={"limite": 5})
+    filtrada = await cliente.get("/pacientes", params={"limite": 5, "status": "ATIVO"})
+
+    assert primeira.headers["etag"] != filtrada.headers["etag"]
+    resposta = await _condicional(cliente, "/pacientes", primeira.headers["etag"], limite=5, status="ATIVO")
+    assert resposta.status_code == 200
+
+
+@pytest.mark.parametrize("escrita", ["editar", "inativar", "criar"])
+async def test_escrita_muda_o_etag_da_listagem(cliente, paciente, dados_paciente, escrita):
+    etag = (await cliente.get("/pacientes")).headers["etag"]
+
+    if escrita == "editar":
+        await cliente.put(f"/pacientes/{paciente['id']}", json=_alteracao(paciente, nome="Nome Novo"))
+    elif escrita == "inativar":
+        await cliente.delete(f"/pacientes/{paciente['id']}")
+    else:
+        novo = {**dados_paciente(), "data_nascimento": "1990-01-01"}
+        del novo["id"]
+        assert (await cliente.post("/pacientes", json=novo)).status_code == 201
+
+    resposta = await _condicional(cliente, "/pacientes", etag)
+    assert resposta.status_code == 200
+    assert resposta.headers["etag"] != etag
+
+
+async def test_escrita_em_recepcionistas_nao_muda_o_etag_de_pacientes(cliente, paciente):
+    etag = (await cliente.get("/pacientes")).headers["etag"]
+    recepcionista = {"id": uuid7(), "nome": "Recepcionista", "status": "ATIVO"}
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloRecepcionista), [recepcionista])
+        await sessao.commit()
+    etag_recepcionistas = (await cliente.get("/recepcionistas")).headers["etag"]
+
+    await cliente.delete(f"/recepcionistas/{recepcionista['id']}")
+
+    assert (await _condicional(cliente, "/pacientes", etag)).status_code == 304
+    assert (await _condicional(cliente, "/recepcionistas", etag_recepcionistas)).status_code == 200
+
+
+async def test_detalhe_responde_304_e_muda_com_a_alteracao(cliente, paciente):
+    url = f"/pacientes/{paciente['id']}"
+    etag = (await cliente.get(url)).headers["etag"]
+
+    assert (await _condicional(cliente, url, etag)).status_code == 304
+
+    await cliente.put(url, json=_alteracao(paciente, nome="Nome Novo"))
+
+    resposta = await _condicional(cliente, url, etag)
+    assert resposta.status_code == 200
+    assert resposta.json()["nome"] == "Nome Novo"
+    assert resposta.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("if_none_match", ["W/{etag}", '"outro", {etag}', "*"])
+async def test_if_none_match_com_etag_fraco_lista_ou_curinga(cliente, paciente, if_none_match):
+    url = f"/pacientes/{paciente['id']}"
+    # Sem compressão negociada o ETag é forte
+    etag = (await cliente.get(url, headers={"Accept-Encoding": "identity"})).headers["etag"]
+    assert not etag.startswith("W/")
+
+    resposta = await cliente.get(url, headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert resposta.status_code == 304
+
+
+async def test_detalhe_de_recepcionista_responde_304(cliente):
+    recepcionista = {"id": uuid7(), "nome": "Recepcionista", "status": "ATIVO"}
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloRecepcionista), [recepcionista])
+        await sessao.commit()
+    url = f"/recepcionistas/{recepcionista['id']}"
+    etag = (await cliente.get(url)).headers["etag"]
+
+    assert (await _condicional(cliente, url, etag)).status_code == 304
+    assert (await _condicional(cliente, url, '"outro"')).status_code == 200
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("accept_encoding, comprimida", [("gzip", True), ("identity", False)])
+async def test_304_leva_o_mesmo_etag_da_resposta_completa(cliente, dados_paciente, accept_encoding, comprimida):
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [dados_paciente() for _ in range(20)])
+        await sessao.commit()
+
+    cabecalhos = {"Accept-Encoding": accept_encoding}
+    completa = await cliente.get("/pacientes", params={"limite": 20}, headers=cabecalhos)
+    assert completa.status_code == 200
+    assert (completa.headers.get("content-encoding") == "gzip") is comprimida
+    assert completa.headers["etag"].startswith("W/") is comprimida
+
+    nao_modificada = await cliente.get(
+        "/pacientes",
+        params={"limite": 20},
+        headers={**cabecalhos, "If-None-Match": completa.headers["etag"]},
+    )
+    assert nao_modificada.status_code == 304
+    assert nao_modificada.headers["etag"] == completa.headers["etag"]
+    assert "accept-encoding" in nao_modificada.headers["vary"].lower()
+
+
+@pytest.mark.parametrize("accept_encoding, fraco", [("gzip", True), ("identity", False)])
+async def test_corpo_pequeno_sem_compressao_mantem_o_etag_no_304(cliente, dados_paciente, accept_encoding, fraco):
+    paciente = dados_paciente()
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [paciente])
+        await sessao.commit()
+
+    cabecalhos = {"Accept-Encoding": accept_encoding}
+    completa = await cliente.get(f"/pacientes/{paciente['id']}", headers=cabecalhos)
+    assert completa.status_code == 200
+    assert len(completa.content) < 1024
+    assert "content-encoding" not in completa.headers
+    assert completa.headers["etag"].startswith("W/") is fraco
+
+    nao_modificada = await cliente.get(
+        f"/pacientes/{paciente['id']}",
+        headers={**cabecalhos, "If-None-Match": completa.headers["etag"]},
+    )
+    assert nao_modificada.status_code == 304
+    assert nao_modificada.headers["etag"] == completa.headers["etag"]
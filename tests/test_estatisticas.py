@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.repositorios.repositorio_versao_tabela import RepositorioVersaoTabela
+from bem_saude.infraestrutura.servicos.atualizador_estatisticas import AtualizadorEstatisticas
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _cadastrar(pacientes):
+    # Direto na tabela, com o incremento de versão que os repositórios fazem
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), pacientes)
+        await RepositorioVersaoTabela(sessao).incrementar(ModeloPaciente.__tablename__)
+        await sessao.commit()
+
+
+async def test_resumo_por_status_tipo_sanguineo_e_faixa_etaria(cliente, banco_vazio, dados_paciente):
+    hoje = date.today()
+    await _cadastrar([
+        dados_paciente(tipo_sanguineo="O+", data_nascimento=hoje.replace(year=hoje.year - 10)),
+        dados_paciente(tipo_sanguineo="O+", data_nascimento=date(1990, 1, 1), status="INATIVO"),
+        dados_paciente(tipo_sanguineo="A-", data_nascimento=date(1940, 1, 1)),
+    ])
+
+    assert await AtualizadorEstatisticas(AsyncSessionLocal).atualizar()
+    estatisticas = (await cliente.get("/pacientes/estatisticas")).json()
+
+    assert estatisticas["total"] == 3
+    assert estatisticas["por_status"] == {"ATIVO": 2, "INATIVO": 1}
+    assert estatisticas["por_tipo_sanguineo"] == {"O+": 2, "A-": 1}
+    assert estatisticas["por_faixa_etaria"] == {"0-17": 1, "18-29": 0, "30-44": 1, "45-59": 0, "60+": 1}
+    assert estatisticas["atualizado_em"] is not None
+
+
+async def test_cada_mudanca_gera_um_unico_recalculo_entre_os_workers(cliente, banco_vazio, dados_paciente):
+    paciente = dados_paciente()
+    await _cadastrar([paciente])
+    workers = [AtualizadorEstatisticas(AsyncSessionLocal) for _ in range(3)]
+
+    assert [await worker.atualizar() for worker in workers] == [True, False, False]
+
+    # Sem mudança: nenhum recálculo
+    assert [await worker.atualizar() for worker in workers] == [False, False, False]
+
+    # Uma alteração pela API: o próximo a rodar recalcula, os demais não
+    assert (await cliente.delete(f"/pacientes/{paciente['id']}")).status_code == 204
+    assert [await worker.atualizar() for worker in reversed(workers)] == [True, False, False]
+    assert (await cliente.get("/pacientes/estatisticas")).json()["por_status"] == {"INATIVO": 1}
+
+
+async def test_resposta_tem_etag_e_responde_304(cliente, banco_vazio, dados_paciente):
+    await _cadastrar([dados_paciente()])
+    await AtualizadorEstatisticas(AsyncSessionLocal).atualizar()
+
+    resposta = await cliente.get("/pacientes/estatisticas")
+    repetida = await cliente.get("/pacientes/estatisticas", headers={"If-None-Match": resposta.headers["etag"]})
+
+    assert repetida.status_code == 304
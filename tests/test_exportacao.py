@@ -0,0 +1,68 @@
+import csv
+import io
+
+import orjson
+import pytest
+from sqlalchemy import insert
+
+from bem_saude.api.rotas import paciente_rotas
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pacientes(banco_vazio, dados_paciente, monkeypatch):
+    # Lotes pequenos: a exportação atravessa vários lotes do cursor
+    monkeypatch.setattr(paciente_rotas, "TAMANHO_LOTE", 2)
+    registros = [dados_paciente() for _ in range(4)]
+    registros.append(dados_paciente(nome='Maria "Mariá", da Silva', observacoes="linha 1\nlinha 2"))
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), registros)
+        await sessao.commit()
+    return registros
+
+
+async def test_exporta_ndjson_em_ordem_de_id(cliente, pacientes):
+    resposta = await cliente.get("/pacientes/exportar", params={"formato": "ndjson"})
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"] == "application/x-ndjson"
+    assert resposta.headers["content-disposition"] == 'attachment; filename="pacientes.ndjson"'
+    linhas = [orjson.loads(linha) for linha in resposta.content.splitlines()]
+    assert [linha["id"] for linha in linhas] == sorted(str(p["id"]) for p in pacientes)
+    assert linhas[-1]["observacoes"] == "linha 1\nlinha 2"
+
+
+async def test_exporta_csv_com_cabecalho_e_campos_escapados(cliente, pacientes):
+    resposta = await cliente.get("/pacientes/exportar", params={"formato": "csv"})
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"] == "text/csv; charset=utf-8"
+    linhas = list(csv.DictReader(io.StringIO(resposta.text)))
+    assert len(linhas) == len(pacientes)
+    assert linhas[-1]["nome"] == 'Maria "Mariá", da Silva'
+    assert linhas[-1]["observacoes"] == "linha 1\nlinha 2"
+    assert linhas[0]["cpf"] == pacientes[0]["cpf"]
+
+
+async def test_exporta_comprimido_em_streaming(cliente, pacientes):
+    resposta = await cliente.get(
+        "/pacientes/exportar",
+        params={"formato": "ndjson"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert resposta.headers["content-encoding"] == "gzip"
+    assert len(resposta.content.splitlines()) == len(pacientes)
+
+
+@pytest.mark.parametrize("formato, esperado", [("ndjson", ""), ("csv", "id,")])
+async def test_cadastro_vazio(cliente, banco_vazio, formato, esperado):
+    resposta = await cliente.get("/pacientes/exportar", params={"formato": formato})
+
+    assert resposta.status_code == 200
+    assert resposta.text.startswith(esperado)
+    assert len(resposta.text.splitlines()) == (0 if formato == "ndjson" else 1)
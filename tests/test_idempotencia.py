@@ -0,0 +1,147 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from bem_saude.api.app import app
+from bem_saude.api.auth import validar_token
+from bem_saude.api.configuracoes import configuracoes
+from bem_saude.api.idempotencia import CABECALHO_REPETIDA, Idempotencia
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _novo_paciente(dados_paciente) -> dict:
+    paciente = {**dados_paciente(), "data_nascimento": "1990-01-01"}
+    del paciente["id"]
+    return paciente
+
+
+async def _quantidade(modelo, *condicoes) -> int:
+    async with AsyncSessionLocal() as sessao:
+        return await sessao.scalar(select(func.count()).select_from(modelo).where(*condicoes))
+
+
+async def _criar(cliente, url, corpo, chave):
+    return await cliente.post(url, json=corpo, headers={"Idempotency-Key": chave})
+
+
+@pytest.fixture
+def corrida_perdida(monkeypatch):
+    """
+    A verificação da chave não encontra nada, como se a outra requisição com a
+    mesma chave ainda não tivesse confirmado: o conflito aparece só no commit.
+    """
+    resposta_repetida = Idempotencia.resposta_repetida
+
+    async def verificar_antes_da_outra(self, dados):
+        await resposta_repetida(self, dados)
+        return None
+
+    monkeypatch.setattr(Idempotencia, "resposta_repetida", verificar_antes_da_outra)
+
+
+async def test_repeticao_devolve_a_primeira_resposta(cliente, dados_paciente):
+    paciente, chave = _novo_paciente(dados_paciente), str(uuid4())
+
+    primeira = await _criar(cliente, "/pacientes", paciente, chave)
+    repetida = await _criar(cliente, "/pacientes", paciente, chave)
+
+    assert primeira.status_code == repetida.status_code == 201
+    assert CABECALHO_REPETIDA not in primeira.headers
+    assert repetida.headers[CABECALHO_REPETIDA] == "true"
+    assert repetida.json() == primeira.json()
+    assert await _quantidade(ModeloPaciente, ModeloPaciente.cpf == paciente["cpf"]) == 1
+
+
+async def test_mesma_chave_com_outro_corpo_responde_422(cliente, dados_paciente):
+    chave = str(uuid4())
+    await _criar(cliente, "/pacientes", _novo_paciente(dados_paciente), chave)
+    outro = _novo_paciente(dados_paciente)
+
+    resposta = await _criar(cliente, "/pacientes", outro, chave)
+
+    assert resposta.status_code == 422
+    assert await _quantidade(ModeloPaciente, ModeloPaciente.cpf == outro["cpf"]) == 0
+
+
+async def test_sem_chave_cada_requisicao_cadastra(cliente):
+    antes = await _quantidade(ModeloRecepcionista)
+
+    for _ in range(2):
+        assert (await cliente.post("/recepcionistas", json={"nome": "Recepcionista Sem Chave"})).status_code == 201
+
+    assert await _quantidade(ModeloRecepcionista) == antes + 2
+
+
+async def test_chave_separada_por_rota_e_por_usuario(cliente, dados_paciente):
+    chave = str(uuid4())
+    paciente = (await _criar(cliente, "/pacientes", _novo_paciente(dados_paciente), chave)).json()
+
+    recepcionista = await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Nova"}, chave)
+    assert recepcionista.status_code == 201
+    assert CABECALHO_REPETIDA not in recepcionista.headers
+
+    app.dependency_overrides[validar_token] = lambda: {"sub": "testes|outro-usuario"}
+    outro_usuario = await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Nova"}, chave)
+    assert CABECALHO_REPETIDA not in outro_usuario.headers
+    assert outro_usuario.json()["id"] not in (paciente["id"], recepcionista.json()["id"])
+
+
+async def test_chave_expirada_volta_a_cadastrar(cliente, monkeypatch):
+    monkeypatch.setattr(configuracoes, "IDEMPOTENCIA_TTL_SEGUNDOS", 0)
+    chave = str(uuid4())
+
+    primeira = await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Expirada"}, chave)
+    segunda = await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Expirada"}, chave)
+
+    assert segunda.status_code == 201
+    assert CABECALHO_REPETIDA not in segunda.headers
+    assert segunda.json()["id"] != primeira.json()["id"]
+
+
+async def test_corrida_perdida_no_cpf_devolve_a_resposta_da_vencedora(cliente, dados_paciente, corrida_perdida):
+    paciente, chave = _novo_paciente(dados_paciente), str(uuid4())
+    vencedora = await _criar(cliente, "/pacientes", paciente, chave)
+
+    perdedora = await _criar(cliente, "/pacientes", paciente, chave)
+
+    assert perdedora.status_code == 201
+    assert perdedora.headers[CABECALHO_REPETIDA] == "true"
+    assert perdedora.json() == vencedora.json()
+    assert await _quantidade(ModeloPaciente, ModeloPaciente.cpf == paciente["cpf"]) == 1
+
+
+async def test_corrida_perdida_na_chave_devolve_a_resposta_da_vencedora(cliente, corrida_perdida):
+    # Recepcionistas não têm campo único: o conflito é o da própria chave
+    nome, chave = f"Recepcionista {uuid4()}", str(uuid4())
+    vencedora = await _criar(cliente, "/recepcionistas", {"nome": nome}, chave)
+
+    perdedora = await _criar(cliente, "/recepcionistas", {"nome": nome}, chave)
+
+    assert perdedora.headers[CABECALHO_REPETIDA] == "true"
+    assert perdedora.json() == vencedora.json()
+    assert await _quantidade(ModeloRecepcionista, ModeloRecepcionista.nome == nome) == 1
+
+
+async def test_corrida_perdida_com_outro_corpo_responde_422(cliente, corrida_perdida):
+    chave = str(uuid4())
+    await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Vencedora"}, chave)
+
+    perdedora = await _criar(cliente, "/recepcionistas", {"nome": "Recepcionista Perdedora"}, chave)
+
+    assert perdedora.status_code == 422
+    assert await _quantidade(ModeloRecepcionista, ModeloRecepcionista.nome == "Recepcionista Perdedora") == 0
+
+
+async def test_cpf_repetido_com_outra_chave_responde_409(cliente, dados_paciente, corrida_perdida):
+    paciente = _novo_paciente(dados_paciente)
+    await _criar(cliente, "/pacientes", paciente, str(uuid4()))
+
+    resposta = await _criar(cliente, "/pacientes", paciente, str(uuid4()))
+
+    assert resposta.status_code == 409
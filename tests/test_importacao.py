@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import insert, select
+
+from bem_saude.api.rotas import paciente_rotas
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def lotes_pequenos(monkeypatch):
+    # Lotes de 2 registros: a importação grava vários lotes e repete CPFs entre eles
+    monkeypatch.setattr(paciente_rotas, "TAMANHO_LOTE_IMPORTACAO", 2)
+
+
+def _registro(dados_paciente, **campos) -> dict:
+    registro = {**dados_paciente(**campos), "data_nascimento": "1990-01-01"}
+    del registro["id"]
+    return registro
+
+
+def _ndjson(*linhas) -> bytes:
+    return "\n".join(linha if isinstance(linha, str) else json.dumps(linha) for linha in linhas).encode("utf-8")
+
+
+async def _cpfs_gravados(cpfs) -> list[str]:
+    async with AsyncSessionLocal() as sessao:
+        return list(await sessao.scalars(select(ModeloPaciente.cpf).where(ModeloPaciente.cpf.in_(cpfs))))
+
+
+async def test_importa_ndjson_e_relata_erros_por_linha(cliente, dados_paciente):
+    ja_cadastrado = dados_paciente()
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloPaciente), [ja_cadastrado])
+        await sessao.commit()
+    validos = [_registro(dados_paciente) for _ in range(3)]
+    cpf_pontuado = validos[0]["cpf"]
+    cpf_pontuado = f"{cpf_pontuado[:3]}.{cpf_pontuado[3:6]}.{cpf_pontuado[6:9]}-{cpf_pontuado[9:]}"
+
+    corpo = _ndjson(
+        validos[0],
+        "{nao e json",
+        validos[1],
+        "",
+        {**_registro(dados_paciente), "nome": "A"},
+        {**_registro(dados_paciente), "cpf": cpf_pontuado},
+        validos[2],
+        {**_registro(dados_paciente), "cpf": ja_cadastrado["cpf"]},
+        "[1, 2]",
+    )
+    resposta = await cliente.post("/pacientes/lote", params={"formato": "ndjson"}, content=corpo)
+
+    assert resposta.status_code == 200
+    relatorio = resposta.json()
+    assert relatorio["inseridos"] == 3
+    assert relatorio["total_erros"] == 5
+    assert sorted(erro["linha"] for erro in relatorio["erros"]) == [2, 5, 6, 8, 9]
+    mensagens = {erro["linha"]: erro["mensagem"] for erro in relatorio["erros"]}
+    assert mensagens[2].startswith("JSON inválido")
+    assert mensagens[5].startswith("nome:")
+    assert mensagens[6] == mensagens[8] == "CPF já cadastrado"
+    assert sorted(await _cpfs_gravados([r["cpf"] for r in validos])) == sorted(r["cpf"] for r in validos)
+
+
+async def test_cpf_repetido_no_mesmo_lote_grava_o_primeiro(cliente, dados_paciente):
+    primeiro = _registro(dados_paciente)
+    repetido = {**_registro(dados_paciente), "cpf": primeiro["cpf"]}
+
+    resposta = await cliente.post("/pacientes/lote", content=_ndjson(primeiro, repetido))
+
+    assert resposta.json() == {
+        "inseridos": 1,
+        "total_erros": 1,
+        "erros": [{"linha": 2, "mensagem": "CPF já cadastrado"}],
+    }
+    async with AsyncSessionLocal() as sessao:
+        nome = await sessao.scalar(select(ModeloPaciente.nome).where(ModeloPaciente.cpf == primeiro["cpf"]))
+    assert nome == primeiro["nome"]
+
+
+async def test_importa_csv_com_cabecalho(cliente, dados_paciente):
+    registros = [_registro(dados_paciente, observacoes="alergia a dipirona, penicilina") for _ in range(3)]
+    saida = io.StringIO()
+    escritor = csv.DictWriter(saida, fieldnames=list(registros[0]))
+    escritor.writeheader()
+    escritor.writerows(registros)
+    saida.write("so,tres,colunas\r\n")
+
+    resposta = await cliente.post(
+        "/pacientes/lote",
+        params={"formato": "csv"},
+        content=saida.getvalue().encode("utf-8"),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    relatorio = resposta.json()
+    assert relatorio["inseridos"] == 3
+    assert relatorio["erros"] == [{"linha": 5, "mensagem": f"Esperadas {len(registros[0])} colunas, encontradas 3"}]
+    async with AsyncSessionLocal() as sessao:
+        observacoes = await sessao.scalar(
+            select(ModeloPaciente.observacoes).where(ModeloPaciente.cpf == registros[0]["cpf"])
+        )
+    assert observacoes == "alergia a dipirona, penicilina"
+
+
+async def test_corpo_vazio_nao_insere_nada(cliente):
+    resposta = await cliente.post("/pacientes/lote", content=b"")
+
+    assert resposta.json() == {"inseridos": 0, "total_erros": 0, "erros": []}
@@ -0,0 +1,108 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from pydantic import ValidationError
+
+from bem_saude.api import auth
+from bem_saude.api.configuracoes import Configuracoes
+from bem_saude.api.middlewares.limite_requisicoes import MiddlewareLimiteRequisicoes
+from bem_saude.infraestrutura.limitador.limitador_memoria import LimitadorMemoria
+from bem_saude.infraestrutura.limitador.limitador_redis import LimitadorRedis
+from bem_saude.infraestrutura.servicos.gerenciador_jwks import GerenciadorJwks
+from jwks_stub import EmissorTokens
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memoria", "redis"])
+async def limitador(request):
+    if request.param == "memoria":
+        yield LimitadorMemoria()
+        return
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    limitador = LimitadorRedis(fakeredis.FakeAsyncRedis())
+    yield limitador
+    await limitador.fechar()
+
+
+async def test_taxa_permite_a_rajada_e_depois_pede_espera(limitador):
+    assert await limitador.consumir("cliente|GET /pacientes", taxa=0.5, rajada=2) == 0
+    assert await limitador.consumir("cliente|GET /pacientes", taxa=0.5, rajada=2) == 0
+
+    espera = await limitador.consumir("cliente|GET /pacientes", taxa=0.5, rajada=2)
+    assert 1 < espera <= 2
+    # Cada cliente e rota tem o seu balde
+    assert await limitador.consumir("outro|GET /pacientes", taxa=0.5, rajada=2) == 0
+
+
+async def test_concorrencia_limita_as_requisicoes_em_andamento(limitador):
+    assert await limitador.entrar("cliente|GET /pacientes", maximo=2)
+    assert await limitador.entrar("cliente|GET /pacientes", maximo=2)
+    assert not await limitador.entrar("cliente|GET /pacientes", maximo=2)
+
+    await limitador.sair("cliente|GET /pacientes")
+    assert await limitador.entrar("cliente|GET /pacientes", maximo=2)
+
+
+async def test_redis_indisponivel_deixa_a_requisicao_passar():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    servidor = fakeredis.FakeServer()
+    limitador = LimitadorRedis(fakeredis.FakeAsyncRedis(server=servidor))
+    servidor.connected = False
+
+    assert await limitador.consumir("cliente|GET /pacientes", taxa=0.5, rajada=1) == 0
+    assert await limitador.entrar("cliente|GET /pacientes", maximo=1)
+    await limitador.sair("cliente|GET /pacientes")
+
+
+@pytest.mark.parametrize("limite", [{"taxa": 0}, {"rajada": 0}, {"concorrencia": 0}, {"taxa_maxima": 1}])
+def test_limite_invalido_e_recusado_na_configuracao(limite):
+    with pytest.raises(ValidationError):
+        Configuracoes(LIMITE_ROTAS={"GET /pacientes": limite})
+
+
+@pytest.fixture
+def app_limitada(servidor_jwks, monkeypatch):
+    gerenciador = GerenciadorJwks(servidor_jwks.url, ttl_segundos=3600, intervalo_minimo_segundos=30, timeout_segundos=2)
+    monkeypatch.setattr(auth, "gerenciador_jwks", gerenciador)
+
+    app = FastAPI()
+
+    @app.get("/recurso")
+    async def recurso(payload: dict = Depends(auth.validar_token)):
+        return {"sub": payload["sub"]}
+
+    app.add_middleware(MiddlewareLimiteRequisicoes, limitador=LimitadorMemoria(), rotas=app.routes)
+    return app
+
+
+async def _get(app, token: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testes") as cliente:
+        return await cliente.get("/recurso", headers={"Authorization": f"Bearer {token}"})
+
+
+async def test_token_invalido_e_validado_uma_vez(servidor_jwks, app_limitada, caplog):
+    emissor = EmissorTokens("chave-1")
+    servidor_jwks.publicar(emissor)
+
+    with caplog.at_level(logging.WARNING, logger=auth.logger.name):
+        resposta = await _get(app_limitada, emissor.emitir(sub="testes|limite", aud="outra-api"))
+
+    assert resposta.status_code == 401
+    assert sum("Erro ao validar token JWT" in registro.message for registro in caplog.records) == 1
+
+
+async def test_token_valido_chega_a_rota(servidor_jwks, app_limitada):
+    emissor = EmissorTokens("chave-1")
+    servidor_jwks.publicar(emissor)
+
+    resposta = await _get(app_limitada, emissor.emitir(sub="testes|limite"))
+
+    assert resposta.status_code == 200
+    assert resposta.json() == {"sub": "testes|limite"}
@@ -0,0 +1,165 @@
+import anyio
+import orjson
+import pytest
+from sqlalchemy import delete, insert, select
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_evento_outbox import ModeloEventoOutbox
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.servicos.despachante_eventos import (
+    DespachanteEventos,
+    DestinoArquivo,
+    DestinoEventos,
+    DestinoFila,
+)
+
+
+pytestmark = pytest.mark.anyio
+
+
+class DestinoInstavel(DestinoFila):
+    """Fila que recusa as primeiras `falhas` entregas."""
+
+    def __init__(self, falhas: int):
+        super().__init__()
+        self.falhas = falhas
+
+    async def enviar(self, eventos):
+        if self.falhas:
+            self.falhas -= 1
+            raise ConnectionError("destino indisponível")
+        await super().enviar(eventos)
+
+
+@pytest.fixture
+async def outbox_vazio(cliente):
+    """Remove os eventos deixados por outros testes."""
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(delete(ModeloEventoOutbox))
+        await sessao.commit()
+
+
+async def _eventos() -> list[tuple]:
+    async with AsyncSessionLocal() as sessao:
+        linhas = await sessao.execute(
+            select(ModeloEventoOutbox.entidade, ModeloEventoOutbox.entidade_id, ModeloEventoOutbox.tipo, ModeloEventoOutbox.dados)
+            .order_by(ModeloEventoOutbox.id)
+        )
+        return [tuple(linha) for linha in linhas]
+
+
+def _novo_paciente(dados_paciente) -> dict:
+    paciente = {**dados_paciente(), "data_nascimento": "1990-01-01"}
+    del paciente["id"]
+    return paciente
+
+
+def _fila(destino: DestinoFila) -> list[dict]:
+    eventos = []
+    while not destino.fila.empty():
+        eventos.append(destino.fila.get_nowait())
+    return eventos
+
+
+async def test_alteracoes_gravam_eventos_na_mesma_transacao(cliente, outbox_vazio, dados_paciente):
+    paciente = _novo_paciente(dados_paciente)
+    id = (await cliente.post("/pacientes", json=paciente)).json()["id"]
+    await cliente.put(f"/pacientes/{id}", json={
+        **{campo: paciente[campo] for campo in ("telefone", "email", "endereco", "observacoes")},
+        "nome": "Nome Novo",
+    })
+    await cliente.post("/pacientes/status", json={"ids": [id], "status": "INATIVO"})
+    await cliente.put(f"/pacientes/{id}/ativar")
+
+    eventos = await _eventos()
+
+    assert [(entidade, str(entidade_id), tipo) for entidade, entidade_id, tipo, _ in eventos] == [
+        ("pacientes", id, "criado"),
+        ("pacientes", id, "editado"),
+        ("pacientes", id, "inativado"),
+        ("pacientes", id, "ativado"),
+    ]
+    assert eventos[0][3]["cpf"] == paciente["cpf"]
+    assert eventos[1][3]["nome"] == "Nome Novo"
+    assert (eventos[2][3], eventos[3][3]) == ({"status": "INATIVO"}, {"status": "ATIVO"})
+
+
+async def test_escrita_recusada_nao_grava_evento(cliente, outbox_vazio, dados_paciente):
+    paciente = _novo_paciente(dados_paciente)
+    assert (await cliente.post("/pacientes", json=paciente)).status_code == 201
+
+    assert (await cliente.post("/pacientes", json=paciente)).status_code == 409
+
+    assert [tipo for _, _, tipo, _ in await _eventos()] == ["criado"]
+
+
+async def test_importacao_grava_eventos_so_dos_inseridos(cliente, outbox_vazio, dados_paciente):
+    primeiro = _novo_paciente(dados_paciente)
+    corpo = b"\n".join(orjson.dumps(registro) for registro in (primeiro, {**_novo_paciente(dados_paciente), "cpf": primeiro["cpf"]}))
+
+    await cliente.post("/pacientes/lote", content=corpo)
+
+    eventos = await _eventos()
+    assert [(tipo, dados["nome"]) for _, _, tipo, dados in eventos] == [("criado", primeiro["nome"])]
+
+
+async def test_despacha_em_ordem_e_remove_do_outbox(outbox_vazio, dados_paciente):
+    pacientes = [dados_paciente() for _ in range(5)]
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(ModeloEventoOutbox), [
+            {"entidade": "pacientes", "entidade_id": paciente["id"], "tipo": "criado", "dados": {"nome": paciente["nome"]}}
+            for paciente in pacientes
+        ])
+        await sessao.commit()
+    destino = DestinoFila()
+    despachante = DespachanteEventos(AsyncSessionLocal, destino, tamanho_lote=2)
+
+    assert [await despachante.despachar_lote() for _ in range(4)] == [2, 2, 1, 0]
+
+    entregues = _fila(destino)
+    assert [evento["entidade_id"] for evento in entregues] == [paciente["id"] for paciente in pacientes]
+    assert [evento["dados"]["nome"] for evento in entregues] == [paciente["nome"] for paciente in pacientes]
+    assert await _eventos() == []
+
+
+async def test_falha_no_destino_mantem_os_eventos_para_a_proxima_rodada(cliente, outbox_vazio, dados_paciente):
+    await cliente.post("/pacientes", json=_novo_paciente(dados_paciente))
+    destino = DestinoInstavel(falhas=1)
+    despachante = DespachanteEventos(AsyncSessionLocal, destino)
+
+    with pytest.raises(ConnectionError):
+        await despachante.despachar_lote()
+    assert len(await _eventos()) == 1
+
+    assert await despachante.despachar_lote() == 1
+    assert [evento["tipo"] for evento in _fila(destino)] == ["criado"]
+    assert await _eventos() == []
+
+
+async def test_despacho_em_segundo_plano_tenta_de_novo_apos_falha(cliente, outbox_vazio, dados_paciente):
+    await cliente.post("/pacientes", json=_novo_paciente(dados_paciente))
+    destino = DestinoInstavel(falhas=2)
+    despachante = DespachanteEventos(AsyncSessionLocal, destino, intervalo_segundos=0.05)
+
+    await despachante.iniciar()
+    try:
+        with anyio.fail_after(5):
+            evento = await destino.fila.get()
+            # Entregue; a remoção do outbox vem logo depois, na mesma rodada
+            while await _eventos():
+                await anyio.sleep(0.01)
+    finally:
+        await despachante.encerrar()
+
+    assert evento["tipo"] == "criado"
+    assert destino.falhas == 0
+
+
+async def test_destino_arquivo_acrescenta_uma_linha_por_evento(tmp_path):
+    destino: DestinoEventos = DestinoArquivo(tmp_path / "eventos.ndjson")
+
+    await destino.enviar([{"id": 1, "tipo": "criado"}])
+    await destino.enviar([{"id": 2, "tipo": "editado"}, {"id": 3, "tipo": "ativado"}])
+
+    linhas = (tmp_path / "eventos.ndjson").read_bytes().splitlines()
+    assert [orjson.loads(linha)["id"] for linha in linhas] == [1, 2, 3]
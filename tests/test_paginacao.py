@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+from uuid6 import uuid7
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _inserir(modelo, registros):
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(modelo), registros)
+        await sessao.commit()
+
+
+async def _percorrer(cliente, url, **parametros) -> list[dict]:
+    itens, cursor = [], None
+    while True:
+        pagina = await cliente.get(url, params={**parametros, **({"cursor": cursor} if cursor else {})})
+        assert pagina.status_code == 200
+        corpo = pagina.json()
+        itens.extend(corpo["itens"])
+        cursor = corpo["proximo_cursor"]
+        if cursor is None:
+            return itens
+
+
+async def test_percorre_todas_as_paginas_em_ordem(cliente, banco_vazio, dados_paciente):
+    pacientes = [dados_paciente(nome=f"Paciente {letra}") for letra in "GCAEBFD"]
+    await _inserir(ModeloPaciente, pacientes)
+
+    itens = await _percorrer(cliente, "/pacientes", limite=3)
+
+    assert [item["nome"] for item in itens] == [f"Paciente {letra}" for letra in "ABCDEFG"]
+
+
+async def test_filtro_por_status_segue_nas_paginas(cliente, banco_vazio, dados_paciente):
+    pacientes = [
+        dados_paciente(nome=f"Paciente {numero:02d}", status="ATIVO" if numero % 3 else "INATIVO")
+        for numero in range(12)
+    ]
+    await _inserir(ModeloPaciente, pacientes)
+
+    itens = await _percorrer(cliente, "/pacientes", limite=3, status="ATIVO")
+
+    assert [item["nome"] for item in itens] == [p["nome"] for p in pacientes if p["status"] == "ATIVO"]
+    assert {item["status"] for item in itens} == {"ATIVO"}
+
+
+@pytest.mark.parametrize("alteracao", ["inativar", "renomear"])
+async def test_alteracao_do_ultimo_item_nao_perde_a_posicao(cliente, banco_vazio, dados_paciente, alteracao):
+    pacientes = [dados_paciente(nome=f"Paciente {numero:02d}") for numero in range(10)]
+    await _inserir(ModeloPaciente, pacientes)
+
+    primeira = (await cliente.get("/pacientes", params={"limite": 3, "status": "ATIVO"})).json()
+    assert [item["nome"] for item in primeira["itens"]] == ["Paciente 00", "Paciente 01", "Paciente 02"]
+
+    ancora = primeira["itens"][-1]["id"]
+    if alteracao == "inativar":
+        assert (await cliente.delete(f"/pacientes/{ancora}")).status_code == 204
+    else:
+        paciente = pacientes[2]
+        dados = {campo: paciente[campo] for campo in ("telefone", "email", "endereco", "observacoes")}
+        resposta = await cliente.put(f"/pacientes/{ancora}", json={**dados, "nome": "Paciente 99"})
+        assert resposta.status_code == 204
+
+    restantes = await _percorrer(cliente, "/pacientes", limite=3, status="ATIVO", cursor=primeira["proximo_cursor"])
+
+    assert [item["nome"] for item in restantes] == [f"Paciente {numero:02d}" for numero in range(3, 10)] + (
+        ["Paciente 99"] if alteracao == "renomear" else []
+    )
+
+
+async def test_recepcionistas_percorre_todas_as_paginas(cliente, banco_vazio):
+    recepcionistas = [
+        {"id": uuid7(), "nome": f"Recepcionista {numero}", "status": "ATIVO", "criado_em": datetime.now()}
+        for numero in range(5)
+    ]
+    await _inserir(ModeloRecepcionista, recepcionistas)
+
+    itens = await _percorrer(cliente, "/recepcionistas", limite=2)
+
+    assert [item["nome"] for item in itens] == [r["nome"] for r in recepcionistas]
+
+
+async def test_cursor_nao_expoe_o_nome(cliente, banco_vazio, dados_paciente):
+    await _inserir(ModeloPaciente, [dados_paciente(nome="Ana Paula Ferreira") for _ in range(2)])
+
+    cursor = (await cliente.get("/pacientes", params={"limite": 1})).json()["proximo_cursor"]
+
+    assert "Ana" not in base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("latin-1")
+
+
+async def test_cursor_invalido_ou_adulterado_responde_400(cliente, banco_vazio, dados_paciente):
+    await _inserir(ModeloPaciente, [dados_paciente() for _ in range(2)])
+    cursor = (await cliente.get("/pacientes", params={"limite": 1})).json()["proximo_cursor"]
+
+    adulterado = cursor[:-5] + ("A" if cursor[-5] != "A" else "B") + cursor[-4:]
+    formato_antigo = base64.urlsafe_b64encode(
+        json.dumps(["ATIVO", "Paciente", str(uuid7())]).encode("utf-8")
+    ).decode("ascii")
+
+    for invalido in ("nao-e-um-cursor", adulterado, formato_antigo, "é"):
+        for url in ("/pacientes", "/recepcionistas"):
+            resposta = await cliente.get(url, params={"cursor": invalido})
+            assert resposta.status_code == 400, (url, invalido)
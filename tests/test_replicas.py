@@ -0,0 +1,102 @@
+"""
+Roteamento para réplicas com duas réplicas SQLite locais.
+
+As réplicas são bancos separados que recebem os mesmos dados iniciais e
+não recebem as alterações feitas depois (réplicas atrasadas), até o teste
+"alcançar" o primário copiando a linha alterada.
+"""
+
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from bem_saude.infraestrutura.banco_dados import conexao
+from bem_saude.infraestrutura.banco_dados.conexao import SeletorReplicas, SessaoRoteada, async_engine
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_base import Base
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.cache.gerenciador_cache import cache
+from bem_saude.infraestrutura.repositorios.repositorio_paciente import RepositorioPaciente
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replicas(cliente, tmp_path, monkeypatch):
+    engines = [create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'replica_{numero}.db'}") for numero in (1, 2)]
+    for engine in engines:
+        async with engine.begin() as conexao_replica:
+            await conexao_replica.run_sync(Base.metadata.create_all)
+
+    monkeypatch.setattr(conexao, "seletor_replicas", SeletorReplicas(engines, "round_robin"))
+    monkeypatch.setattr(conexao, "AsyncSessionLocal", async_sessionmaker(
+        bind=async_engine,
+        sync_session_class=SessaoRoteada,
+        autoflush=False,
+        expire_on_commit=False,
+    ))
+    yield engines
+    for engine in engines:
+        await engine.dispose()
+
+
+async def _executar_em(engines, comando, parametros=None):
+    for engine in engines:
+        async with engine.begin() as conexao_banco:
+            await conexao_banco.execute(comando, parametros)
+
+
+async def test_detalhe_nao_guarda_leitura_de_replica_atrasada(cliente, replicas, dados_paciente):
+    paciente = dados_paciente(nome="Nome Anterior")
+    await _executar_em([async_engine, *replicas], insert(ModeloPaciente), [paciente])
+    url = f"/pacientes/{paciente['id']}"
+
+    assert (await cliente.get(url)).json()["nome"] == "Nome Anterior"
+
+    alteracao = {campo: paciente[campo] for campo in ("telefone", "email", "endereco", "observacoes")}
+    resposta = await cliente.put(url, json={**alteracao, "nome": "Nome Novo"})
+    assert resposta.status_code == 204
+
+    # As réplicas ainda têm o nome anterior; o detalhe vem do primário e é guardado
+    for _ in replicas:
+        assert (await cliente.get(url)).json()["nome"] == "Nome Novo"
+
+    # A listagem continua nas réplicas: ainda atrasada
+    listagem = (await cliente.get("/pacientes", params={"limite": 200})).json()["itens"]
+    assert {item["id"]: item["nome"] for item in listagem}[str(paciente["id"])] == "Nome Anterior"
+
+    # Réplicas alcançam o primário
+    await _executar_em(
+        replicas,
+        update(ModeloPaciente).where(ModeloPaciente.id == paciente["id"]).values(nome="Nome Novo"),
+    )
+    assert (await cliente.get(url)).json()["nome"] == "Nome Novo"
+
+
+async def test_ler_do_primario_ignora_o_cache(cliente, replicas, dados_paciente):
+    paciente = dados_paciente(nome="Nome Atual")
+    await _executar_em([async_engine, *replicas], insert(ModeloPaciente), [paciente])
+    url = f"/pacientes/{paciente['id']}"
+
+    # Entrada do cache que não corresponde mais ao banco
+    chave = RepositorioPaciente.chave_cache(paciente["id"])
+    await cache.definir(chave, b'{"nome": "Nome no Cache"}', await cache.geracao(chave))
+    assert (await cliente.get(url)).json()["nome"] == "Nome no Cache"
+
+    resposta = await cliente.get(url, headers={"X-Ler-Do-Primario": "true"})
+    assert resposta.json()["nome"] == "Nome Atual"
+    # E a leitura do primário atualiza o cache
+    assert (await cliente.get(url)).json()["nome"] == "Nome Atual"
+
+
+async def test_listagem_com_ler_do_primario_ve_a_alteracao(cliente, replicas, dados_paciente):
+    paciente = dados_paciente(nome="Nome Anterior")
+    await _executar_em([async_engine, *replicas], insert(ModeloPaciente), [paciente])
+    await _executar_em(
+        [async_engine],
+        update(ModeloPaciente).where(ModeloPaciente.id == paciente["id"]).values(nome="Nome Novo"),
+    )
+
+    for cabecalhos, esperado in (({}, "Nome Anterior"), ({"X-Ler-Do-Primario": "true"}, "Nome Novo")):
+        listagem = (await cliente.get("/pacientes", params={"limite": 200}, headers=cabecalhos)).json()["itens"]
+        assert {item["id"]: item["nome"] for item in listagem}[str(paciente["id"])] == esperado
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import insert, select
+from uuid6 import uuid7
+
+from bem_saude.infraestrutura.banco_dados.conexao import AsyncSessionLocal
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_paciente import ModeloPaciente
+from bem_saude.infraestrutura.banco_dados.modelos.modelo_recepcionista import ModeloRecepcionista
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _inserir(modelo, registros):
+    async with AsyncSessionLocal() as sessao:
+        await sessao.execute(insert(modelo), registros)
+        await sessao.commit()
+
+
+async def _status(modelo, ids) -> dict:
+    async with AsyncSessionLocal() as sessao:
+        linhas = await sessao.execute(select(modelo.id, modelo.status).where(modelo.id.in_(ids)))
+        return dict(linhas.all())
+
+
+@pytest.fixture
+async def pacientes(dados_paciente):
+    registros = [dados_paciente() for _ in range(3)]
+    await _inserir(ModeloPaciente, registros)
+    return [registro["id"] for registro in registros]
+
+
+async def test_altera_todos_os_pacientes_do_lote(cliente, pacientes):
+    resposta = await cliente.post("/pacientes/status", json={"ids": [str(id) for id in pacientes], "status": "INATIVO"})
+
+    assert resposta.status_code == 200
+    assert resposta.json() == {"encontrados": [str(id) for id in pacientes], "nao_encontrados": []}
+    assert await _status(ModeloPaciente, pacientes) == {id: "INATIVO" for id in pacientes}
+
+
+@pytest.fixture(params=["pacientes", "recepcionistas"])
+async def cadastros(request, dados_paciente):
+    """(url do lote, modelo, ids de três cadastros ativos) de pacientes e de recepcionistas."""
+    if request.param == "pacientes":
+        modelo, registros = ModeloPaciente, [dados_paciente() for _ in range(3)]
+    else:
+        modelo = ModeloRecepcionista
+        registros = [{"id": uuid7(), "nome": f"Recepcionista {numero}", "status": "ATIVO"} for numero in range(3)]
+    await _inserir(modelo, registros)
+    return f"/{request.param}/status", modelo, [registro["id"] for registro in registros]
+
+
+async def test_lote_parcial_separa_os_nao_encontrados(cliente, cadastros):
+    url, modelo, existentes = cadastros
+    inexistente = uuid7()
+    ids = [existentes[0], inexistente, existentes[1], existentes[0]]
+
+    resposta = await cliente.post(url, json={"ids": [str(id) for id in ids], "status": "INATIVO"})
+
+    # Repetidos aparecem uma vez, na ordem do pedido
+    assert resposta.json() == {
+        "encontrados": [str(existentes[0]), str(existentes[1])],
+        "nao_encontrados": [str(inexistente)],
+    }
+    assert await _status(modelo, existentes) == {
+        existentes[0]: "INATIVO",
+        existentes[1]: "INATIVO",
+        existentes[2]: "ATIVO",
+    }
+
+
+async def test_nenhum_encontrado(cliente):
+    ids = [str(uuid7()), str(uuid7())]
+
+    resposta = await cliente.post("/pacientes/status", json={"ids": ids, "status": "ATIVO"})
+
+    assert resposta.json() == {"encontrados": [], "nao_encontrados": ids}
+
+
+async def test_lote_invalida_o_detalhe_em_cache(cliente, pacientes):
+    assert (await cliente.get(f"/pacientes/{pacientes[0]}")).json()["status"] == "ATIVO"
+
+    await cliente.post("/pacientes/status", json={"ids": [str(pacientes[0])], "status": "INATIVO"})
+
+    assert (await cliente.get(f"/pacientes/{pacientes[0]}")).json()["status"] == "INATIVO"
+
+
+@pytest.mark.parametrize("corpo", [
+    {"ids": [], "status": "INATIVO"},
+    {"ids": ["nao-e-uuid"], "status": "INATIVO"},
+    {"ids": [str(uuid7())], "status": "EXCLUIDO"},
+    {"ids": [str(uuid7()) for _ in range(1001)], "status": "INATIVO"},
+])
+async def test_pedido_invalido_responde_422(cliente, corpo):
+    resposta = await cliente.post("/recepcionistas/status", json=corpo)
+
+    assert resposta.status_code == 422